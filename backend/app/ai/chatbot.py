@@ -1,24 +1,114 @@
-from openai import AsyncOpenAI
-from typing import List, Dict, Optional
+from typing import AsyncIterator, List, Dict, Optional, Tuple
 import json
+import time
 
+import openai
+
+from app.ai.llm_client import LLMClient, LLMOverloaded
 from app.ai.prompts import SYSTEM_PROMPT, get_context_prompt
+from app.astrology.ayanamsa import ayanamsa_label
+from app.astrology.dasha import current_dasha
+from app.astrology.varga import VARGA_NAMES
+from app.ai.response_cache import ResponseCache
+from app.ai.token_budget import (
+    estimate_cost, estimate_message_tokens, estimate_tokens, trim_history
+)
+from app.utils.metrics import (
+    LLM_CACHE_HITS, LLM_COMPLETION_TOKENS, LLM_ERRORS, LLM_FIRST_TOKEN_SECONDS,
+    LLM_PROMPT_TOKENS, LLM_REQUEST_SECONDS
+)
 
 
 class AstroAIChatbot:
     """AI-powered Vedic Astrology Chatbot using OpenAI GPT-4o Mini"""
     
-    def __init__(self, api_key: str, model: str = "gpt-4o-mini"):
-        self.client = AsyncOpenAI(api_key=api_key)
+    # GPT-4o Mini optimized sampling parameters
+    COMPLETION_PARAMS = {
+        "temperature": 0.75,        # Slightly higher for more natural responses
+        "max_tokens": 1000,         # Increased for detailed responses
+        "top_p": 0.9,
+        "frequency_penalty": 0.3,
+        "presence_penalty": 0.4     # Encourage diverse vocabulary
+    }
+    
+    # History window of the original fixed-size assembly (used as the savings baseline)
+    LEGACY_HISTORY_MESSAGES = 8
+    
+    # Bump when prepare_prompt_context's output changes, so stored copies are rebuilt
+    PROMPT_CONTEXT_VERSION = 3
+    
+    def __init__(
+        self,
+        api_key: str,
+        model: str = "gpt-4o-mini",
+        response_cache: Optional[ResponseCache] = None,
+        summary_format: str = "compact",
+        history_token_budget: int = 1500,
+        base_url: Optional[str] = None,
+        llm: Optional[LLMClient] = None
+    ):
+        """
+        Args:
+            api_key: OpenAI API key
+            model: Chat model name
+            response_cache: Optional cache for opening-question answers
+            summary_format: 'compact' (low-token) or 'full' (decorated) chart summary
+            history_token_budget: Estimated tokens of conversation history sent per call
+            base_url: OpenAI-compatible API endpoint (default: the OpenAI API)
+            llm: Managed client for API calls (built from api_key/base_url if omitted)
+        """
+        if summary_format not in ("compact", "full"):
+            raise ValueError(f"Unknown summary format: {summary_format}")
+        self.llm = llm or LLMClient(api_key=api_key, base_url=base_url)
         self.model = model
+        self.response_cache = response_cache
+        self.summary_format = summary_format
+        self.history_token_budget = history_token_budget
         print(f"🤖 Initialized AstroAI Chatbot with model: {model}")
     
+    def prepare_prompt_context(self, chart_data: Dict, vargas: Optional[Dict] = None) -> Dict:
+        """
+        Precompute the per-chart part of the prompt
+        
+        Meant to be built once per session and stored with it, so later
+        turns neither rebuild the summary nor re-estimate its size.
+        
+        Args:
+            chart_data: Complete birth chart data
+            vargas: Optional divisional charts ('D<n>' -> {body: sign}) to include
+        
+        Returns:
+            Dict with the summary text, token estimates for both formats and
+            the vargas it quotes (part of the response cache key)
+        """
+        full_summary = self._prepare_chart_summary(chart_data)
+        if self.summary_format == "compact":
+            summary = self._prepare_compact_summary(chart_data)
+        else:
+            summary = full_summary
+        
+        if vargas:
+            varga_lines = self._prepare_varga_summary(vargas)
+            summary = f"{summary}\n{varga_lines}"
+            full_summary = f"{full_summary}\n{varga_lines}"
+        
+        return {
+            "version": self.PROMPT_CONTEXT_VERSION,
+            "vargas": vargas or None,
+            "summary": summary,
+            "summary_tokens": estimate_tokens(summary, self.model),
+            "full_summary_tokens": estimate_tokens(full_summary, self.model)
+        }
+    
     async def get_response(
         self,
         user_message: str,
         chart_data: Dict,
         conversation_history: List[Dict],
-        context: Optional[str] = None
+        context: Optional[str] = None,
+        use_cache: bool = True,
+        prompt_context: Optional[Dict] = None,
+        conversation_summary: Optional[str] = None
     ) -> str:
         """
         Generate AI response based on user query and birth chart
@@ -28,18 +118,202 @@ class AstroAIChatbot:
             chart_data: Complete birth chart data
             conversation_history: Previous conversation
             context: Specific context (career, marriage, etc.)
+            use_cache: Allow answering from / storing into the response cache
+            prompt_context: Output of prepare_prompt_context (built if omitted)
+            conversation_summary: Rolling summary of turns no longer in the history
         
         Returns:
             AI-generated response
         """
-        # Prepare chart summary for AI
-        chart_summary = self._prepare_chart_summary(chart_data)
+        result = await self.generate_response(
+            user_message, chart_data, conversation_history,
+            context=context, use_cache=use_cache, prompt_context=prompt_context,
+            conversation_summary=conversation_summary
+        )
+        return result["content"]
+    
+    async def generate_response(
+        self,
+        user_message: str,
+        chart_data: Dict,
+        conversation_history: List[Dict],
+        context: Optional[str] = None,
+        use_cache: bool = True,
+        prompt_context: Optional[Dict] = None,
+        conversation_summary: Optional[str] = None
+    ) -> Dict:
+        """
+        Like get_response, but also reports token usage and cost savings
         
-        # Build messages
-        messages = [
-            {"role": "system", "content": SYSTEM_PROMPT},
-            {"role": "system", "content": f"Birth Chart Data:\n{chart_summary}"}
-        ]
+        Returns:
+            {"content": reply text, "usage": token counts and cost estimates}
+        
+        Raises:
+            LLMOverloaded: The call was shed by the LLM client's concurrency limit
+        """
+        if prompt_context is None:
+            prompt_context = self.prepare_prompt_context(chart_data)
+        cache_key = self._cache_key(
+            user_message, chart_data, conversation_history, context, use_cache, conversation_summary,
+            vargas=prompt_context.get("vargas")
+        )
+        if cache_key:
+            cached = self.response_cache.get(cache_key)
+            if cached is not None:
+                LLM_CACHE_HITS.inc("complete")
+                return {"content": cached, "usage": {"cache_hit": True}}
+        
+        messages, usage = self._build_messages(
+            user_message, conversation_history, context, prompt_context, conversation_summary,
+            chart_data=chart_data, dasha_dates=cache_key is None
+        )
+        
+        start = time.perf_counter()
+        try:
+            response = await self.llm.complete(
+                model=self.model,
+                messages=messages,
+                **self.COMPLETION_PARAMS
+            )
+            LLM_REQUEST_SECONDS.observe(time.perf_counter() - start, self.model, "complete", "ok")
+            
+            content = response.choices[0].message.content
+            if cache_key and content:
+                self.response_cache.put(cache_key, content)
+            
+            if response.usage is not None:
+                self._add_usage(
+                    usage,
+                    prompt_tokens=response.usage.prompt_tokens,
+                    completion_tokens=response.usage.completion_tokens,
+                    cached_tokens=self._cached_prompt_tokens(response.usage)
+                )
+                self._record_tokens("complete", response.usage.prompt_tokens, response.usage.completion_tokens)
+            return {"content": content, "usage": usage}
+        
+        except LLMOverloaded:
+            raise
+        except Exception as e:
+            self._record_error("complete", start, e)
+            return {"content": self._error_message(e), "usage": usage}
+    
+    async def stream_response(
+        self,
+        user_message: str,
+        chart_data: Dict,
+        conversation_history: List[Dict],
+        context: Optional[str] = None,
+        use_cache: bool = True,
+        prompt_context: Optional[Dict] = None,
+        conversation_summary: Optional[str] = None,
+        usage: Optional[Dict] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream the AI response chunk by chunk as the model generates it
+        
+        Args:
+            user_message: User's question
+            chart_data: Complete birth chart data
+            conversation_history: Previous conversation
+            context: Specific context (career, marriage, etc.)
+            use_cache: Allow answering from / storing into the response cache
+            prompt_context: Output of prepare_prompt_context (built if omitted)
+            conversation_summary: Rolling summary of turns no longer in the history
+            usage: Optional dict filled with estimated token usage and savings
+        
+        Yields:
+            Text chunks; on failure a single user-facing error message
+        
+        Raises:
+            LLMOverloaded: The call was shed before any chunk was produced
+        """
+        usage = usage if usage is not None else {}
+        
+        if prompt_context is None:
+            prompt_context = self.prepare_prompt_context(chart_data)
+        cache_key = self._cache_key(
+            user_message, chart_data, conversation_history, context, use_cache, conversation_summary,
+            vargas=prompt_context.get("vargas")
+        )
+        if cache_key:
+            cached = self.response_cache.get(cache_key)
+            if cached is not None:
+                usage["cache_hit"] = True
+                LLM_CACHE_HITS.inc("stream")
+                yield cached
+                return
+        
+        messages, estimate = self._build_messages(
+            user_message, conversation_history, context, prompt_context, conversation_summary,
+            chart_data=chart_data, dasha_dates=cache_key is None
+        )
+        usage.update(estimate)
+        
+        start = time.perf_counter()
+        try:
+            stream = self.llm.stream(
+                model=self.model,
+                messages=messages,
+                **self.COMPLETION_PARAMS
+            )
+            
+            chunks = []
+            try:
+                async for chunk in stream:
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        if not chunks:
+                            LLM_FIRST_TOKEN_SECONDS.observe(time.perf_counter() - start, self.model)
+                        chunks.append(chunk.choices[0].delta.content)
+                        yield chunk.choices[0].delta.content
+            finally:
+                # Frees the concurrency slot even if our consumer stopped early
+                await stream.aclose()
+            LLM_REQUEST_SECONDS.observe(time.perf_counter() - start, self.model, "stream", "ok")
+            
+            if cache_key and chunks:
+                self.response_cache.put(cache_key, "".join(chunks))
+            
+            # The streaming API reports no usage; fall back to estimates
+            completion_tokens = estimate_tokens("".join(chunks), self.model)
+            self._add_usage(
+                usage,
+                prompt_tokens=usage["estimated_prompt_tokens"],
+                completion_tokens=completion_tokens
+            )
+            self._record_tokens("stream", usage["estimated_prompt_tokens"], completion_tokens)
+        
+        except LLMOverloaded:
+            raise
+        except Exception as e:
+            self._record_error("stream", start, e)
+            yield self._error_message(e)
+    
+    def _build_messages(
+        self,
+        user_message: str,
+        conversation_history: List[Dict],
+        context: Optional[str],
+        prompt_context: Dict,
+        conversation_summary: Optional[str] = None,
+        chart_data: Optional[Dict] = None,
+        dasha_dates: bool = True
+    ) -> Tuple[List[Dict], Dict]:
+        """
+        Assemble the prompt in a stable order and estimate its size
+        
+        Content shared by all users (system prompt, then the context prompt)
+        comes first and per-session content after it, so the provider's
+        prefix caching can reuse the longest possible prefix. History is
+        trimmed to the token budget instead of a fixed message count.
+        
+        Answers that go into the response cache are shared by every chart
+        with the same fingerprint, so their prompts (dasha_dates=False) name
+        the running periods without the birth-specific dates.
+        
+        Returns:
+            (messages, usage estimate)
+        """
+        messages = [{"role": "system", "content": SYSTEM_PROMPT}]
         
         # Add context-specific instructions
         if context:
@@ -47,34 +321,174 @@ class AstroAIChatbot:
             if context_prompt:
                 messages.append({"role": "system", "content": context_prompt})
         
-        # Add conversation history (last 8 messages for GPT-4o mini context)
-        messages.extend(conversation_history[-8:])
+        messages.append({"role": "system", "content": f"Birth Chart Data:\n{prompt_context['summary']}"})
+        
+        # Periods running today; changes over a session's life, so never cached with it
+        dasha_summary = self._prepare_dasha_summary(chart_data, dates=dasha_dates) if chart_data else None
+        if dasha_summary:
+            messages.append({"role": "system", "content": dasha_summary})
+        
+        # Earlier turns already folded into the rolling summary
+        if conversation_summary:
+            messages.append({
+                "role": "system",
+                "content": f"Summary of the earlier conversation:\n{conversation_summary}"
+            })
+        
+        # Add as much recent conversation history as the budget allows
+        history = trim_history(conversation_history, self.history_token_budget, self.model)
+        messages.extend(history)
         
         # Add current user message
         messages.append({"role": "user", "content": user_message})
         
-        try:
-            # Call OpenAI API with GPT-4o Mini optimized parameters
-            response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=messages,
-                temperature=0.75,  # Slightly higher for more natural responses
-                max_tokens=1000,   # Increased for detailed responses
-                top_p=0.9,
-                frequency_penalty=0.3,
-                presence_penalty=0.4  # Encourage diverse vocabulary
+        estimated_prompt_tokens = estimate_message_tokens(messages, self.model)
+        # What the decorated summary and fixed last-8 history would have cost
+        baseline_prompt_tokens = (
+            estimated_prompt_tokens
+            - prompt_context["summary_tokens"]
+            + prompt_context["full_summary_tokens"]
+            - estimate_message_tokens(history, self.model)
+            + estimate_message_tokens(
+                conversation_history[-self.LEGACY_HISTORY_MESSAGES:], self.model
             )
-            
-            return response.choices[0].message.content
+        )
         
-        except Exception as e:
-            error_msg = str(e)
-            if "insufficient_quota" in error_msg:
-                return "I apologize, but the API quota has been exceeded. Please try again later or contact support."
-            elif "invalid_api_key" in error_msg:
-                return "API configuration error. Please contact support."
-            else:
-                return f"I apologize, but I encountered an error processing your request. Please try again. (Error: {error_msg})"
+        return messages, {
+            "cache_hit": False,
+            "history_messages": len(history),
+            "estimated_prompt_tokens": estimated_prompt_tokens,
+            "baseline_prompt_tokens": baseline_prompt_tokens,
+            "estimated_tokens_saved": baseline_prompt_tokens - estimated_prompt_tokens
+        }
+    
+    def _add_usage(self, usage: Dict, prompt_tokens: int, completion_tokens: int, cached_tokens: int = 0):
+        """Record token counts and the cost saved relative to the baseline prompt"""
+        usage.update({
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "cached_prompt_tokens": cached_tokens
+        })
+        
+        cost = estimate_cost(self.model, prompt_tokens, completion_tokens, cached_tokens)
+        baseline_cost = estimate_cost(
+            self.model,
+            prompt_tokens + usage["estimated_tokens_saved"],
+            completion_tokens
+        )
+        usage["estimated_cost_usd"] = round(cost, 8) if cost is not None else None
+        usage["estimated_cost_saved_usd"] = (
+            round(baseline_cost - cost, 8) if cost is not None else None
+        )
+    
+    def _record_tokens(self, mode: str, prompt_tokens: int, completion_tokens: int):
+        LLM_PROMPT_TOKENS.observe(prompt_tokens, self.model, mode)
+        LLM_COMPLETION_TOKENS.observe(completion_tokens, self.model, mode)
+    
+    def _record_error(self, mode: str, start: float, error: Exception):
+        LLM_REQUEST_SECONDS.observe(time.perf_counter() - start, self.model, mode, "error")
+        LLM_ERRORS.inc(self.model, type(error).__name__)
+    
+    @staticmethod
+    def _cached_prompt_tokens(api_usage) -> int:
+        """Prompt tokens served from the provider's prefix cache, if reported"""
+        details = getattr(api_usage, "prompt_tokens_details", None)
+        if isinstance(details, dict):
+            return details.get("cached_tokens") or 0
+        return getattr(details, "cached_tokens", 0) or 0
+    
+    def _cache_key(
+        self, user_message, chart_data, conversation_history, context, use_cache,
+        conversation_summary=None, vargas=None
+    ):
+        """
+        Response cache key, or None when the answer must not be cached
+        
+        Follow-up turns (any earlier assistant reply in the history, or a
+        summary of earlier turns) depend on the conversation so far and
+        always go to the model. vargas are the divisional charts the prompt
+        quotes, which the key must cover as well.
+        """
+        if not use_cache or self.response_cache is None or conversation_summary:
+            return None
+        if any(message["role"] == "assistant" for message in conversation_history):
+            return None
+        return self.response_cache.make_key(chart_data, context, user_message, self.model, vargas=vargas)
+    
+    def _error_message(self, error: Exception) -> str:
+        """User-facing reply for a failed API call"""
+        error_msg = str(error)
+        print(f"⚠️  Chat completion failed: {type(error).__name__}: {error_msg}")
+        if "insufficient_quota" in error_msg:
+            return "I apologize, but the API quota has been exceeded. Please try again later or contact support."
+        elif "invalid_api_key" in error_msg:
+            return "API configuration error. Please contact support."
+        elif isinstance(error, (openai.APITimeoutError, openai.RateLimitError)):
+            return "I apologize, but the service is busy right now. Please try again in a moment."
+        else:
+            return "I apologize, but I encountered an error processing your request. Please try again."
+    
+    def _ayanamsa_label(self, chart_data: Dict) -> str:
+        """Display name of the ayanamsa the chart was computed with"""
+        return ayanamsa_label(chart_data.get('birth_details', {}).get('ayanamsa_name'))
+    
+    def _prepare_compact_summary(self, chart_data: Dict) -> str:
+        """Low-token plain-text chart summary (no decoration or emoji)"""
+        strengths = chart_data.get('strengths', {})
+        lines = [
+            f"Vedic birth chart (sidereal, {self._ayanamsa_label(chart_data)} ayanamsa)",
+            f"Lagna: {chart_data['ascendant']['sign']} {chart_data['ascendant']['degree']}",
+            "Planets (sign degree, nakshatra, strength):"
+        ]
+        for planet, data in chart_data['planets'].items():
+            strength = strengths.get(planet, {}).get('status')
+            lines.append(
+                f"{planet}: {data['sign']} {data['degree']}, {data['nakshatra']}"
+                + (f", {strength}" if strength else "")
+            )
+        moon_nakshatra = chart_data['moon_nakshatra']
+        lines.append(
+            f"Moon nakshatra: {moon_nakshatra['name']} pada {moon_nakshatra['pada']}, lord {moon_nakshatra['lord']}"
+        )
+        lines.append("Ground every interpretation in these placements.")
+        return "\n".join(lines)
+    
+    def _prepare_dasha_summary(
+        self, chart_data: Dict, jd: Optional[float] = None, dates: bool = True
+    ) -> Optional[str]:
+        """
+        The Vimshottari periods running now (or at jd), with their dates
+        unless dates is False
+        
+        Built per request rather than stored with the prompt context, which
+        lives as long as the session while the periods keep changing.
+        """
+        dasha = current_dasha(chart_data, jd)
+        if not dasha:
+            return None
+        
+        def span(level):
+            if not dates:
+                return ""
+            return f" ({dasha[level]['start']} to {dasha[level]['end']})"
+        
+        if self.summary_format == "compact":
+            return "Current Vimshottari dasha: " + ", ".join(
+                f"{dasha[level]['lord']} {label}{span(level)}"
+                for level, label in (("mahadasha", "MD"), ("antardasha", "AD"), ("pratyantardasha", "PD"))
+            )
+        return f"""🔹 CURRENT VIMSHOTTARI DASHA:
+   Mahadasha: {dasha['mahadasha']['lord']}{span('mahadasha')}
+   Antardasha: {dasha['antardasha']['lord']}{span('antardasha')}
+   Pratyantardasha: {dasha['pratyantardasha']['lord']}{span('pratyantardasha')}"""
+    
+    def _prepare_varga_summary(self, vargas: Dict) -> str:
+        """One plain-text line per divisional chart"""
+        return "\n".join(
+            f"{VARGA_NAMES.get(int(name[1:]), name)} ({name}): "
+            + ", ".join(f"{body} {sign}" for body, sign in signs.items())
+            for name, signs in vargas.items()
+        )
     
     def _prepare_chart_summary(self, chart_data: Dict) -> str:
         """Convert chart data to readable summary for AI"""
@@ -91,7 +505,7 @@ class AstroAIChatbot:
         
         summary = f"""
 ═══════════════════════════════════════════════════════
-VEDIC BIRTH CHART SUMMARY (Sidereal/Lahiri Ayanamsa)
+VEDIC BIRTH CHART SUMMARY (Sidereal/{self._ayanamsa_label(chart_data)} Ayanamsa)
 ═══════════════════════════════════════════════════════
 
 🔹 ASCENDANT (LAGNA):
@@ -0,0 +1,16 @@
+"""
+LLM call errors
+Kept free of SDK imports so request handlers can catch them without
+loading the OpenAI client
+"""
+
+
+class LLMOverloaded(Exception):
+    """A call was shed: the wait queue is full or no slot freed up in time"""
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+__all__ = ['LLMOverloaded']
@@ -0,0 +1,290 @@
+"""
+Managed chat completion calls
+One pooled AsyncOpenAI client behind an adaptive concurrency limit with a
+bounded wait queue (calls beyond it are shed), per-call deadlines, and
+retries with jittered exponential backoff that honour Retry-After headers
+"""
+
+import asyncio
+import random
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+from typing import AsyncIterator, Dict, Optional
+
+import httpx
+import openai
+from openai import AsyncOpenAI
+
+from app.ai.errors import LLMOverloaded
+from app.utils.metrics import (
+    LLM_ATTEMPT_SECONDS, LLM_CONCURRENCY_LIMIT, LLM_IN_FLIGHT, LLM_QUEUE_DEPTH,
+    LLM_QUEUE_WAIT_SECONDS, LLM_RETRIES, LLM_SHED
+)
+
+
+# HTTP statuses worth retrying: timeout, conflict, rate limit, server errors
+RETRYABLE_STATUSES = {408, 409, 429}
+
+
+class AdaptiveLimiter:
+    """
+    Concurrency limit with a bounded FIFO wait queue
+
+    The limit follows AIMD: it halves when the API signals overload (rate
+    limits) and grows by about one slot per limit's worth of successful
+    calls, between min_limit and max_limit.
+    """
+
+    def __init__(self, max_limit: int, min_limit: int = 1, max_queue: int = 64):
+        if not 1 <= min_limit <= max_limit:
+            raise ValueError("Need 1 <= min_limit <= max_limit")
+        self.max_limit = max_limit
+        self.min_limit = min_limit
+        self.max_queue = max_queue
+        self.limit = float(max_limit)
+        self.in_flight = 0
+        self._waiters = deque()
+        LLM_CONCURRENCY_LIMIT.set(self.limit)
+
+    async def acquire(self, timeout: float):
+        """Take a slot, waiting at most timeout seconds in the queue"""
+        if self.in_flight < int(self.limit) and not self._waiters:
+            self._take()
+            return
+        if len(self._waiters) >= self.max_queue:
+            LLM_SHED.inc('queue_full')
+            raise LLMOverloaded("Too many requests are waiting for the model", retry_after=1.0)
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        LLM_QUEUE_DEPTH.set(len(self._waiters))
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(waiter, timeout=max(timeout, 0))
+        except asyncio.TimeoutError:
+            LLM_SHED.inc('queue_timeout')
+            raise LLMOverloaded("Timed out waiting for the model", retry_after=max(timeout, 1.0))
+        except asyncio.CancelledError:
+            # Cancelled just after being handed a slot: give it back
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            raise
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+            LLM_QUEUE_DEPTH.set(len(self._waiters))
+            LLM_QUEUE_WAIT_SECONDS.observe(time.perf_counter() - start)
+
+    def release(self):
+        self.in_flight -= 1
+        LLM_IN_FLIGHT.set(self.in_flight)
+        self._wake()
+
+    def on_success(self):
+        if self.limit < self.max_limit:
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            LLM_CONCURRENCY_LIMIT.set(round(self.limit, 2))
+            self._wake()
+
+    def on_overload(self):
+        self.limit = max(self.min_limit, self.limit / 2)
+        LLM_CONCURRENCY_LIMIT.set(round(self.limit, 2))
+
+    def _take(self):
+        self.in_flight += 1
+        LLM_IN_FLIGHT.set(self.in_flight)
+
+    def _wake(self):
+        # Hand freed slots to waiters in arrival order (cancelled ones are skipped)
+        while self._waiters and self.in_flight < int(self.limit):
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self._take()
+                waiter.set_result(None)
+        LLM_QUEUE_DEPTH.set(len(self._waiters))
+
+    def stats(self) -> Dict:
+        return {
+            'limit': round(self.limit, 2),
+            'max_limit': self.max_limit,
+            'in_flight': self.in_flight,
+            'queued': len(self._waiters),
+            'max_queue': self.max_queue
+        }
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    """Server-requested delay (seconds) from retry-after-ms / retry-after headers"""
+    response = getattr(error, 'response', None)
+    if response is None:
+        return None
+    headers = response.headers
+    try:
+        if 'retry-after-ms' in headers:
+            return float(headers['retry-after-ms']) / 1000
+        if 'retry-after' in headers:
+            value = headers['retry-after']
+            try:
+                return float(value)
+            except ValueError:
+                return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+    return None
+
+
+def _retry_reason(error: Exception) -> Optional[str]:
+    """Why an error is worth retrying, or None if it is not"""
+    if isinstance(error, openai.APITimeoutError):
+        return 'timeout'
+    if isinstance(error, openai.APIConnectionError):
+        return 'connection'
+    if isinstance(error, openai.APIStatusError):
+        if error.status_code == 429:
+            # An exhausted quota does not recover by waiting
+            return None if 'insufficient_quota' in str(error) else 'rate_limit'
+        if error.status_code in RETRYABLE_STATUSES or error.status_code >= 500:
+            return f'http_{error.status_code}'
+    return None
+
+
+class LLMClient:
+    """Chat completions with concurrency control, deadlines and retries"""
+
+    def __init__(
+        self,
+        api_key: str,
+        base_url: Optional[str] = None,
+        max_in_flight: int = 16,
+        max_queue: int = 64,
+        queue_timeout: float = 10.0,
+        timeout: float = 60.0,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 8.0
+    ):
+        """
+        Args:
+            api_key: OpenAI API key
+            base_url: OpenAI-compatible API endpoint (default: the OpenAI API)
+            max_in_flight: Most concurrent API calls (the adaptive limit's ceiling)
+            max_queue: Most calls waiting for a slot; further calls are shed
+            queue_timeout: Longest wait for a slot before a call is shed
+            timeout: Per-call deadline in seconds, covering queueing, every
+                attempt and backoff (for streams: until the stream starts;
+                after that it bounds the wait between chunks)
+            max_retries: Retries after the first attempt
+            backoff_base: First backoff ceiling in seconds (doubles per retry)
+            backoff_max: Largest backoff ceiling in seconds
+        """
+        self.timeout = timeout
+        self.queue_timeout = queue_timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.limiter = AdaptiveLimiter(max_in_flight, max_queue=max_queue)
+
+        # One keep-alive pool shared by every call; retries are done here,
+        # not by the SDK, so they go through the limiter and deadline
+        self.http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=max_in_flight * 2,
+                max_keepalive_connections=max_in_flight
+            ),
+            timeout=httpx.Timeout(timeout, connect=min(timeout, 10.0))
+        )
+        self.client = AsyncOpenAI(
+            api_key=api_key,
+            base_url=base_url,
+            max_retries=0,
+            http_client=self.http_client
+        )
+        self._calls = 0
+        self._retries = 0
+        self._failures = 0
+
+    async def complete(self, **params):
+        """chat.completions.create(**params) under the limiter, deadline and retry policy"""
+        deadline = time.monotonic() + self.timeout
+        await self.limiter.acquire(min(self.queue_timeout, self.timeout))
+        try:
+            return await self._create(params, deadline)
+        finally:
+            self.limiter.release()
+
+    async def stream(self, **params) -> AsyncIterator:
+        """
+        Streamed chat completion chunks
+
+        The concurrency slot is held until the stream is exhausted or closed.
+        Only starting the stream is retried: once chunks have been yielded a
+        failure is raised to the caller.
+        """
+        deadline = time.monotonic() + self.timeout
+        await self.limiter.acquire(min(self.queue_timeout, self.timeout))
+        stream = None
+        try:
+            stream = await self._create({**params, 'stream': True}, deadline)
+            async for chunk in stream:
+                yield chunk
+        finally:
+            if stream is not None:
+                await stream.response.aclose()
+            self.limiter.release()
+
+    async def _create(self, params, deadline):
+        self._calls += 1
+        attempt = 0
+        while True:
+            remaining = deadline - time.monotonic()
+            start = time.perf_counter()
+            try:
+                if remaining <= 0:
+                    raise asyncio.TimeoutError()
+                response = await asyncio.wait_for(
+                    self.client.chat.completions.create(**params), timeout=remaining
+                )
+            except asyncio.TimeoutError:
+                LLM_ATTEMPT_SECONDS.observe(time.perf_counter() - start, 'deadline')
+                self._failures += 1
+                raise openai.APITimeoutError(request=httpx.Request('POST', str(self.client.base_url)))
+            except Exception as error:
+                LLM_ATTEMPT_SECONDS.observe(time.perf_counter() - start, 'error')
+                reason = _retry_reason(error)
+                if reason == 'rate_limit':
+                    self.limiter.on_overload()
+                delay = self._backoff(attempt, error)
+                if reason is None or attempt >= self.max_retries or time.monotonic() + delay >= deadline:
+                    self._failures += 1
+                    raise
+                LLM_RETRIES.inc(reason)
+                self._retries += 1
+                attempt += 1
+                await asyncio.sleep(delay)
+                continue
+
+            LLM_ATTEMPT_SECONDS.observe(time.perf_counter() - start, 'ok')
+            self.limiter.on_success()
+            return response
+
+    def _backoff(self, attempt: int, error: Exception) -> float:
+        """Retry-After when the server sent one, else full-jitter exponential backoff"""
+        requested = _retry_after(error)
+        if requested is not None:
+            return requested
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    async def close(self):
+        await self.http_client.aclose()
+
+    def stats(self) -> Dict:
+        return {
+            **self.limiter.stats(),
+            'calls': self._calls,
+            'retries': self._retries,
+            'failures': self._failures
+        }
+
+
+__all__ = ['LLMClient', 'LLMOverloaded', 'AdaptiveLimiter']
@@ -355,9 +355,19 @@ REMEMBER: Respect all spiritual paths - Hindu, Buddhist, Jain, Sikh, Sufi, etc.
 }
 
 
+SUMMARY_PROMPT = """You maintain a running summary of a Vedic astrology consultation so it can continue without the full transcript.
+
+Merge the previous summary (if any) with the new conversation turns into one updated summary that keeps:
+- The user's concerns, questions and life circumstances they shared
+- Chart placements, timings and remedies already discussed
+- Advice given and any commitments or follow-ups promised
+
+Write concise plain-text bullet points (at most 200 words). Do not add new interpretations."""
+
+
 def get_context_prompt(context: str) -> str:
     """Get context-specific prompt"""
     return CONTEXT_PROMPTS.get(context.lower(), "")
 
 
-__all__ = ['SYSTEM_PROMPT', 'get_context_prompt']
\ No newline at end of file
+__all__ = ['SYSTEM_PROMPT', 'CONTEXT_PROMPTS', 'SUMMARY_PROMPT', 'get_context_prompt']
\ No newline at end of file
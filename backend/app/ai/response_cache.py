@@ -0,0 +1,98 @@
+"""
+Answer cache for chat replies
+Opening questions asked in the same context about charts with identical
+placements get the same paid completion reused
+"""
+
+import hashlib
+import json
+import re
+from typing import Dict, Optional
+
+from app.ai.prompts import CONTEXT_PROMPTS
+from app.astrology.dasha import current_dasha
+from app.utils.cache import LRUCache
+
+
+def chart_fingerprint(chart_data: Dict, vargas: Optional[Dict] = None) -> str:
+    """
+    Stable hash of the chart features the chatbot reasons about
+
+    Uses sign, nakshatra and strength status of every graha plus the lagna
+    sign, Moon nakshatra/pada and the lords of the running Mahadasha,
+    Antardasha and Pratyantardasha. Exact degrees, period dates and birth
+    details are left out so charts with identical placements (and periods)
+    share a fingerprint; cacheable prompts state the periods without dates
+    to match. Divisional charts quoted in the prompt (vargas, 'D<n>' ->
+    {body: sign}) are included too, as D1 sign and nakshatra do not
+    determine them.
+    """
+    strengths = chart_data.get('strengths', {})
+    dasha = current_dasha(chart_data)
+    features = {
+        'ascendant': chart_data['ascendant']['sign'],
+        'planets': {
+            name: [
+                data['sign'],
+                data['nakshatra'],
+                strengths.get(name, {}).get('status')
+            ]
+            for name, data in chart_data['planets'].items()
+        },
+        'moon_nakshatra': [
+            chart_data['moon_nakshatra']['name'],
+            chart_data['moon_nakshatra']['pada']
+        ],
+        'dasha': [
+            dasha[level]['lord'] for level in ('mahadasha', 'antardasha', 'pratyantardasha')
+        ] if dasha else None,
+        'vargas': vargas
+    }
+    encoded = json.dumps(features, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(encoded.encode()).hexdigest()[:32]
+
+
+def normalize_question(question: str) -> str:
+    """Lowercase, drop punctuation and collapse whitespace"""
+    question = re.sub(r"[^\w\s]", " ", question.lower())
+    return " ".join(question.split())
+
+
+def context_key(context: Optional[str]) -> str:
+    """The CONTEXT_PROMPTS key a context resolves to ('' for none)"""
+    context = (context or "").lower()
+    return context if context in CONTEXT_PROMPTS else ""
+
+
+class ResponseCache:
+    """Bounded LRU/TTL cache of chat answers"""
+
+    def __init__(self, max_entries: int = 5000, ttl_seconds: Optional[float] = 86400):
+        self._cache = LRUCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+
+    def make_key(
+        self, chart_data: Dict, context: Optional[str], question: str, model: str,
+        vargas: Optional[Dict] = None
+    ) -> str:
+        return "|".join([
+            model,
+            chart_fingerprint(chart_data, vargas),
+            context_key(context),
+            normalize_question(question)
+        ])
+
+    def get(self, key: str) -> Optional[str]:
+        return self._cache.get(key)
+
+    def put(self, key: str, response: str) -> None:
+        self._cache.put(key, response)
+
+    def stats(self) -> Dict:
+        """Hit rate and eviction counters"""
+        return self._cache.stats()
+
+    def clear(self):
+        self._cache.clear()
+
+
+__all__ = ['ResponseCache', 'chart_fingerprint', 'normalize_question', 'context_key']
@@ -0,0 +1,141 @@
+"""
+Rolling conversation summarization
+Older turns are folded into a per-session summary in the background, so
+long consultations keep their context without growing the prompt
+"""
+
+import asyncio
+from typing import Dict, List, Optional, Set
+
+from app.ai.prompts import SUMMARY_PROMPT
+from app.ai.token_budget import estimate_message_tokens
+
+
+class ConversationSummarizer:
+    """Compacts session history into session["summary"] off the request path"""
+
+    def __init__(
+        self,
+        client,
+        model: str = "gpt-4o-mini",
+        after_messages: int = 12,
+        keep_recent: int = 6,
+        token_threshold: int = 1200
+    ):
+        """
+        Args:
+            client: LLMClient used for summary calls
+            model: Model used to write summaries
+            after_messages: Compact once history holds more than this many messages
+            keep_recent: Most recent messages always kept verbatim
+            token_threshold: Compact once history exceeds this many estimated tokens
+        """
+        if keep_recent >= after_messages:
+            raise ValueError("keep_recent must be smaller than after_messages")
+        self.client = client
+        self.model = model
+        self.after_messages = after_messages
+        self.keep_recent = keep_recent
+        self.token_threshold = token_threshold
+
+        self._running: Set[str] = set()
+        self._tasks: Set[asyncio.Task] = set()
+        self._runs = 0
+        self._failures = 0
+        self._skipped = 0
+        self._messages_folded = 0
+
+    def needs_compaction(self, session: Dict) -> bool:
+        """Whether the session's history has grown past the configured limits"""
+        history = session.get("conversation_history", [])
+        if len(history) <= self.keep_recent:
+            return False
+        return (
+            len(history) > self.after_messages
+            or estimate_message_tokens(history, self.model) > self.token_threshold
+        )
+
+    def schedule(self, session_id: str, session: Dict, session_store) -> None:
+        """
+        Start a background compaction if the session needs one
+
+        Returns immediately; at most one compaction runs per session at a time.
+        """
+        if session_id in self._running or not self.needs_compaction(session):
+            return
+        self._running.add(session_id)
+        task = asyncio.create_task(self.compact(session_id, session_store))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def compact(self, session_id: str, session_store) -> bool:
+        """
+        Fold all but the most recent turns into the session summary
+
+        The session is re-read after the summary call; if its history changed
+        in a way that no longer starts with the folded turns, the result is
+        discarded rather than overwriting newer state.
+
+        Returns:
+            True if the session was updated
+        """
+        self._running.add(session_id)
+        try:
+            session = session_store.get(session_id)
+            if session is None or not self.needs_compaction(session):
+                return False
+
+            history = session["conversation_history"]
+            folded = history[:-self.keep_recent]
+            summary = await self.summarize(session.get("summary"), folded)
+            self._runs += 1
+
+            latest = session_store.get(session_id)
+            if latest is None or latest["conversation_history"][:len(folded)] != folded:
+                self._skipped += 1
+                return False
+
+            latest["summary"] = summary
+            latest["conversation_history"] = latest["conversation_history"][len(folded):]
+            session_store.save(session_id, latest)
+            self._messages_folded += len(folded)
+            return True
+
+        except Exception as e:
+            self._failures += 1
+            print(f"⚠️  Conversation summarization failed for {session_id}: {e}")
+            return False
+        finally:
+            self._running.discard(session_id)
+
+    async def summarize(self, previous_summary: Optional[str], messages: List[Dict]) -> str:
+        """Merge previous_summary and messages into an updated summary"""
+        transcript = "\n".join(
+            f"{message['role'].upper()}: {message['content']}" for message in messages
+        )
+        content = (
+            f"Previous summary:\n{previous_summary or '(none)'}\n\n"
+            f"New conversation turns:\n{transcript}"
+        )
+        response = await self.client.complete(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": SUMMARY_PROMPT},
+                {"role": "user", "content": content}
+            ],
+            temperature=0.2,
+            max_tokens=400
+        )
+        return response.choices[0].message.content.strip()
+
+    def stats(self) -> Dict:
+        return {
+            'runs': self._runs,
+            'failures': self._failures,
+            'skipped': self._skipped,
+            'messages_folded': self._messages_folded,
+            'running': len(self._running)
+        }
+
+
+__all__ = ['ConversationSummarizer']
@@ -0,0 +1,102 @@
+"""
+Token estimation, history budgeting and cost accounting for chat prompts
+Uses tiktoken when it is installed, otherwise a character-based estimate
+"""
+
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+try:
+    import tiktoken
+except ImportError:  # optional dependency
+    tiktoken = None
+
+
+# Rough per-message framing overhead of the chat format
+MESSAGE_OVERHEAD_TOKENS = 4
+
+# USD per 1M tokens: input, cached input, output
+MODEL_PRICING = {
+    "gpt-4o-mini": {"input": 0.15, "cached_input": 0.075, "output": 0.60},
+    "gpt-4o": {"input": 2.50, "cached_input": 1.25, "output": 10.00},
+    "gpt-4-turbo": {"input": 10.00, "cached_input": 10.00, "output": 30.00},
+}
+
+
+@lru_cache(maxsize=8)
+def _encoding(model: str):
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model)
+    except Exception:
+        return None
+
+
+def estimate_tokens(text: str, model: str = "gpt-4o-mini") -> int:
+    """
+    Estimate the token count of a piece of text
+
+    Without tiktoken: ~4 ASCII characters per token, and one token per
+    non-ASCII character (emoji and box-drawing characters tokenize badly).
+    """
+    encoding = _encoding(model)
+    if encoding is not None:
+        return len(encoding.encode(text))
+    non_ascii = sum(1 for ch in text if ord(ch) > 127)
+    return (len(text) - non_ascii + 3) // 4 + non_ascii
+
+
+def estimate_message_tokens(messages: List[Dict], model: str = "gpt-4o-mini") -> int:
+    """Estimated prompt tokens for a list of chat messages"""
+    return sum(
+        estimate_tokens(message["content"], model) + MESSAGE_OVERHEAD_TOKENS
+        for message in messages
+    )
+
+
+def trim_history(history: List[Dict], budget: int, model: str = "gpt-4o-mini") -> List[Dict]:
+    """
+    Keep the most recent messages that fit in a token budget
+
+    Args:
+        history: Conversation messages, oldest first
+        budget: Maximum estimated tokens for the kept messages
+        model: Model whose tokenizer is used when available
+
+    Returns:
+        Suffix of history within the budget
+    """
+    kept = 0
+    used = 0
+    for message in reversed(history):
+        cost = estimate_tokens(message["content"], model) + MESSAGE_OVERHEAD_TOKENS
+        if used + cost > budget:
+            break
+        used += cost
+        kept += 1
+    return history[len(history) - kept:] if kept else []
+
+
+def estimate_cost(
+    model: str,
+    prompt_tokens: int,
+    completion_tokens: int = 0,
+    cached_tokens: int = 0
+) -> Optional[float]:
+    """USD cost of a call, or None for models without known pricing"""
+    pricing = MODEL_PRICING.get(model)
+    if pricing is None:
+        return None
+    uncached = max(0, prompt_tokens - cached_tokens)
+    return (
+        uncached * pricing["input"]
+        + cached_tokens * pricing["cached_input"]
+        + completion_tokens * pricing["output"]
+    ) / 1_000_000
+
+
+__all__ = [
+    'estimate_tokens', 'estimate_message_tokens', 'trim_history',
+    'estimate_cost', 'MODEL_PRICING'
+]
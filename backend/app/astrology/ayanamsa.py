@@ -0,0 +1,115 @@
+"""
+Ayanamsa (sidereal zodiac) systems
+Positions are computed tropically once; each ayanamsa is then a per-instant
+offset subtracted from them, so any number of sidereal variants of the same
+chart cost one ephemeris query plus one array subtraction each.
+
+Swiss Ephemeris keeps the sidereal mode in process-global state
+(swe.set_sid_mode) and reads it in swe.get_ayanamsa. This module is the only
+place that touches it: the set-then-read pair runs under a lock, so threads
+asking for different ayanamsas at the same time cannot see each other's mode.
+Tropical positions never depend on the mode.
+"""
+
+import threading
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+import swisseph as swe
+
+
+# Supported ayanamsas by name
+AYANAMSAS = {
+    'lahiri': swe.SIDM_LAHIRI,
+    'raman': swe.SIDM_RAMAN,
+    'krishnamurti': swe.SIDM_KRISHNAMURTI,
+    'true_chitra': swe.SIDM_TRUE_CITRA,
+    'true_revati': swe.SIDM_TRUE_REVATI,
+    'true_pushya': swe.SIDM_TRUE_PUSHYA,
+    'true_mula': swe.SIDM_TRUE_MULA,
+    'yukteshwar': swe.SIDM_YUKTESHWAR,
+    'jn_bhasin': swe.SIDM_JN_BHASIN,
+    'ushashashi': swe.SIDM_USHASHASHI,
+    'suryasiddhanta': swe.SIDM_SURYASIDDHANTA,
+    'lahiri_1940': swe.SIDM_LAHIRI_1940,
+    'lahiri_icrc': swe.SIDM_LAHIRI_ICRC,
+    'fagan_bradley': swe.SIDM_FAGAN_BRADLEY,
+}
+
+# Other common spellings of the names above
+AYANAMSA_ALIASES = {
+    'kp': 'krishnamurti',
+    'chitrapaksha': 'lahiri',
+    'true_citra': 'true_chitra',
+    'sri_yukteshwar': 'yukteshwar',
+}
+
+DEFAULT_AYANAMSA = 'lahiri'
+
+_sid_mode_lock = threading.Lock()
+
+
+def resolve_ayanamsa(name: Optional[str] = None) -> str:
+    """
+    Canonical ayanamsa name
+
+    Args:
+        name: A name from AYANAMSAS or AYANAMSA_ALIASES, case-insensitive,
+            with '-' or ' ' for '_' (None: DEFAULT_AYANAMSA)
+
+    Raises:
+        ValueError: Unknown ayanamsa
+    """
+    if name is None:
+        return DEFAULT_AYANAMSA
+    key = name.strip().lower().replace('-', '_').replace(' ', '_')
+    key = AYANAMSA_ALIASES.get(key, key)
+    if key not in AYANAMSAS:
+        raise ValueError(f"Unknown ayanamsa: {name} (expected one of {', '.join(AYANAMSAS)})")
+    return key
+
+
+def ayanamsa_values(jds, names: Sequence[str]) -> np.ndarray:
+    """
+    Ayanamsa of several systems at many instants
+
+    Args:
+        jds: Sequence of Julian days (UT)
+        names: Canonical names (see resolve_ayanamsa)
+
+    Returns:
+        Array of shape (len(names), len(jds)) in degrees
+    """
+    jds = np.asarray(jds, dtype=float)
+    modes = [AYANAMSAS[name] for name in names]
+    values = np.empty((len(modes), len(jds)))
+    with _sid_mode_lock:
+        for k, mode in enumerate(modes):
+            swe.set_sid_mode(mode)
+            for i, jd in enumerate(jds):
+                values[k, i] = swe.get_ayanamsa(jd)
+    return values
+
+
+def ayanamsa_value(jd: float, name: str = DEFAULT_AYANAMSA) -> float:
+    """Ayanamsa of one system at one instant, in degrees"""
+    return float(ayanamsa_values([jd], [name])[0, 0])
+
+
+def ayanamsa_label(name: Optional[str] = None) -> str:
+    """Swiss Ephemeris' display name of an ayanamsa, e.g. 'Raman' (None: the default)"""
+    return swe.get_ayanamsa_name(AYANAMSAS[resolve_ayanamsa(name)])
+
+
+def describe_ayanamsas() -> Dict[str, Dict]:
+    """Name -> Swiss Ephemeris' label for it and whether it is the default"""
+    return {
+        name: {'label': swe.get_ayanamsa_name(mode), 'default': name == DEFAULT_AYANAMSA}
+        for name, mode in AYANAMSAS.items()
+    }
+
+
+__all__ = [
+    'AYANAMSAS', 'AYANAMSA_ALIASES', 'DEFAULT_AYANAMSA',
+    'resolve_ayanamsa', 'ayanamsa_values', 'ayanamsa_value', 'ayanamsa_label', 'describe_ayanamsas'
+]
@@ -0,0 +1,152 @@
+"""
+Content-addressed cache in front of VedicChartCalculator
+Charts are keyed on the normalized inputs that actually determine them and
+kept as CompactCharts, expanded into chart dicts per request
+"""
+
+from typing import Dict, Optional
+
+from app.astrology.compact_chart import CompactChart
+from app.utils.cache import LRUCache
+
+
+class ChartCache:
+    """Memoize calculate_chart on (UTC Julian day, rounded lat/lon, ayanamsa name, house system, ephemeris mode)"""
+
+    def __init__(
+        self,
+        calculator,
+        max_entries: int = 2048,
+        ttl_seconds: Optional[float] = 86400,
+        coordinate_precision: int = 4
+    ):
+        """
+        Args:
+            calculator: VedicChartCalculator used on cache misses
+            max_entries: Maximum number of charts kept in memory
+            ttl_seconds: Seconds a chart stays valid (None for no expiry)
+            coordinate_precision: Decimal places lat/lon are rounded to (4 ~ 11 m)
+        """
+        self.calculator = calculator
+        self.coordinate_precision = coordinate_precision
+        self._cache = LRUCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+        # Divisional charts are only computed when first asked for
+        self._vargas = LRUCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+
+    def make_key(self, date, time, latitude, longitude, timezone, ephemeris=None, ayanamsa=None):
+        """Build the normalized cache key for a set of birth details"""
+        jd = self.calculator.julian_day(date, time, timezone)
+        return (
+            round(jd, 6),
+            round(float(latitude), self.coordinate_precision),
+            round(float(longitude), self.coordinate_precision),
+            # Resolved, so defaults, aliases and explicit names share entries
+            self.calculator.ayanamsa_for(ayanamsa),
+            self.calculator.house_system,
+            self.calculator.ephemeris_for(ephemeris).name
+        )
+
+    def calculate_chart(self, date, time, latitude, longitude, timezone, ephemeris=None,
+                        ayanamsa=None) -> Dict:
+        """
+        Drop-in replacement for VedicChartCalculator.calculate_chart
+
+        Identical birth moments entered with different local time/timezone
+        strings share one cached chart; the returned birth_details always
+        echo the caller's own inputs.
+        """
+        key = self.make_key(date, time, latitude, longitude, timezone, ephemeris, ayanamsa)
+        compact = self._cache.get_or_compute(
+            key,
+            lambda: self.calculator.calculate_compact_chart(
+                date=date,
+                time=time,
+                latitude=latitude,
+                longitude=longitude,
+                timezone=timezone,
+                ephemeris=ephemeris,
+                ayanamsa=ayanamsa
+            )
+        )
+        return self.calculator.expand_chart(
+            compact.with_birth_details(date, time, latitude, longitude, timezone)
+        )
+
+    async def compact_chart_async(self, executor, date, time, latitude, longitude, timezone,
+                                  ephemeris=None, ayanamsa=None) -> CompactChart:
+        """
+        Cached CompactChart for a birth, computed on a ChartExecutor on a miss
+
+        Args:
+            executor: app.utils.executor.ChartExecutor running the calculation
+            ephemeris: Ephemeris mode (default: the calculator's backend)
+            ayanamsa: Ayanamsa name (default: the calculator's)
+        """
+        key = self.make_key(date, time, latitude, longitude, timezone, ephemeris, ayanamsa)
+        compact = await self._cache.get_or_compute_async(
+            key,
+            lambda: executor.run(
+                'calculate_compact_chart',
+                date=date,
+                time=time,
+                latitude=latitude,
+                longitude=longitude,
+                timezone=timezone,
+                ephemeris=ephemeris,
+                ayanamsa=ayanamsa
+            )
+        )
+        return compact.with_birth_details(date, time, latitude, longitude, timezone)
+
+    async def calculate_chart_async(self, executor, date, time, latitude, longitude, timezone,
+                                    ephemeris=None, ayanamsa=None) -> Dict:
+        """
+        Like calculate_chart, but misses are computed on a ChartExecutor
+
+        Args:
+            executor: app.utils.executor.ChartExecutor running the calculation
+        """
+        compact = await self.compact_chart_async(
+            executor, date, time, latitude, longitude, timezone, ephemeris, ayanamsa
+        )
+        return self.calculator.expand_chart(compact)
+
+    async def vargas_async(self, executor, date, time, latitude, longitude, timezone,
+                           divisions=None, ephemeris=None, ayanamsa=None) -> Dict:
+        """
+        Divisional charts for a birth, computed once per chart key
+
+        All sixteen vargas are computed on the first request and cached;
+        divisions only filters what is returned.
+        """
+        key = self.make_key(date, time, latitude, longitude, timezone, ephemeris, ayanamsa)
+        vargas = await self._vargas.get_or_compute_async(
+            key,
+            lambda: executor.run(
+                'calculate_vargas',
+                date=date,
+                time=time,
+                latitude=latitude,
+                longitude=longitude,
+                timezone=timezone,
+                ephemeris=ephemeris,
+                ayanamsa=ayanamsa
+            )
+        )
+        if divisions is None:
+            return vargas
+        missing = [n for n in divisions if f'D{n}' not in vargas]
+        if missing:
+            raise ValueError(f"Unsupported vargas: {', '.join(f'D{n}' for n in missing)}")
+        return {f'D{n}': vargas[f'D{n}'] for n in divisions}
+
+    def stats(self) -> Dict:
+        """Hit/miss/eviction counters (vargas under 'vargas')"""
+        return {**self._cache.stats(), 'vargas': self._vargas.stats()}
+
+    def clear(self):
+        self._cache.clear()
+        self._vargas.clear()
+
+
+__all__ = ['ChartCache']
@@ -4,10 +4,37 @@ Uses Swiss Ephemeris for accurate planetary calculations
 """
 
 import swisseph as swe
+import numpy as np
 from datetime import datetime
 from typing import Dict, List
 from dateutil import tz
 
+from app.astrology.ayanamsa import ayanamsa_value, ayanamsa_values, resolve_ayanamsa
+from app.astrology.compact_chart import CompactChart
+from app.astrology.dasha import DashaTimeline
+from app.astrology.ephemeris import EPHEMERIS_MODES, get_ephemeris
+from app.astrology.events import find_events
+from app.astrology.muhurta import find_muhurtas
+from app.astrology.panchang import calculate_panchang
+from app.astrology.varga import varga_signs
+from app.utils.metrics import CHART_STAGE_SECONDS, NULL_STAGE_TIMER
+from app.utils.timezones import get_tz
+
+
+# Julian day of the Unix epoch (1970-01-01 00:00 UTC)
+UNIX_EPOCH_JD = 2440587.5
+
+# Exaltation/debilitation points used by _calculate_strengths, in PLANETS order
+STRENGTH_PLANETS = ['Sun', 'Moon', 'Mars', 'Mercury', 'Jupiter', 'Venus', 'Saturn']
+EXALTATION_POINTS = np.array([10, 33, 298, 165, 95, 357, 200], dtype=float)
+DEBILITATION_POINTS = np.array([190, 213, 118, 345, 275, 177, 20], dtype=float)
+
+# Reference birth used by VedicChartCalculator.warm_up
+WARM_UP_BIRTH = {
+    'date': '2000-01-01', 'time': '12:00',
+    'latitude': 28.6139, 'longitude': 77.2090, 'timezone': 'Asia/Kolkata'
+}
+
 
 class VedicChartCalculator:
     """Calculate Vedic astrology birth charts using Swiss Ephemeris"""
@@ -44,12 +71,74 @@ class VedicChartCalculator:
         'Purva Bhadrapada', 'Uttara Bhadrapada', 'Revati'
     ]
     
-    def __init__(self):
-        """Initialize the calculator"""
-        swe.set_ephe_path('')
-        print("🔮 VedicChartCalculator initialized")
+    def __init__(self, ephemeris_backend=None, tables_path=None, ayanamsa=None):
+        """
+        Initialize the calculator
+        
+        Args:
+            ephemeris_backend: Default ephemeris mode: 'moshier', 'swisseph'
+                (.se1 files) or 'tables' (precomputed, interpolated); see
+                app.astrology.ephemeris
+            tables_path: Table file for the 'tables' backend
+            ayanamsa: Default ayanamsa name (see app.astrology.ayanamsa;
+                default: Lahiri)
+        """
+        self.ephemeris = get_ephemeris(ephemeris_backend, tables_path)
+        self._tables_path = tables_path
+        # Backends for modes requested per call, built on first use
+        self._ephemerides = {self.ephemeris.name: self.ephemeris}
+        self.default_ayanamsa = resolve_ayanamsa(ayanamsa)
+        self.house_system = b'P'  # Placidus
+        print(f"🔮 VedicChartCalculator initialized (ephemeris: {self.ephemeris.name})")
     
-    def calculate_chart(self, date, time, latitude, longitude, timezone):
+    def ephemeris_for(self, mode=None):
+        """
+        Ephemeris backend for a calculation mode
+        
+        Args:
+            mode: 'moshier', 'swisseph' or 'tables' (None: the default backend)
+        
+        Returns:
+            Backend object (see app.astrology.ephemeris.get_ephemeris)
+        
+        Raises:
+            ValueError: Unknown mode, or one this deployment cannot provide
+                (e.g. 'swisseph' without ephemeris files)
+        """
+        if mode is None:
+            return self.ephemeris
+        backend = self._ephemerides.get(mode)
+        if backend is None:
+            if mode not in EPHEMERIS_MODES:
+                raise ValueError(f"Unknown ephemeris mode: {mode} (expected one of {', '.join(EPHEMERIS_MODES)})")
+            try:
+                backend = get_ephemeris(mode, self._tables_path)
+            except (OSError, ValueError, swe.Error) as e:
+                raise ValueError(f"Ephemeris mode {mode} is not available: {e}") from e
+            self._ephemerides[mode] = backend
+        return backend
+    
+    def ephemeris_modes(self):
+        """Declared accuracy of every mode, and whether this deployment provides it"""
+        modes = {}
+        for mode in EPHEMERIS_MODES:
+            try:
+                modes[mode] = {**self.ephemeris_for(mode).describe(), 'available': True}
+            except ValueError as e:
+                modes[mode] = {'mode': mode, 'available': False, 'error': str(e)}
+            modes[mode]['default'] = mode == self.ephemeris.name
+        return modes
+    
+    def ayanamsa_for(self, name=None):
+        """
+        Canonical ayanamsa name (None: the calculator's default)
+        
+        Raises:
+            ValueError: Unknown ayanamsa
+        """
+        return self.default_ayanamsa if name is None else resolve_ayanamsa(name)
+    
+    def calculate_chart(self, date, time, latitude, longitude, timezone, ephemeris=None, ayanamsa=None):
         """
         Calculate complete Vedic birth chart
         
@@ -59,74 +148,168 @@ class VedicChartCalculator:
             latitude: Birth place latitude
             longitude: Birth place longitude
             timezone: Timezone string
+            ephemeris: Ephemeris mode (default: the calculator's backend)
+            ayanamsa: Ayanamsa name, e.g. 'lahiri', 'raman', 'kp' (default:
+                the calculator's)
         
         Returns:
             Dictionary containing complete chart data
         """
-        # Parse datetime
-        dt_str = f"{date} {time}"
-        local_tz = tz.gettz(timezone)
-        dt_local = datetime.strptime(dt_str, "%Y-%m-%d %H:%M")
-        dt_local = dt_local.replace(tzinfo=local_tz)
-        dt_utc = dt_local.astimezone(tz.UTC)
+        stages = CHART_STAGE_SECONDS.stage_timer()
+        compact = self.calculate_compact_chart(
+            date, time, latitude, longitude, timezone, ephemeris, stages, ayanamsa
+        )
+        return self.expand_chart(compact, stages)
+    
+    def calculate_compact_chart(self, date, time, latitude, longitude, timezone, ephemeris=None,
+                                stages=None, ayanamsa=None):
+        """
+        Calculate a birth chart as a CompactChart (exact longitudes only)
+        
+        Args:
+            date, time, latitude, longitude, timezone, ephemeris, ayanamsa: As for calculate_chart
+            stages: StageTimer to lap (calculate_chart passes its own)
+        
+        Returns:
+            CompactChart; expand_chart turns it into the calculate_chart dict
+        """
+        stages = stages or CHART_STAGE_SECONDS.stage_timer()
+        ayanamsa_name = self.ayanamsa_for(ayanamsa)
         
         # Calculate Julian day
-        jd = swe.julday(
-            dt_utc.year, dt_utc.month, dt_utc.day,
-            dt_utc.hour + dt_utc.minute/60.0
-        )
+        dt_utc = self._to_utc(date, time, timezone)
+        stages.lap('parse')
+        jd = self._utc_julday(dt_utc)
+        stages.lap('julday')
         
-        # Calculate Ayanamsa (Lahiri)
-        swe.set_sid_mode(swe.SIDM_LAHIRI)
-        ayanamsa = swe.get_ayanamsa(jd)
+        # Calculate Ayanamsa
+        ayanamsa = ayanamsa_value(jd, ayanamsa_name)
+        stages.lap('ayanamsa')
         
         # Calculate planetary positions
-        planets = self._calculate_planets(jd, ayanamsa)
+        backend = self.ephemeris_for(ephemeris)
+        tropical, _ = backend.positions(jd)
+        sidereal = self._sidereal_longitudes(tropical, ayanamsa)
+        stages.lap('planets')
         
         # Calculate Ascendant
-        ascendant = self._calculate_ascendant(jd, latitude, longitude, ayanamsa)
+        sidereal_asc = self._sidereal_ascendant(jd, latitude, longitude, ayanamsa)
+        stages.lap('ascendant')
+        
+        return CompactChart(
+            date, time, latitude, longitude, timezone,
+            jd, ayanamsa, sidereal + [sidereal_asc],
+            ephemeris=backend.backend_for(jd).name,
+            ayanamsa_name=ayanamsa_name
+        )
+    
+    def expand_chart(self, compact, stages=None):
+        """
+        Build the full calculate_chart dict from a CompactChart
+        
+        Args:
+            compact: CompactChart from calculate_compact_chart
+            stages: StageTimer to lap (optional)
+        
+        Returns:
+            Dictionary containing complete chart data
+        """
+        stages = stages or NULL_STAGE_TIMER
+        sidereal = compact.longitudes.tolist()
+        planets = self._planet_entries(sidereal[:-1])
+        ascendant = self._ascendant_entry(sidereal[-1])
         
         # Calculate houses
         houses = self._calculate_houses(ascendant)
         
         # Calculate Moon's Nakshatra
         moon_nakshatra = self._calculate_nakshatra(planets['Moon']['longitude'])
+        stages.lap('houses')
         
         # Determine planetary strengths
         strengths = self._calculate_strengths(planets, ascendant)
+        stages.lap('strengths')
         
         # Generate basic interpretation
         interpretation = self._generate_basic_interpretation(
             planets, ascendant, moon_nakshatra
         )
+        stages.lap('interpretation')
+        
+        # Vimshottari Dasha from the Moon's exact (unrounded) longitude
+        moon_longitude = sidereal[list(self.PLANETS).index('Moon')]
+        dasha = DashaTimeline(compact.julian_day, moon_longitude).to_dict()
+        stages.lap('dasha')
         
         return {
             'birth_details': {
-                'date': date,
-                'time': time,
+                'date': compact.date,
+                'time': compact.time,
                 'location': {
-                    'latitude': latitude,
-                    'longitude': longitude,
-                    'timezone': timezone
+                    'latitude': compact.latitude,
+                    'longitude': compact.longitude,
+                    'timezone': compact.timezone
                 },
-                'ayanamsa': round(ayanamsa, 2)
+                'ayanamsa': round(compact.ayanamsa, 2),
+                'ayanamsa_name': compact.ayanamsa_name
             },
             'ascendant': ascendant,
             'planets': planets,
             'houses': houses,
             'moon_nakshatra': moon_nakshatra,
             'strengths': strengths,
-            'interpretation': interpretation
+            'interpretation': interpretation,
+            'dasha': dasha,
+            'ephemeris': self._ephemeris_details(compact.ephemeris)
         }
     
-    def _calculate_planets(self, jd, ayanamsa):
-        """Calculate positions of all planets"""
-        planet_data = {}
+    def _ephemeris_details(self, mode):
+        """Mode that produced a chart, with its declared accuracy"""
+        description = self.ephemeris_for(mode).describe()
+        return {'mode': mode, 'max_error_arcsec': description['max_error_arcsec']}
+    
+    def julian_day(self, date, time, timezone):
+        """
+        Convert a local birth date/time to a UTC Julian day
         
-        for name, planet_id in self.PLANETS.items():
-            # Calculate planet position
-            result = swe.calc_ut(jd, planet_id)
-            tropical_long = result[0][0]
+        Args:
+            date: Birth date (YYYY-MM-DD)
+            time: Birth time (HH:MM)
+            timezone: Timezone string
+        
+        Returns:
+            Julian day (UT), to whole-minute resolution
+        """
+        return self._utc_julday(self._to_utc(date, time, timezone))
+    
+    def _to_utc(self, date, time, timezone):
+        """Parse a local birth date/time into a UTC datetime"""
+        dt_str = f"{date} {time}"
+        local_tz = get_tz(timezone)
+        dt_local = datetime.strptime(dt_str, "%Y-%m-%d %H:%M")
+        dt_local = dt_local.replace(tzinfo=local_tz)
+        return dt_local.astimezone(tz.UTC)
+    
+    def _utc_julday(self, dt_utc):
+        """Julian day (UT) of a UTC datetime, to whole-minute resolution"""
+        return swe.julday(
+            dt_utc.year, dt_utc.month, dt_utc.day,
+            dt_utc.hour + dt_utc.minute/60.0
+        )
+    
+    def _calculate_planets(self, jd, ayanamsa, tropical=None):
+        """Calculate positions of all planets"""
+        # Tropical positions for Sun..Saturn and the node, in one backend call
+        if tropical is None:
+            tropical, _ = self.ephemeris.positions(jd)
+        return self._planet_entries(self._sidereal_longitudes(tropical, ayanamsa))
+    
+    def _sidereal_longitudes(self, tropical, ayanamsa):
+        """Exact sidereal longitudes of PLANETS from the backend's tropical positions"""
+        longitudes = []
+        for j, name in enumerate(self.PLANETS):
+            # Ketu reuses Rahu's node position
+            tropical_long = float(tropical[min(j, len(tropical) - 1)])
             
             # Convert to sidereal (Vedic)
             sidereal_long = tropical_long - ayanamsa
@@ -139,6 +322,15 @@ class VedicChartCalculator:
             if name == 'Ketu':
                 sidereal_long = (sidereal_long + 180) % 360
             
+            longitudes.append(sidereal_long)
+        
+        return longitudes
+    
+    def _planet_entries(self, sidereal_longitudes):
+        """Per-planet chart entries from exact sidereal longitudes"""
+        planet_data = {}
+        
+        for name, sidereal_long in zip(self.PLANETS, sidereal_longitudes):
             # Determine sign and degree
             sign_num = int(sidereal_long / 30)
             degree_in_sign = sidereal_long % 30
@@ -156,15 +348,22 @@ class VedicChartCalculator:
     
     def _calculate_ascendant(self, jd, lat, lon, ayanamsa):
         """Calculate Ascendant (Lagna)"""
+        return self._ascendant_entry(self._sidereal_ascendant(jd, lat, lon, ayanamsa))
+    
+    def _sidereal_ascendant(self, jd, lat, lon, ayanamsa):
+        """Exact sidereal longitude of the Ascendant"""
         # Calculate houses using Placidus system
-        houses_result = swe.houses(jd, lat, lon)
+        houses_result = swe.houses(jd, lat, lon, self.house_system)
         tropical_asc = houses_result[1][0]
         
         # Convert to sidereal
         sidereal_asc = tropical_asc - ayanamsa
         if sidereal_asc < 0:
             sidereal_asc += 360
-        
+        return sidereal_asc
+    
+    def _ascendant_entry(self, sidereal_asc):
+        """Ascendant chart entry from its exact sidereal longitude"""
         sign_num = int(sidereal_asc / 30)
         degree = sidereal_asc % 30
         
@@ -210,6 +409,358 @@ class VedicChartCalculator:
                 'Rahu', 'Jupiter', 'Saturn', 'Mercury']
         return lords[nakshatra_num % 9]
     
+    def calculate_charts_batch(self, dates, times, latitudes, longitudes, timezones,
+                               columnar=False, ephemeris=None, ayanamsa=None):
+        """
+        Calculate many Vedic birth charts in one pass
+        
+        The ephemeris backend is only queried for raw tropical positions;
+        sidereal conversion, sign/nakshatra/pada lookup and strength
+        scoring are done as NumPy array operations over the whole batch.
+        
+        Args:
+            dates: Sequence of birth dates (YYYY-MM-DD)
+            times: Sequence of birth times (HH:MM)
+            latitudes: Sequence of birth place latitudes
+            longitudes: Sequence of birth place longitudes
+            timezones: Sequence of timezone strings
+            columnar: Return a dict of NumPy arrays instead of chart dicts
+            ephemeris: Ephemeris mode (default: the calculator's backend)
+            ayanamsa: Ayanamsa name (default: the calculator's)
+        
+        Returns:
+            List of chart dicts matching calculate_chart, or columnar arrays
+        """
+        n = len(dates)
+        if not (len(times) == len(latitudes) == len(longitudes) == len(timezones) == n):
+            raise ValueError("All batch input sequences must have the same length")
+        
+        ayanamsa_name = self.ayanamsa_for(ayanamsa)
+        latitudes = np.asarray(latitudes, dtype=float)
+        longitudes = np.asarray(longitudes, dtype=float)
+        jd = self._julian_days_batch(dates, times, timezones)
+        
+        # Raw tropical positions (Rahu/Ketu share one MEAN_NODE position)
+        backend = self.ephemeris_for(ephemeris)
+        tropical, _ = backend.positions_batch(jd)
+        
+        ayanamsa = ayanamsa_values(jd, [ayanamsa_name])[0]
+        tropical_asc = np.empty(n)
+        for i in range(n):
+            tropical_asc[i] = swe.houses(jd[i], latitudes[i], longitudes[i], self.house_system)[1][0]
+        
+        # Sidereal conversion; Ketu is 180 degrees from Rahu
+        sidereal = (tropical - ayanamsa[:, None]) % 360
+        sidereal = np.column_stack([sidereal, (sidereal[:, -1] + 180) % 360])
+        sidereal_asc = (tropical_asc - ayanamsa) % 360
+        
+        columns = {
+            'julian_day': jd,
+            'ayanamsa': ayanamsa,
+            'moon_longitude_exact': sidereal[:, list(self.PLANETS).index('Moon')],
+            'planet_longitude_exact': sidereal,
+            'ascendant_longitude_exact': sidereal_asc,
+            'planet_longitude': np.round(sidereal, 2),
+            'planet_sign_num': np.minimum(sidereal // 30, 11).astype(np.int8),
+            'planet_degree': np.round(sidereal % 30, 2),
+            'planet_nakshatra_num': np.minimum(sidereal // 13.333333, 26).astype(np.int8),
+            'ascendant_longitude': np.round(sidereal_asc, 2),
+            'ascendant_sign_num': np.minimum(sidereal_asc // 30, 11).astype(np.int8),
+            'ascendant_degree': np.round(sidereal_asc % 30, 2),
+            # Mode that produced each chart (the tables mode falls back outside its range)
+            'ephemeris_mode': np.array([backend.backend_for(j).name for j in jd]),
+        }
+        
+        # Moon's nakshatra, pada and lord (from the rounded longitude, as calculate_chart does)
+        moon_long = columns['planet_longitude'][:, list(self.PLANETS).index('Moon')]
+        columns['moon_nakshatra_num'] = np.minimum(moon_long // 13.333333, 26).astype(np.int8)
+        columns['moon_pada'] = ((moon_long % 13.333333) // 3.333333 + 1).astype(np.int8)
+        
+        # Strength scoring against exaltation/debilitation points
+        strength_long = columns['planet_longitude'][:, :len(STRENGTH_PLANETS)]
+        exalt_diff = np.abs(strength_long - EXALTATION_POINTS)
+        debil_diff = np.abs(strength_long - DEBILITATION_POINTS)
+        score = (50
+                 + np.where(exalt_diff < 15, (15 - exalt_diff) * 2, 0)
+                 - np.where(debil_diff < 15, (15 - debil_diff) * 2, 0))
+        columns['strength_score'] = score
+        columns['strength_adjusted'] = (exalt_diff < 15) | (debil_diff < 15)
+        
+        if columnar:
+            return columns
+        
+        return [
+            self._expand_batch_chart(i, columns, dates[i], times[i],
+                                     latitudes[i], longitudes[i], timezones[i], ayanamsa_name)
+            for i in range(n)
+        ]
+    
+    def calculate_vargas(self, date, time, latitude, longitude, timezone, divisions=None,
+                         ephemeris=None, ayanamsa=None):
+        """
+        Divisional chart signs of the lagna and all grahas for one birth
+        
+        Returns:
+            Dict of 'D<n>' -> {'Lagna': sign, 'Sun': sign, ...}
+        """
+        return self.calculate_vargas_batch(
+            [date], [time], [latitude], [longitude], [timezone], divisions,
+            ephemeris=ephemeris, ayanamsa=ayanamsa
+        )[0]
+    
+    def calculate_vargas_batch(self, dates, times, latitudes, longitudes, timezones,
+                               divisions=None, columnar=False, ephemeris=None, ayanamsa=None):
+        """
+        Divisional charts for many births from exact sidereal longitudes
+        
+        Args:
+            dates, times, latitudes, longitudes, timezones: As for calculate_charts_batch
+            divisions: Varga numbers, e.g. [9, 10] (default: all sixteen)
+            columnar: Return 'D<n>' -> (N, 10) sign index arrays (Lagna first,
+                then PLANETS order) instead of per-chart dicts
+            ephemeris: Ephemeris mode (default: the calculator's backend)
+            ayanamsa: Ayanamsa name (default: the calculator's)
+        
+        Returns:
+            List of per-chart varga dicts, or columnar arrays
+        """
+        columns = self.calculate_charts_batch(
+            dates, times, latitudes, longitudes, timezones, columnar=True,
+            ephemeris=ephemeris, ayanamsa=ayanamsa
+        )
+        longitudes_exact = np.column_stack([
+            columns['ascendant_longitude_exact'], columns['planet_longitude_exact']
+        ])
+        signs = varga_signs(longitudes_exact, divisions)
+        if columnar:
+            return signs
+        
+        bodies = ['Lagna'] + list(self.PLANETS)
+        return [
+            {
+                varga: {body: self.SIGNS[s] for body, s in zip(bodies, rows[i])}
+                for varga, rows in signs.items()
+            }
+            for i in range(len(dates))
+        ]
+    
+    def sidereal_positions_batch(self, jds, ayanamsa=None, ephemeris=None):
+        """
+        Sidereal longitudes and daily speeds of all PLANETS at many instants
+        
+        Args:
+            jds: Sequence of Julian days (UT)
+            ayanamsa: Ayanamsa name (default: the calculator's)
+            ephemeris: Ephemeris mode (default: the calculator's backend)
+        
+        Returns:
+            (longitudes, speeds) arrays of shape (len(jds), len(PLANETS))
+        """
+        jds = np.asarray(jds, dtype=float)
+        tropical, speeds = self.ephemeris_for(ephemeris).positions_batch(jds)
+        ayanamsa = ayanamsa_values(jds, [self.ayanamsa_for(ayanamsa)])[0]
+        
+        # Ketu is 180 degrees from Rahu and moves with it
+        sidereal = (tropical - ayanamsa[:, None]) % 360
+        return (
+            np.column_stack([sidereal, (sidereal[:, -1] + 180) % 360]),
+            np.column_stack([speeds, speeds[:, -1]])
+        )
+    
+    def sidereal_body_positions(self, jds, planet, ayanamsa=None, ephemeris=None):
+        """
+        Sidereal longitudes and daily speeds of one planet at many instants
+        
+        Args:
+            jds: Sequence of Julian days (UT)
+            planet: Name from PLANETS
+            ayanamsa: Ayanamsa name (default: the calculator's)
+            ephemeris: Ephemeris mode (default: the calculator's backend)
+        
+        Returns:
+            (longitudes, speeds) arrays of shape (len(jds),)
+        """
+        jds = np.asarray(jds, dtype=float)
+        # Ketu reuses Rahu's node position
+        body = min(list(self.PLANETS).index(planet), len(self.PLANETS) - 2)
+        tropical, speeds = self.ephemeris_for(ephemeris).body_positions(jds, body)
+        
+        ayanamsa = ayanamsa_values(jds, [self.ayanamsa_for(ayanamsa)])[0]
+        sidereal = (tropical - ayanamsa) % 360
+        if planet == 'Ketu':
+            sidereal = (sidereal + 180) % 360
+        return sidereal, speeds
+    
+    def sidereal_ascendants(self, jds, latitude, longitude, ayanamsa=None):
+        """
+        Exact sidereal longitudes of the Ascendant at many instants, at one place
+        
+        Args:
+            jds: Sequence of Julian days (UT)
+            latitude, longitude: Place
+            ayanamsa: Ayanamsa name (default: the calculator's)
+        
+        Returns:
+            Array of shape (len(jds),)
+        """
+        jds = np.asarray(jds, dtype=float)
+        tropical = np.array([swe.houses(jd, latitude, longitude, self.house_system)[1][0] for jd in jds])
+        return (tropical - ayanamsa_values(jds, [self.ayanamsa_for(ayanamsa)])[0]) % 360
+    
+    def find_muhurtas(self, start_jd, end_jd, latitude, longitude, constraints=None,
+                      timezone='UTC', ayanamsa=None):
+        """
+        Windows where muhurta constraints hold at one place
+        
+        See app.astrology.muhurta.find_muhurtas
+        """
+        return find_muhurtas(self, start_jd, end_jd, latitude, longitude, constraints, timezone, ayanamsa)
+    
+    def calculate_panchang(self, start_date, days, latitude, longitude, timezone, ayanamsa=None):
+        """
+        Daily panchang for a run of local days at one place
+        
+        See app.astrology.panchang.calculate_panchang
+        """
+        return calculate_panchang(self, start_date, days, latitude, longitude, timezone, ayanamsa)
+    
+    def find_events(self, start_jd, end_jd, planets=None, types=None, ayanamsa=None):
+        """
+        Sign ingresses, nakshatra changes, stations and Moon phases in a range
+        
+        See app.astrology.events.find_events
+        """
+        return find_events(self, start_jd, end_jd, planets, types, ayanamsa)
+    
+    def calculate_ayanamsa_variants(self, date, time, latitude, longitude, timezone, ayanamsas,
+                                    ephemeris=None):
+        """
+        The same birth under several ayanamsas
+        
+        Tropical planet and ascendant positions are computed once; every
+        sidereal variant is derived from them in one array subtraction.
+        
+        Args:
+            date, time, latitude, longitude, timezone, ephemeris: As for calculate_chart
+            ayanamsas: Ayanamsa names
+        
+        Returns:
+            Dict of canonical name -> {'ayanamsa', 'ascendant', 'planets', 'moon_nakshatra'}
+        """
+        names = list(dict.fromkeys(resolve_ayanamsa(name) for name in ayanamsas))
+        jd = self.julian_day(date, time, timezone)
+        tropical, _ = self.ephemeris_for(ephemeris).positions(jd)
+        tropical_asc = swe.houses(jd, latitude, longitude, self.house_system)[1][0]
+        offsets = ayanamsa_values([jd], names)[:, 0]
+        
+        # (variants, bodies): Ketu is 180 degrees from Rahu, the ascendant last
+        sidereal = (np.append(tropical, tropical_asc) - offsets[:, None]) % 360
+        sidereal = np.column_stack([sidereal[:, :-1], (sidereal[:, -2] + 180) % 360, sidereal[:, -1]])
+        
+        variants = {}
+        for name, offset, row in zip(names, offsets, sidereal.tolist()):
+            planets = self._planet_entries(row[:-1])
+            variants[name] = {
+                'ayanamsa': round(float(offset), 6),
+                'ascendant': self._ascendant_entry(row[-1]),
+                'planets': planets,
+                'moon_nakshatra': self._calculate_nakshatra(planets['Moon']['longitude'])
+            }
+        return variants
+    
+    def warm_up(self):
+        """
+        Run every calculation path once, ahead of traffic
+        
+        Loads the ephemeris data, fills the timezone and table caches and
+        gets first-call costs out of the way. Stage metrics are not recorded.
+        """
+        self.ephemeris.preload()
+        birth = WARM_UP_BIRTH
+        self.expand_chart(self.calculate_compact_chart(**birth, stages=NULL_STAGE_TIMER))
+        self.calculate_charts_batch(*([birth[key]] * 2 for key in birth), columnar=True)
+        self.calculate_vargas(**birth)
+        jd = self.julian_day(birth['date'], birth['time'], birth['timezone'])
+        self.find_events(jd, jd + 2)
+        self.find_muhurtas(jd, jd + 1, birth['latitude'], birth['longitude'])
+        self.calculate_panchang(birth['date'], 1, birth['latitude'], birth['longitude'], birth['timezone'])
+    
+    def _julian_days_batch(self, dates, times, timezones):
+        """Convert local birth dates/times to UTC Julian days"""
+        timestamps = np.empty(len(dates))
+        
+        for i, (date, time, timezone) in enumerate(zip(dates, times, timezones)):
+            dt_local = datetime.strptime(f"{date} {time}", "%Y-%m-%d %H:%M")
+            timestamps[i] = dt_local.replace(tzinfo=get_tz(timezone)).timestamp()
+        
+        # calculate_chart only passes whole UTC minutes to swe.julday
+        return np.floor(timestamps / 60.0) / 1440.0 + UNIX_EPOCH_JD
+    
+    def _expand_batch_chart(self, i, columns, date, time, latitude, longitude, timezone, ayanamsa_name):
+        """Build one calculate_chart-shaped dict from batch columns"""
+        planets = {}
+        for j, name in enumerate(self.PLANETS):
+            sign_num = int(columns['planet_sign_num'][i, j])
+            planets[name] = {
+                'longitude': float(columns['planet_longitude'][i, j]),
+                'sign': self.SIGNS[sign_num],
+                'sign_num': sign_num,
+                'degree': float(columns['planet_degree'][i, j]),
+                'nakshatra': self.NAKSHATRAS[columns['planet_nakshatra_num'][i, j]],
+                'house': None
+            }
+        
+        asc_sign_num = int(columns['ascendant_sign_num'][i])
+        ascendant = {
+            'longitude': float(columns['ascendant_longitude'][i]),
+            'sign': self.SIGNS[asc_sign_num],
+            'sign_num': asc_sign_num,
+            'degree': float(columns['ascendant_degree'][i])
+        }
+        
+        nakshatra_num = int(columns['moon_nakshatra_num'][i])
+        moon_nakshatra = {
+            'name': self.NAKSHATRAS[nakshatra_num],
+            'pada': int(columns['moon_pada'][i]),
+            'lord': self._get_nakshatra_lord(nakshatra_num)
+        }
+        
+        strengths = {}
+        for j, planet in enumerate(STRENGTH_PLANETS):
+            strength_score = float(columns['strength_score'][i, j])
+            if not columns['strength_adjusted'][i, j]:
+                strength_score = 50
+            strengths[planet] = {
+                'score': max(0, min(100, strength_score)),
+                'status': 'Strong' if strength_score > 70 else 'Moderate' if strength_score > 40 else 'Weak'
+            }
+        
+        return {
+            'birth_details': {
+                'date': date,
+                'time': time,
+                'location': {
+                    'latitude': float(latitude),
+                    'longitude': float(longitude),
+                    'timezone': timezone
+                },
+                'ayanamsa': round(float(columns['ayanamsa'][i]), 2),
+                'ayanamsa_name': ayanamsa_name
+            },
+            'ascendant': ascendant,
+            'planets': planets,
+            'houses': self._calculate_houses(ascendant),
+            'moon_nakshatra': moon_nakshatra,
+            'strengths': strengths,
+            'interpretation': self._generate_basic_interpretation(
+                planets, ascendant, moon_nakshatra
+            ),
+            'dasha': DashaTimeline(
+                columns['julian_day'][i], columns['moon_longitude_exact'][i]
+            ).to_dict(),
+            'ephemeris': self._ephemeris_details(str(columns['ephemeris_mode'][i]))
+        }
+    
     def _calculate_strengths(self, planets, ascendant):
         """Calculate basic planetary strengths"""
         strengths = {}
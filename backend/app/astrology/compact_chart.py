@@ -0,0 +1,92 @@
+"""
+Compact chart representation
+A chart reduced to what determines it: the birth inputs, the Julian day,
+the ayanamsa system and value, ten exact sidereal longitudes (PLANETS order,
+then the ascendant) and the ephemeris mode that produced them. Sign, nakshatra and house names are indices into the
+calculator's tables, and the full dict is built only on demand by
+VedicChartCalculator.expand_chart.
+"""
+
+import hashlib
+import struct
+
+import numpy as np
+
+
+# Bump when the expanded dict layout changes, so clients' ETags stop matching
+CHART_FORMAT_VERSION = 3
+
+NAKSHATRA_SPAN = 13.333333  # as used by the calculator's lookups
+
+
+class CompactChart:
+    """Birth inputs plus exact sidereal longitudes (9 grahas, then the ascendant)"""
+
+    __slots__ = (
+        'date', 'time', 'latitude', 'longitude', 'timezone',
+        'julian_day', 'ayanamsa', 'longitudes', 'ephemeris', 'ayanamsa_name'
+    )
+
+    def __init__(self, date, time, latitude, longitude, timezone, julian_day, ayanamsa, longitudes,
+                 ephemeris, ayanamsa_name):
+        self.date = date
+        self.time = time
+        self.latitude = latitude
+        self.longitude = longitude
+        self.timezone = timezone
+        self.julian_day = float(julian_day)
+        self.ayanamsa = float(ayanamsa)
+        self.longitudes = np.asarray(longitudes, dtype=np.float64)
+        self.ephemeris = ephemeris
+        self.ayanamsa_name = ayanamsa_name
+
+    def __getstate__(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __setstate__(self, state):
+        for name, value in zip(self.__slots__, state):
+            setattr(self, name, value)
+
+    def __repr__(self):
+        return (f"CompactChart({self.date} {self.time} {self.timezone}, jd={self.julian_day:.5f}, "
+                f"{self.ephemeris}, {self.ayanamsa_name})")
+
+    @property
+    def planet_longitudes(self) -> np.ndarray:
+        return self.longitudes[:-1]
+
+    @property
+    def ascendant_longitude(self) -> float:
+        return float(self.longitudes[-1])
+
+    @property
+    def sign_indices(self) -> np.ndarray:
+        """Sign index (0 = Aries) of every body, ascendant last"""
+        return np.minimum(self.longitudes // 30, 11).astype(np.int8)
+
+    @property
+    def nakshatra_indices(self) -> np.ndarray:
+        """Nakshatra index (0 = Ashwini) of every body, ascendant last"""
+        return np.minimum(self.longitudes // NAKSHATRA_SPAN, 26).astype(np.int8)
+
+    def with_birth_details(self, date, time, latitude, longitude, timezone) -> 'CompactChart':
+        """Copy (sharing the longitude array) that echoes other birth inputs"""
+        return CompactChart(
+            date, time, latitude, longitude, timezone,
+            self.julian_day, self.ayanamsa, self.longitudes, self.ephemeris, self.ayanamsa_name
+        )
+
+    def etag(self) -> str:
+        """Strong HTTP entity tag of the expanded chart, computed without expanding it"""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(struct.pack('<i', CHART_FORMAT_VERSION))
+        digest.update(
+            f"{self.date}|{self.time}|{self.latitude!r}|{self.longitude!r}|{self.timezone}|{self.ephemeris}"
+            f"|{self.ayanamsa_name}".encode()
+        )
+        digest.update(struct.pack('<dd', self.julian_day, self.ayanamsa))
+        digest.update(self.longitudes.tobytes())
+        return f'"{digest.hexdigest()}"'
+
+
+__all__ = ['CompactChart', 'CHART_FORMAT_VERSION']
@@ -0,0 +1,256 @@
+"""
+Ashtakoota (Guna Milan) compatibility matching
+Every koota depends only on the two Moon positions, resolved here to the
+108 nakshatra padas. The eight 108x108 score tables are built once at
+import, so scoring any number of pairs is a table lookup.
+"""
+
+import numpy as np
+from typing import Dict, List
+
+from app.astrology.chart_calculator import VedicChartCalculator
+
+
+KOOTAS = ['varna', 'vashya', 'tara', 'yoni', 'graha_maitri', 'gana', 'bhakoot', 'nadi']
+KOOTA_MAX = np.array([1, 2, 3, 4, 5, 6, 7, 8], dtype=float)
+MAX_SCORE = float(KOOTA_MAX.sum())  # 36
+
+PADAS = 108
+NAKSHATRA_SPAN = 360.0 / 27
+PADA_SPAN = NAKSHATRA_SPAN / 4
+
+# --- Per-sign attributes (Aries..Pisces) ---
+
+# Varna rank: Brahmin 3, Kshatriya 2, Vaishya 1, Shudra 0
+SIGN_VARNA = np.array([2, 1, 0, 3, 2, 1, 0, 3, 2, 1, 0, 3])
+
+# Sign lords: Sun, Moon, Mars, Mercury, Jupiter, Venus, Saturn = 0..6
+SIGN_LORD = np.array([2, 5, 3, 1, 0, 3, 5, 2, 4, 6, 6, 4])
+
+# Natural relationship of planet (row) towards planet (col):
+# 1 friend, 0 neutral, -1 enemy
+PLANET_RELATIONS = np.array([
+    # Sun Moon Mars Merc Jup Ven Sat
+    [1, 1, 1, 0, 1, -1, -1],    # Sun
+    [1, 1, 0, 1, 0, 0, 0],      # Moon
+    [1, 1, 1, -1, 1, 0, 0],     # Mars
+    [1, -1, 0, 1, 0, 1, 0],     # Mercury
+    [1, 1, 1, -1, 1, -1, 0],    # Jupiter
+    [-1, -1, 0, 1, 0, 1, 1],    # Venus
+    [-1, -1, -1, 1, 0, 1, 1],   # Saturn
+])
+
+# Graha Maitri points by the two lords' relations (enemy, neutral, friend)
+# to each other; a shared lord scores the full 5
+MAITRI_SCORES = np.array([
+    [0, 0.5, 1],
+    [0.5, 3, 4],
+    [1, 4, 5],
+])
+
+# --- Vashya groups: Chatushpada, Manava, Jalachara, Vanachara, Keeta ---
+# (first, second) half of each sign
+SIGN_VASHYA = [
+    (0, 0), (0, 0), (1, 1), (2, 2), (3, 3), (1, 1),
+    (1, 1), (4, 4), (1, 0), (0, 2), (1, 1), (2, 2)
+]
+VASHYA_SCORES = np.array([
+    [2, 1, 1, 0.5, 1],
+    [1, 2, 0.5, 0, 1],
+    [1, 0.5, 2, 1, 1],
+    [0.5, 0, 1, 2, 0],
+    [1, 1, 1, 0, 2],
+])
+
+# --- Per-nakshatra attributes (Ashwini..Revati) ---
+
+# Yoni animals: Horse, Elephant, Sheep, Serpent, Dog, Cat, Rat, Cow,
+# Buffalo, Tiger, Deer, Monkey, Mongoose, Lion
+NAKSHATRA_YONI = np.array([
+    0, 1, 2, 3, 3, 4, 5, 2, 5, 6, 6, 7, 8, 9,
+    8, 9, 10, 10, 4, 11, 12, 11, 13, 0, 13, 7, 1
+])
+YONI_SCORES = np.array([
+    [4, 2, 2, 3, 2, 2, 2, 1, 0, 1, 3, 3, 2, 1],
+    [2, 4, 3, 3, 2, 2, 2, 2, 3, 1, 2, 3, 2, 0],
+    [2, 3, 4, 2, 1, 2, 1, 3, 3, 1, 2, 0, 3, 1],
+    [3, 3, 2, 4, 2, 1, 1, 1, 1, 2, 2, 2, 0, 2],
+    [2, 2, 1, 2, 4, 2, 1, 2, 2, 1, 0, 2, 1, 1],
+    [2, 2, 2, 1, 2, 4, 0, 2, 2, 1, 3, 3, 2, 1],
+    [2, 2, 1, 1, 1, 0, 4, 2, 2, 2, 2, 2, 1, 2],
+    [1, 2, 3, 1, 2, 2, 2, 4, 3, 0, 3, 2, 2, 1],
+    [0, 3, 3, 1, 2, 2, 2, 3, 4, 1, 2, 2, 2, 1],
+    [1, 1, 1, 2, 1, 1, 2, 0, 1, 4, 1, 1, 2, 1],
+    [3, 2, 2, 2, 0, 3, 2, 3, 2, 1, 4, 2, 2, 1],
+    [3, 3, 0, 2, 2, 3, 2, 2, 2, 1, 2, 4, 3, 2],
+    [2, 2, 3, 0, 1, 2, 1, 2, 2, 2, 2, 3, 4, 2],
+    [1, 0, 1, 2, 1, 1, 2, 1, 1, 1, 1, 2, 2, 4],
+])
+
+# Gana: Deva 0, Manushya 1, Rakshasa 2
+NAKSHATRA_GANA = np.array([
+    0, 1, 2, 1, 0, 1, 0, 0, 2, 2, 1, 1, 0, 2,
+    0, 2, 0, 2, 2, 1, 1, 0, 2, 2, 1, 1, 0
+])
+# Groom's gana (row) against bride's gana (col)
+GANA_SCORES = np.array([
+    [6, 6, 1],
+    [5, 6, 0],
+    [1, 0, 6],
+])
+
+# Nadi: Adi 0, Madhya 1, Antya 2 (zig-zag through the nakshatras)
+NAKSHATRA_NADI = np.array([[0, 1, 2, 2, 1, 0][n % 6] for n in range(27)])
+
+
+def _build_tables() -> np.ndarray:
+    """
+    Koota scores for every (groom pada, bride pada) pair
+
+    Returns:
+        (8, 108, 108) float32 array in KOOTAS order
+    """
+    pada = np.arange(PADAS)
+    nakshatra = pada // 4
+    sign = pada // 9
+    # Vashya of the half sign containing the pada's midpoint
+    second_half = ((pada + 0.5) * PADA_SPAN) % 30 >= 15
+    vashya = np.array([SIGN_VASHYA[s][int(h)] for s, h in zip(sign, second_half)])
+
+    g = (slice(None), None)   # groom along rows
+    b = (None, slice(None))   # bride along columns
+    tables = np.zeros((len(KOOTAS), PADAS, PADAS))
+
+    # Varna: 1 if the groom's varna is at least the bride's
+    tables[0] = SIGN_VARNA[sign][g] >= SIGN_VARNA[sign][b]
+
+    tables[1] = VASHYA_SCORES[vashya[g], vashya[b]]
+
+    # Tara: count from one nakshatra to the other, remainder 3/5/7 is
+    # inauspicious; 1.5 points for each direction that is auspicious
+    def tara_ok(src, dst):
+        return (~np.isin(((dst - src) % 27 + 1) % 9, (3, 5, 7))).astype(float)
+    tables[2] = 1.5 * (tara_ok(nakshatra[b], nakshatra[g]) + tara_ok(nakshatra[g], nakshatra[b]))
+
+    tables[3] = YONI_SCORES[NAKSHATRA_YONI[nakshatra][g], NAKSHATRA_YONI[nakshatra][b]]
+
+    # Graha Maitri from the two Moon sign lords' relations to each other
+    lord_g, lord_b = SIGN_LORD[sign][g], SIGN_LORD[sign][b]
+    maitri = MAITRI_SCORES[PLANET_RELATIONS[lord_g, lord_b] + 1, PLANET_RELATIONS[lord_b, lord_g] + 1]
+    tables[4] = np.where(lord_g == lord_b, 5.0, maitri)
+
+    tables[5] = GANA_SCORES[NAKSHATRA_GANA[nakshatra][g], NAKSHATRA_GANA[nakshatra][b]]
+
+    # Bhakoot: 2/12, 5/9 and 6/8 sign relationships score nothing
+    distance = (sign[g] - sign[b]) % 12 + 1
+    tables[6] = np.where(np.isin(distance, (2, 12, 5, 9, 6, 8)), 0.0, 7.0)
+
+    # Nadi: 8 points only when the nadis differ
+    tables[7] = np.where(NAKSHATRA_NADI[nakshatra][g] != NAKSHATRA_NADI[nakshatra][b], 8.0, 0.0)
+
+    return tables.astype(np.float32)
+
+
+KOOTA_TABLES = _build_tables()
+TOTAL_TABLE = KOOTA_TABLES.sum(axis=0)
+
+
+def pada_index(nakshatra_num, pada):
+    """Moon nakshatra (0-26) and pada (1-4), scalars or arrays, to a pada index (0-107)"""
+    return np.asarray(nakshatra_num, dtype=int) * 4 + np.asarray(pada, dtype=int) - 1
+
+
+def chart_pada_index(chart_data: Dict) -> int:
+    """Moon pada index of a chart from VedicChartCalculator.calculate_chart"""
+    moon = chart_data['moon_nakshatra']
+    return int(pada_index(VedicChartCalculator.NAKSHATRAS.index(moon['name']), moon['pada']))
+
+
+def _check_role(role):
+    if role not in ('groom', 'bride'):
+        raise ValueError(f"Unknown role: {role} (use 'groom' or 'bride')")
+
+
+def _orient(profile, candidate, role):
+    """(groom, bride) pada indices of a profile/candidate pair"""
+    return (profile, candidate) if role == 'groom' else (candidate, profile)
+
+
+def score_pair(groom: int, bride: int) -> Dict:
+    """Per-koota breakdown and total for one couple (pada indices)"""
+    scores = KOOTA_TABLES[:, groom, bride]
+    return {
+        'total': float(scores.sum()),
+        'max': MAX_SCORE,
+        'kootas': {
+            name: {'score': float(score), 'max': float(maximum)}
+            for name, score, maximum in zip(KOOTAS, scores, KOOTA_MAX)
+        }
+    }
+
+
+def score_matrix(profiles, candidates, role: str = 'groom') -> np.ndarray:
+    """
+    Total scores of every profile against every candidate
+
+    Args:
+        profiles: (P,) pada indices
+        candidates: (C,) pada indices
+        role: Whether the profiles are the 'groom' or the 'bride' side
+
+    Returns:
+        (P, C) float32 totals out of 36
+    """
+    profiles = np.asarray(profiles, dtype=int)
+    candidates = np.asarray(candidates, dtype=int)
+    _check_role(role)
+    if role == 'groom':
+        return TOTAL_TABLE[profiles[:, None], candidates[None, :]]
+    return TOTAL_TABLE[candidates[None, :], profiles[:, None]]
+
+
+def top_matches(
+    profiles,
+    candidates,
+    role: str = 'groom',
+    k: int = 10,
+    min_score: float = 0.0
+) -> List[List[Dict]]:
+    """
+    Best-scoring candidates for each profile, with a per-koota breakdown
+
+    Args:
+        profiles: (P,) pada indices
+        candidates: (C,) pada indices
+        role: Whether the profiles are the 'groom' or the 'bride' side
+        k: Matches returned per profile
+        min_score: Drop matches below this total
+
+    Returns:
+        For each profile, up to k dicts of {'candidate', 'total', 'kootas'},
+        best first; 'candidate' indexes into candidates
+    """
+    profiles = np.asarray(profiles, dtype=int)
+    candidates = np.asarray(candidates, dtype=int)
+    totals = score_matrix(profiles, candidates, role)
+
+    k = min(k, len(candidates))
+    best = np.argpartition(-totals, k - 1, axis=1)[:, :k]
+    results = []
+    for row, columns in enumerate(best):
+        # Highest total first, ties in candidate order
+        columns = columns[np.lexsort((columns, -totals[row, columns]))]
+        matches = []
+        for column in columns:
+            if totals[row, column] < min_score:
+                continue
+            groom, bride = _orient(profiles[row], candidates[column], role)
+            matches.append({'candidate': int(column), **score_pair(groom, bride)})
+        results.append(matches)
+    return results
+
+
+__all__ = [
+    'KOOTAS', 'KOOTA_MAX', 'MAX_SCORE', 'KOOTA_TABLES', 'TOTAL_TABLE',
+    'pada_index', 'chart_pada_index', 'score_pair', 'score_matrix', 'top_matches'
+]
@@ -0,0 +1,234 @@
+"""
+Vimshottari Dasha engine
+Builds Mahadasha / Antardasha / Pratyantardasha timelines from the Moon's
+exact sidereal longitude as flat arrays of period boundaries, and answers
+"which period is active on date X" by bisection
+"""
+
+import numpy as np
+import swisseph as swe
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+
+# Vimshottari sequence, starting from the lord of Ashwini
+DASHA_LORDS = ['Ketu', 'Venus', 'Sun', 'Moon', 'Mars', 'Rahu', 'Jupiter', 'Saturn', 'Mercury']
+DASHA_YEARS = np.array([7, 20, 6, 10, 7, 18, 16, 19, 17], dtype=float)
+CYCLE_YEARS = DASHA_YEARS.sum()  # 120
+
+DAYS_PER_YEAR = 365.25
+NAKSHATRA_SPAN = 360.0 / 27
+LEVELS = ('mahadasha', 'antardasha', 'pratyantardasha')
+
+# Two full cycles from the first Mahadasha start cover any date in a lifetime
+CYCLES = 2
+
+
+def _build_offset_tables():
+    """
+    Period boundaries (days from the first Mahadasha start) for each starting lord
+
+    Returns:
+        offsets: (9, CYCLES * 729 + 1) leaf boundaries
+        lords: (9, CYCLES * 729, 3) lord indices for MD/AD/PD of each leaf
+    """
+    n_leaves = CYCLES * 9 ** 3
+    offsets = np.zeros((9, n_leaves + 1))
+    lords = np.zeros((9, n_leaves, 3), dtype=np.int8)
+
+    for start in range(9):
+        md_seq = (start + np.arange(CYCLES * 9)) % 9
+        # Each sub-period starts from its parent's lord and runs through the sequence
+        ad_seq = (md_seq[:, None] + np.arange(9)) % 9            # (MD, 9)
+        pd_seq = (ad_seq[:, :, None] + np.arange(9)) % 9         # (MD, 9, 9)
+
+        md_years = DASHA_YEARS[md_seq][:, None, None]
+        ad_years = DASHA_YEARS[ad_seq][:, :, None]
+        pd_years = DASHA_YEARS[pd_seq]
+        leaf_days = md_years * ad_years * pd_years / CYCLE_YEARS ** 2 * DAYS_PER_YEAR
+
+        offsets[start, 1:] = np.cumsum(leaf_days.ravel())
+        lords[start, :, 0] = np.repeat(md_seq, 81)
+        lords[start, :, 1] = np.repeat(ad_seq.ravel(), 9)
+        lords[start, :, 2] = pd_seq.ravel()
+
+    return offsets, lords
+
+
+_LEAF_OFFSETS, _LEAF_LORDS = _build_offset_tables()
+
+# Leaf index stride of one Antardasha / Mahadasha
+_STRIDE = {'mahadasha': 81, 'antardasha': 9, 'pratyantardasha': 1}
+
+
+def dasha_start(birth_jd, moon_longitude):
+    """
+    Starting lord and first Mahadasha start for one or many births
+
+    Args:
+        birth_jd: Julian day(s) of birth (UT)
+        moon_longitude: Exact sidereal Moon longitude(s) in degrees
+
+    Returns:
+        (start_lord_index, cycle_start_jd, balance_years), scalars or arrays
+    """
+    moon_longitude = np.asarray(moon_longitude, dtype=float) % 360
+    nakshatra = np.minimum(moon_longitude // NAKSHATRA_SPAN, 26).astype(int)
+    elapsed = (moon_longitude - nakshatra * NAKSHATRA_SPAN) / NAKSHATRA_SPAN
+    start_lord = nakshatra % 9
+    years = DASHA_YEARS[start_lord]
+    cycle_start = np.asarray(birth_jd, dtype=float) - elapsed * years * DAYS_PER_YEAR
+    return start_lord, cycle_start, (1 - elapsed) * years
+
+
+def jd_to_date(jd: float) -> str:
+    """Julian day (UT) to an ISO calendar date"""
+    year, month, day, _ = swe.revjul(float(jd))
+    return f"{year:04d}-{month:02d}-{day:02d}"
+
+
+def date_to_jd(date: Optional[str] = None) -> float:
+    """
+    ISO date (YYYY-MM-DD, midnight UT) to a Julian day; now if omitted
+    """
+    if date is None:
+        now = datetime.now(timezone.utc)
+        return swe.julday(now.year, now.month, now.day, now.hour + now.minute / 60.0)
+    parsed = datetime.strptime(date, "%Y-%m-%d")
+    return swe.julday(parsed.year, parsed.month, parsed.day, 0.0)
+
+
+class DashaTimeline:
+    """Vimshottari timeline of one chart"""
+
+    def __init__(self, birth_jd: float, moon_longitude: float):
+        """
+        Args:
+            birth_jd: Julian day of birth (UT)
+            moon_longitude: Exact sidereal Moon longitude in degrees
+        """
+        start_lord, cycle_start, balance = dasha_start(birth_jd, moon_longitude)
+        self.birth_jd = float(birth_jd)
+        self.moon_longitude = float(moon_longitude)
+        self.start_lord = int(start_lord)
+        self.balance_years = float(balance)
+        self.start_jd = float(cycle_start)
+        self.boundaries = self.start_jd + _LEAF_OFFSETS[self.start_lord]
+        self.lords = _LEAF_LORDS[self.start_lord]
+
+    def period_at(self, jd: float) -> Optional[Dict]:
+        """
+        Active Mahadasha, Antardasha and Pratyantardasha at an instant
+
+        Args:
+            jd: Julian day (UT)
+
+        Returns:
+            Dict of level -> {'lord', 'start', 'end'}, or None outside the timeline
+        """
+        leaf = int(np.searchsorted(self.boundaries, jd, side='right')) - 1
+        if leaf < 0 or leaf >= len(self.lords):
+            return None
+        return {level: self._period(level, leaf) for level in LEVELS}
+
+    def periods(self, level: str = 'mahadasha', start_jd: Optional[float] = None,
+                end_jd: Optional[float] = None) -> List[Dict]:
+        """
+        All periods of one level overlapping [start_jd, end_jd]
+
+        Args:
+            level: 'mahadasha', 'antardasha' or 'pratyantardasha'
+            start_jd: Range start (defaults to birth)
+            end_jd: Range end (defaults to 120 years after birth)
+        """
+        stride = _STRIDE[level]
+        start_jd = self.birth_jd if start_jd is None else start_jd
+        end_jd = self.birth_jd + CYCLE_YEARS * DAYS_PER_YEAR if end_jd is None else end_jd
+
+        first = int(np.searchsorted(self.boundaries, start_jd, side='right')) - 1
+        last = int(np.searchsorted(self.boundaries, end_jd, side='left')) - 1
+        first = max(0, first - first % stride)
+        last = min(len(self.lords) - 1, last)
+        return [self._period(level, leaf) for leaf in range(first, last + 1, stride)]
+
+    def _period(self, level, leaf):
+        stride = _STRIDE[level]
+        first_leaf = leaf - leaf % stride
+        return {
+            'lord': DASHA_LORDS[self.lords[leaf, LEVELS.index(level)]],
+            'start': jd_to_date(self.boundaries[first_leaf]),
+            'end': jd_to_date(self.boundaries[first_leaf + stride])
+        }
+
+    def to_dict(self) -> Dict:
+        """Summary stored with the chart: balance at birth and the Mahadasha sequence"""
+        return {
+            'system': 'Vimshottari',
+            'birth_jd': round(self.birth_jd, 6),
+            'moon_longitude': round(self.moon_longitude, 6),
+            'balance': {
+                'lord': DASHA_LORDS[self.start_lord],
+                'years': round(self.balance_years, 2)
+            },
+            'mahadashas': self.periods('mahadasha')
+        }
+
+    @classmethod
+    def from_chart(cls, chart_data: Dict) -> 'DashaTimeline':
+        """Rebuild the timeline from a chart's 'dasha' section"""
+        dasha = chart_data['dasha']
+        return cls(dasha['birth_jd'], dasha['moon_longitude'])
+
+
+def current_dasha(chart_data: Dict, jd: Optional[float] = None) -> Optional[Dict]:
+    """
+    Active periods for a chart dict (None if the chart has no dasha section)
+
+    Args:
+        chart_data: Output of VedicChartCalculator.calculate_chart
+        jd: Julian day to evaluate (defaults to now)
+    """
+    if 'dasha' not in chart_data:
+        return None
+    return DashaTimeline.from_chart(chart_data).period_at(date_to_jd() if jd is None else jd)
+
+
+def dasha_periods_batch(birth_jds, moon_longitudes, query_jds) -> np.ndarray:
+    """
+    Active period lords for many charts at many dates
+
+    Args:
+        birth_jds: (N,) birth Julian days
+        moon_longitudes: (N,) exact sidereal Moon longitudes
+        query_jds: (M,) dates shared by all charts, or (N, M) per chart
+
+    Returns:
+        (N, M, 3) int8 lord indices into DASHA_LORDS for MD/AD/PD; -1 outside the timeline
+    """
+    start_lord, cycle_start, _ = dasha_start(birth_jds, moon_longitudes)
+    query_jds = np.asarray(query_jds, dtype=float)
+    n = len(cycle_start)
+    if query_jds.ndim == 1:
+        query_jds = np.broadcast_to(query_jds, (n, len(query_jds)))
+
+    offsets = query_jds - cycle_start[:, None]
+    result = np.full(offsets.shape + (3,), -1, dtype=np.int8)
+
+    # Charts with the same starting lord share one boundary table
+    for lord in range(9):
+        rows = np.nonzero(start_lord == lord)[0]
+        if len(rows) == 0:
+            continue
+        leaves = np.searchsorted(_LEAF_OFFSETS[lord], offsets[rows], side='right') - 1
+        valid = (leaves >= 0) & (leaves < _LEAF_LORDS.shape[1])
+        lords = _LEAF_LORDS[lord][np.clip(leaves, 0, _LEAF_LORDS.shape[1] - 1)]
+        lords[~valid] = -1
+        result[rows] = lords
+
+    return result
+
+
+__all__ = [
+    'DASHA_LORDS', 'DASHA_YEARS', 'DashaTimeline', 'current_dasha',
+    'dasha_start', 'dasha_periods_batch', 'date_to_jd', 'jd_to_date'
+]
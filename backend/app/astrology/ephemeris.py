@@ -0,0 +1,245 @@
+"""
+Ephemeris backends for the chart calculator
+Each backend returns tropical longitudes and daily speeds for the grahas.
+
+Calculation modes, from most to least accurate:
+    swisseph  Swiss Ephemeris .se1 files (compressed JPL DE431) from
+              EPHEMERIS_PATH; ~0.001" but needs the files on disk
+    moshier   Moshier's analytic theory built into Swiss Ephemeris; no
+              files, ~1" for planets and up to ~3" for the Moon
+    tables    Precomputed grid with cubic interpolation over one of the
+              above (see app.astrology.ephemeris_tables); the fastest
+"""
+
+import glob
+import os
+import swisseph as swe
+import numpy as np
+from typing import Dict, Optional, Tuple
+
+
+# Bodies queried from the ephemeris. Ketu is always derived from Rahu
+# (180 degrees opposite), so the mean node is only computed once.
+BODIES = ['Sun', 'Moon', 'Mars', 'Mercury', 'Jupiter', 'Venus', 'Saturn', 'Rahu']
+BODY_IDS = [
+    swe.SUN, swe.MOON, swe.MARS, swe.MERCURY,
+    swe.JUPITER, swe.VENUS, swe.SATURN, swe.MEAN_NODE
+]
+
+EPHEMERIS_MODES = ('moshier', 'swisseph', 'tables')
+DEFAULT_EPHEMERIS_MODE = 'moshier'
+
+# Declared worst-case longitude error against JPL DE431, in arc seconds
+# (worst body, 1800-2400). The tables mode adds its measured interpolation
+# error to that of the mode it was built from.
+MODE_ACCURACY_ARCSEC = {
+    'swisseph': 0.001,
+    'moshier': 3.0,
+}
+
+
+class _SwissEphemerisBackend:
+    """swe.calc_ut with explicit ephemeris flags"""
+
+    name = None
+    flags = swe.FLG_SPEED
+    description = None
+
+    # Instants sampled by preload(): one per 25 years, 1900-2100
+    PRELOAD_JDS = np.arange(2415020.5, 2488070.5, 9131.25)
+
+    @property
+    def max_error_arcsec(self) -> float:
+        return MODE_ACCURACY_ARCSEC[self.name]
+
+    def describe(self) -> Dict:
+        """Mode name and declared accuracy"""
+        return {
+            'mode': self.name,
+            'max_error_arcsec': self.max_error_arcsec,
+            'description': self.description
+        }
+
+    def backend_for(self, jd: float):
+        """The backend that actually produces positions at jd (this one)"""
+        return self
+
+    def preload(self):
+        """
+        Fill Swiss Ephemeris' internal caches before traffic
+
+        The first calc_ut near an epoch reads that file segment (or builds
+        that stretch of the analytic series) and sets up nutation and
+        precession state; sampling the supported range up front keeps that
+        cost off the first requests.
+        """
+        self.positions_batch(self.PRELOAD_JDS)
+
+    def _calc(self, jd: float, body_id: int):
+        return swe.calc_ut(jd, body_id, self.flags)[0]
+
+    def positions(self, jd: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Tropical positions of all BODIES at one instant
+
+        Args:
+            jd: Julian day (UT)
+
+        Returns:
+            (longitudes, speeds) arrays in BODIES order, degrees and degrees/day
+        """
+        longitudes = np.empty(len(BODY_IDS))
+        speeds = np.empty(len(BODY_IDS))
+        for j, body_id in enumerate(BODY_IDS):
+            result = self._calc(jd, body_id)
+            longitudes[j] = result[0]
+            speeds[j] = result[3]
+        return longitudes, speeds
+
+    def positions_batch(self, jds) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Tropical positions of all BODIES at many instants
+
+        Args:
+            jds: Sequence of Julian days (UT)
+
+        Returns:
+            (longitudes, speeds) arrays of shape (len(jds), len(BODIES))
+        """
+        jds = np.asarray(jds, dtype=float)
+        longitudes = np.empty((len(jds), len(BODY_IDS)))
+        speeds = np.empty((len(jds), len(BODY_IDS)))
+        for i, jd in enumerate(jds):
+            longitudes[i], speeds[i] = self.positions(jd)
+        return longitudes, speeds
+
+    def body_positions(self, jds, body: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Tropical positions of one body at many instants
+
+        Args:
+            jds: Sequence of Julian days (UT)
+            body: Index into BODIES
+
+        Returns:
+            (longitudes, speeds) arrays of shape (len(jds),)
+        """
+        jds = np.asarray(jds, dtype=float)
+        longitudes = np.empty(len(jds))
+        speeds = np.empty(len(jds))
+        for i, jd in enumerate(jds):
+            result = self._calc(jd, BODY_IDS[body])
+            longitudes[i] = result[0]
+            speeds[i] = result[3]
+        return longitudes, speeds
+
+
+class MoshierEphemeris(_SwissEphemerisBackend):
+    """Moshier's analytic ephemeris (built in; needs no data files)"""
+
+    name = 'moshier'
+    flags = swe.FLG_MOSEPH | swe.FLG_SPEED
+    description = "Moshier analytic theory (built in, no data files)"
+
+
+class SwissEphemeris(_SwissEphemerisBackend):
+    """Swiss Ephemeris .se1 files from a local directory"""
+
+    name = 'swisseph'
+    flags = swe.FLG_SWIEPH | swe.FLG_SPEED
+    description = "Swiss Ephemeris files (compressed JPL DE431)"
+
+    def __init__(self, ephe_path: Optional[str] = None):
+        """
+        Args:
+            ephe_path: Directory holding sepl_*.se1 / semo_*.se1 files;
+                falls back to EPHEMERIS_PATH
+
+        Raises:
+            ValueError: No directory configured
+            FileNotFoundError: The directory has no usable ephemeris files
+        """
+        path = ephe_path or os.getenv("EPHEMERIS_PATH")
+        if not path:
+            raise ValueError(
+                "The 'swisseph' ephemeris mode needs EPHEMERIS_PATH: "
+                "a directory of Swiss Ephemeris .se1 files"
+            )
+        self.path = os.path.abspath(path)
+        self.files = sorted(glob.glob(os.path.join(self.path, '*.se1')))
+        if not self.files:
+            raise FileNotFoundError(f"No Swiss Ephemeris .se1 files in {self.path}")
+
+        # Process-global, but only file-based calls read it (Moshier ignores it)
+        swe.set_ephe_path(self.path)
+        # Without the file for an epoch Swiss Ephemeris silently answers from
+        # Moshier instead; refuse that up front for the present epoch
+        if swe.calc_ut(2451545.0, swe.MOON, self.flags)[1] & swe.FLG_MOSEPH:
+            raise FileNotFoundError(
+                f"Swiss Ephemeris files in {self.path} do not cover J2000 "
+                f"(need at least sepl_18.se1 and semo_18.se1)"
+            )
+
+    def preload(self):
+        """Ask the OS to read the ephemeris files into its page cache, then sample them"""
+        for path in self.files:
+            with open(path, 'rb') as f:
+                if hasattr(os, 'posix_fadvise'):
+                    os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_WILLNEED)
+                else:
+                    while f.read(1 << 20):
+                        pass
+        super().preload()
+
+    def _calc(self, jd: float, body_id: int):
+        result, retflag = swe.calc_ut(jd, body_id, self.flags)
+        if retflag & swe.FLG_MOSEPH:
+            raise ValueError(
+                f"Julian day {jd:.1f} is outside the Swiss Ephemeris files in {self.path}"
+            )
+        return result
+
+
+def get_ephemeris(
+    backend: Optional[str] = None,
+    tables_path: Optional[str] = None,
+    ephe_path: Optional[str] = None
+):
+    """
+    Build the ephemeris backend selected by argument or environment
+
+    Args:
+        backend: One of EPHEMERIS_MODES; falls back to EPHEMERIS_BACKEND,
+            then DEFAULT_EPHEMERIS_MODE
+        tables_path: Precomputed table file for the 'tables' backend;
+            falls back to EPHEMERIS_TABLES_PATH
+        ephe_path: .se1 file directory for the 'swisseph' backend (and
+            tables built from it); falls back to EPHEMERIS_PATH
+
+    Returns:
+        Backend object exposing positions(), positions_batch(),
+        body_positions(), backend_for(), describe() and preload()
+    """
+    backend = (backend or os.getenv("EPHEMERIS_BACKEND") or DEFAULT_EPHEMERIS_MODE).lower()
+
+    if backend == 'moshier':
+        return MoshierEphemeris()
+
+    if backend == 'swisseph':
+        return SwissEphemeris(ephe_path)
+
+    if backend == 'tables':
+        from app.astrology.ephemeris_tables import EphemerisTables, DEFAULT_TABLES_PATH
+        path = tables_path or os.getenv("EPHEMERIS_TABLES_PATH", DEFAULT_TABLES_PATH)
+        tables = EphemerisTables(path)
+        # Instants outside the table come from the mode it was built from
+        tables.fallback = get_ephemeris(tables.source, ephe_path=ephe_path)
+        return tables
+
+    raise ValueError(f"Unknown ephemeris mode: {backend} (expected one of {', '.join(EPHEMERIS_MODES)})")
+
+
+__all__ = [
+    'BODIES', 'BODY_IDS', 'EPHEMERIS_MODES', 'DEFAULT_EPHEMERIS_MODE', 'MODE_ACCURACY_ARCSEC',
+    'MoshierEphemeris', 'SwissEphemeris', 'get_ephemeris'
+]
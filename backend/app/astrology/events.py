@@ -0,0 +1,263 @@
+"""
+Astronomical event finder
+Brackets sign ingresses, nakshatra changes, retrograde/direct stations and
+Moon phases on a coarse time grid, then refines every bracket at once with
+a vectorized Illinois (modified regula falsi) iteration instead of
+stepping the ephemeris minute by minute
+"""
+
+import numpy as np
+from datetime import datetime, timedelta, timezone as dt_timezone
+from typing import Dict, List, Optional, Sequence
+
+from app.utils.timezones import get_tz
+
+
+EVENT_TYPES = ('sign_ingress', 'nakshatra_change', 'station', 'moon_phase')
+MOON_PHASES = ['New Moon', 'First Quarter', 'Full Moon', 'Last Quarter']
+
+# Coarse grid step in days. The Moon moves under 8 degrees in half a day,
+# less than a nakshatra (13.33) or a phase quarter, so no grid interval
+# contains two crossings of the same kind.
+GRID_STEP = 0.5
+
+# Event times are refined to one second
+TOLERANCE = 1 / 86400
+MAX_ITERATIONS = 60
+
+# Longest range accepted in one call (about ten years)
+MAX_RANGE_DAYS = 3660
+
+# What a bracket's root function measures
+_LONGITUDE, _SPEED, _ELONGATION = 0, 1, 2
+
+# Column placeholder for Moon-Sun elongation brackets
+_ELONGATION_COLUMN = -1
+
+UNIX_EPOCH_JD = 2440587.5
+
+
+def _wrap(angle):
+    """Signed angle in [-180, 180)"""
+    return (angle + 180) % 360 - 180
+
+
+def jd_to_iso(jd: float) -> str:
+    """Julian day (UT) to an ISO 8601 UTC timestamp, to the second"""
+    moment = datetime(1970, 1, 1) + timedelta(days=float(jd) - UNIX_EPOCH_JD)
+    return (moment + timedelta(microseconds=500000)).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def jd_to_local_iso(jd: float, timezone: str) -> str:
+    """Julian day (UT) to an ISO 8601 local timestamp with offset, to the second"""
+    moment = datetime(1970, 1, 1, tzinfo=dt_timezone.utc) + timedelta(days=float(jd) - UNIX_EPOCH_JD)
+    moment += timedelta(microseconds=500000)
+    return moment.astimezone(get_tz(timezone)).isoformat(timespec='seconds')
+
+
+def _crossings(series, width):
+    """
+    Grid intervals where series (degrees) moves into another width-sized segment
+
+    Returns:
+        (interval indices, boundary crossed, new segment index)
+    """
+    count = int(round(360 / width))
+    segment = np.floor(series / width).astype(int) % count
+    k = np.nonzero(segment[1:] != segment[:-1])[0]
+    forward = _wrap(series[k + 1] - series[k]) > 0
+    boundary = np.where(forward, (segment[k] + 1) % count, segment[k]) * width
+    return k, boundary, segment[k + 1]
+
+
+def _refine(evaluate, lo, hi, f_lo, f_hi):
+    """
+    Vectorized Illinois root refinement of many brackets at once
+
+    Args:
+        evaluate: f(t, rows) -> values of the root functions of bracket rows at t
+        lo, hi: Bracket ends (Julian days)
+        f_lo, f_hi: Root function values at the ends (opposite signs)
+
+    Returns:
+        Root estimates, one per bracket
+    """
+    lo, hi = lo.astype(float), hi.astype(float)
+    f_lo, f_hi = f_lo.astype(float), f_hi.astype(float)
+    side = np.zeros(len(lo), dtype=np.int8)
+    active = np.arange(len(lo))
+
+    for _ in range(MAX_ITERATIONS):
+        if len(active) == 0:
+            break
+        a = active
+        t = (lo[a] * f_hi[a] - hi[a] * f_lo[a]) / (f_hi[a] - f_lo[a])
+        f = evaluate(t, a)
+
+        exact = f == 0
+        lo[a[exact]] = hi[a[exact]] = t[exact]
+
+        # Root in [t, hi]: move lo; if lo also moved last time, halve f_hi
+        move_lo = (np.sign(f) == np.sign(f_lo[a])) & ~exact
+        rows = a[move_lo]
+        f_hi[rows[side[rows] == 1]] *= 0.5
+        lo[rows], f_lo[rows], side[rows] = t[move_lo], f[move_lo], 1
+
+        # Root in [lo, t]: move hi; if hi also moved last time, halve f_lo
+        move_hi = ~move_lo & ~exact
+        rows = a[move_hi]
+        f_lo[rows[side[rows] == -1]] *= 0.5
+        hi[rows], f_hi[rows], side[rows] = t[move_hi], f[move_hi], -1
+
+        active = a[~exact & (hi[a] - lo[a] > TOLERANCE)]
+
+    return (lo + hi) / 2
+
+
+def _refined_crossings(grid, series, width, value):
+    """
+    Times in the grid range where series (degrees) enters another width-sized segment
+
+    Args:
+        grid: Sample times (Julian days)
+        series: Quantity at the sample times
+        width: Segment width in degrees
+        value: f(t) -> the quantity at times t
+
+    Returns:
+        Crossing times, refined to a second
+    """
+    k, boundary, _ = _crossings(series, width)
+    if len(k) == 0:
+        return np.empty(0)
+    return _refine(
+        lambda t, rows: _wrap(value(t) - boundary[rows]),
+        grid[k], grid[k + 1],
+        _wrap(series[k] - boundary), _wrap(series[k + 1] - boundary)
+    )
+
+
+def find_events(
+    calculator,
+    start_jd: float,
+    end_jd: float,
+    planets: Optional[Sequence[str]] = None,
+    types: Optional[Sequence[str]] = None,
+    ayanamsa: Optional[str] = None
+) -> List[Dict]:
+    """
+    All events of the requested types between two instants
+
+    Args:
+        calculator: VedicChartCalculator (ephemeris, ayanamsa, SIGNS, NAKSHATRAS)
+        start_jd: Range start (Julian day, UT)
+        end_jd: Range end (Julian day, UT)
+        planets: Grahas to search (default: all nine); Moon phases are
+            reported whenever 'moon_phase' is requested
+        types: Subset of EVENT_TYPES (default: all)
+        ayanamsa: Ayanamsa name (default: the calculator's); it moves sign
+            ingresses and nakshatra changes, not stations or Moon phases
+
+    Returns:
+        Events sorted by time: {'type', 'planet', 'jd', 'time', ...}
+    """
+    names = list(calculator.PLANETS)
+    planets = list(planets or names)
+    types = list(types or EVENT_TYPES)
+    unknown = [p for p in planets if p not in names] + [t for t in types if t not in EVENT_TYPES]
+    if unknown:
+        raise ValueError(f"Unknown planets or event types: {', '.join(unknown)}")
+    if end_jd <= start_jd:
+        raise ValueError("end must be after start")
+    if end_jd - start_jd > MAX_RANGE_DAYS:
+        raise ValueError(f"Range is limited to {MAX_RANGE_DAYS} days")
+    ayanamsa = calculator.ayanamsa_for(ayanamsa)
+
+    grid = np.append(np.arange(start_jd, end_jd, GRID_STEP), end_jd)
+    longitude, speed = calculator.sidereal_positions_batch(grid, ayanamsa)
+    sun, moon = names.index('Sun'), names.index('Moon')
+
+    # Brackets from every event kind, refined together below
+    k_all, column, target, quantity, events = [], [], [], [], []
+
+    def add(k, col, tgt, qty, details):
+        k_all.append(k)
+        column.append(np.full(len(k), col))
+        target.append(np.broadcast_to(np.asarray(tgt, dtype=float), len(k)))
+        quantity.append(np.full(len(k), qty))
+        events.extend(details)
+
+    for planet in planets:
+        j = names.index(planet)
+        if 'sign_ingress' in types:
+            k, boundary, segment = _crossings(longitude[:, j], 30)
+            add(k, j, boundary, _LONGITUDE, [
+                {'type': 'sign_ingress', 'planet': planet, 'sign': calculator.SIGNS[s]}
+                for s in segment
+            ])
+        if 'nakshatra_change' in types:
+            k, boundary, segment = _crossings(longitude[:, j], 360 / 27)
+            add(k, j, boundary, _LONGITUDE, [
+                {'type': 'nakshatra_change', 'planet': planet, 'nakshatra': calculator.NAKSHATRAS[s]}
+                for s in segment
+            ])
+        if 'station' in types:
+            k = np.nonzero(np.signbit(speed[1:, j]) != np.signbit(speed[:-1, j]))[0]
+            add(k, j, 0.0, _SPEED, [
+                {'type': 'station', 'planet': planet,
+                 'motion': 'retrograde' if speed[i, j] > 0 else 'direct'}
+                for i in k
+            ])
+
+    if 'moon_phase' in types:
+        elongation = (longitude[:, moon] - longitude[:, sun]) % 360
+        k, boundary, segment = _crossings(elongation, 90)
+        add(k, _ELONGATION_COLUMN, boundary, _ELONGATION, [
+            {'type': 'moon_phase', 'planet': 'Moon', 'phase': MOON_PHASES[s]} for s in segment
+        ])
+
+    if not events:
+        return []
+
+    k = np.concatenate(k_all)
+    column = np.concatenate(column)
+    target = np.concatenate(target)
+    quantity = np.concatenate(quantity)
+
+    def root_function(lon, spd, rows):
+        """Root function values from full (n, 9) position arrays"""
+        index = np.arange(len(rows))
+        col = column[rows]
+        angle = np.where(col == _ELONGATION_COLUMN, lon[:, moon] - lon[:, sun], lon[index, col])
+        return np.where(quantity[rows] == _SPEED, spd[index, col], _wrap(angle - target[rows]))
+
+    def evaluate(t, rows):
+        """Root function values at t, querying only the body each bracket needs"""
+        values = np.empty(len(rows))
+        col = column[rows]
+        for c in np.unique(col):
+            sel = col == c
+            if c == _ELONGATION_COLUMN:
+                moon_lon, _ = calculator.sidereal_body_positions(t[sel], 'Moon', ayanamsa)
+                sun_lon, _ = calculator.sidereal_body_positions(t[sel], 'Sun', ayanamsa)
+                values[sel] = _wrap(moon_lon - sun_lon - target[rows[sel]])
+                continue
+            lon, spd = calculator.sidereal_body_positions(t[sel], names[c], ayanamsa)
+            values[sel] = np.where(
+                quantity[rows[sel]] == _SPEED, spd, _wrap(lon - target[rows[sel]])
+            )
+        return values
+
+    every = np.arange(len(k))
+    f_lo = root_function(longitude[k], speed[k], every)
+    f_hi = root_function(longitude[k + 1], speed[k + 1], every)
+    roots = _refine(evaluate, grid[k], grid[k + 1], f_lo, f_hi)
+
+    for event, jd in zip(events, roots):
+        event['jd'] = round(float(jd), 6)
+        event['time'] = jd_to_iso(jd)
+    events.sort(key=lambda event: event['jd'])
+    return events
+
+
+__all__ = ['EVENT_TYPES', 'MOON_PHASES', 'MAX_RANGE_DAYS', 'find_events', 'jd_to_iso']
@@ -0,0 +1,262 @@
+"""
+Muhurta (electional time) search
+Finds the windows at one place where declarative constraints hold: lagna
+sign, Moon nakshatra, tithi, benefics in kendras, and periods to avoid.
+
+The search runs coarse to fine. Slow quantities (the Moon's nakshatra, the
+tithi and the benefics' signs) are bracketed on the event finder's
+half-day grid and their changes refined to the second. Intervals where they
+cannot satisfy the constraints, whatever the lagna, are dropped. Only the
+survivors are sampled for the lagna, which changes sign every couple of
+hours, and its changes are refined the same way.
+
+A long search is split into chunks that run in parallel (see split_range);
+merge_windows joins windows cut at chunk boundaries and rank_windows orders
+the result.
+"""
+
+import numpy as np
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from app.astrology.events import GRID_STEP, _crossings, _refine, _refined_crossings, _wrap, jd_to_local_iso
+from app.astrology.panchang import TITHIS
+
+
+# Natural benefics counted by min_benefics_in_kendras
+BENEFICS = ('Mercury', 'Jupiter', 'Venus')
+
+# Lagna sampling step in days. The fastest-rising sign takes well over ten
+# minutes to rise outside the polar circles, so no step holds two changes.
+LAGNA_STEP = 5 / 1440
+
+# Longest range accepted in one call
+MAX_RANGE_DAYS = 366
+
+
+def _parse_local(value: str, timezone: str, calculator) -> float:
+    """'YYYY-MM-DDTHH:MM' local time to a Julian day (UT)"""
+    date, _, time = value.replace(' ', 'T').partition('T')
+    return calculator.julian_day(date, time[:5] or '00:00', timezone)
+
+
+def _parse_constraints(calculator, constraints: Dict, timezone: str) -> Dict:
+    """Validated constraints as index masks and Julian day ranges"""
+    def mask(values, names, label):
+        if not values:
+            return np.ones(len(names), dtype=bool)
+        unknown = [v for v in values if v not in names]
+        if unknown:
+            raise ValueError(f"Unknown {label}: {', '.join(map(str, unknown))}")
+        allowed = np.zeros(len(names), dtype=bool)
+        allowed[[names.index(v) for v in values]] = True
+        return allowed
+
+    tithis = [TITHIS[t - 1] if isinstance(t, int) and 1 <= t <= 30 else t
+              for t in constraints.get('tithis') or []]
+    avoid = []
+    for period in constraints.get('avoid') or []:
+        start = _parse_local(period['start'], timezone, calculator)
+        end = _parse_local(period['end'], timezone, calculator)
+        if end <= start:
+            raise ValueError(f"Avoided period ends before it starts: {period['start']} - {period['end']}")
+        avoid.append((start, end))
+
+    min_benefics = int(constraints.get('min_benefics_in_kendras') or 0)
+    if not 0 <= min_benefics <= len(BENEFICS):
+        raise ValueError(f"min_benefics_in_kendras must be between 0 and {len(BENEFICS)}")
+
+    return {
+        'lagna': mask(constraints.get('lagna_signs'), calculator.SIGNS, 'lagna signs'),
+        'nakshatra': mask(constraints.get('moon_nakshatras'), calculator.NAKSHATRAS, 'nakshatras'),
+        'tithi': mask(tithis, TITHIS, 'tithis'),
+        'min_benefics': min_benefics,
+        'avoid': avoid
+    }
+
+
+def _kendra_counts(benefic_signs):
+    """(n, 12) number of benefics in a kendra from each lagna sign"""
+    lagnas = np.arange(12)
+    return ((benefic_signs[:, :, None] - lagnas) % 3 == 0).sum(axis=1)
+
+
+def find_muhurtas(
+    calculator,
+    start_jd: float,
+    end_jd: float,
+    latitude: float,
+    longitude: float,
+    constraints: Optional[Dict] = None,
+    timezone: str = 'UTC',
+    ayanamsa: Optional[str] = None
+) -> List[Dict]:
+    """
+    Windows in [start_jd, end_jd] where every constraint holds
+
+    Args:
+        calculator: VedicChartCalculator (positions, ascendants, SIGNS, NAKSHATRAS)
+        start_jd: Range start (Julian day, UT)
+        end_jd: Range end (Julian day, UT)
+        latitude, longitude: Place of the event
+        constraints: Dict with any of 'lagna_signs' (sign names),
+            'moon_nakshatras' (nakshatra names), 'tithis' (names or 1-30),
+            'min_benefics_in_kendras' (0-3, counting Mercury, Jupiter and
+            Venus in houses 1, 4, 7 and 10 from the lagna) and 'avoid'
+            ([{'start', 'end'}] local 'YYYY-MM-DDTHH:MM' times)
+        timezone: Timezone of the avoided periods
+        ayanamsa: Ayanamsa name (default: the calculator's)
+
+    Returns:
+        Windows sorted by start: {'start_jd', 'end_jd', 'lagna', 'moon_nakshatra',
+        'tithi' (the values met inside the window), 'benefics_in_kendras' (the
+        least count inside it)}; not yet filtered by duration (see rank_windows)
+
+    Raises:
+        ValueError: On unknown names or a bad range
+    """
+    if end_jd <= start_jd:
+        raise ValueError("end must be after start")
+    if end_jd - start_jd > MAX_RANGE_DAYS:
+        raise ValueError(f"Range is limited to {MAX_RANGE_DAYS} days")
+    ayanamsa = calculator.ayanamsa_for(ayanamsa)
+    rules = _parse_constraints(calculator, constraints or {}, timezone)
+    names = list(calculator.PLANETS)
+    sun, moon = names.index('Sun'), names.index('Moon')
+    benefics = [names.index(b) for b in BENEFICS]
+
+    def body(name):
+        return lambda t: calculator.sidereal_body_positions(t, name, ayanamsa)[0]
+
+    def elongation(t):
+        return (body('Moon')(t) - body('Sun')(t)) % 360
+
+    # Coarse pass: every change of the slow quantities in the range
+    grid = np.append(np.arange(start_jd, end_jd, GRID_STEP), end_jd)
+    lon, _ = calculator.sidereal_positions_batch(grid, ayanamsa)
+    cuts = [
+        _refined_crossings(grid, lon[:, moon], 360 / 27, body('Moon')),
+        _refined_crossings(grid, (lon[:, moon] - lon[:, sun]) % 360, 12, elongation),
+    ] + [
+        _refined_crossings(grid, lon[:, j], 30, body(names[j])) for j in benefics
+    ]
+    avoid_edges = [edge for period in rules['avoid'] for edge in period]
+    cuts = np.unique(np.clip(np.concatenate(cuts + [[start_jd, end_jd], avoid_edges]), start_jd, end_jd))
+    lo, hi = cuts[:-1], cuts[1:]
+
+    # Slow state is constant between cuts: read it at the midpoints
+    mid = (lo + hi) / 2
+    lon, _ = calculator.sidereal_positions_batch(mid, ayanamsa)
+    nakshatra = np.minimum(lon[:, moon] // (360 / 27), 26).astype(int)
+    tithi = np.minimum(((lon[:, moon] - lon[:, sun]) % 360) // 12, 29).astype(int)
+    benefic_signs = np.minimum(lon[:, benefics] // 30, 11).astype(int)
+    kendra_counts = _kendra_counts(benefic_signs)
+
+    # Prune: slow constraints, avoided periods, and a benefic count no allowed lagna can reach
+    keep = rules['nakshatra'][nakshatra] & rules['tithi'][tithi]
+    keep &= np.where(rules['lagna'], kendra_counts, -1).max(axis=1) >= rules['min_benefics']
+    for avoid_start, avoid_end in rules['avoid']:
+        keep &= ~((mid > avoid_start) & (mid < avoid_end))
+    survivors = np.nonzero(keep)[0]
+    if len(survivors) == 0:
+        return []
+
+    # Fine pass: lagna sign changes inside the surviving intervals only
+    samples = [np.append(np.arange(lo[i], hi[i], LAGNA_STEP), hi[i]) for i in survivors]
+    owner = np.repeat(np.arange(len(survivors)), [len(s) for s in samples])
+    times = np.concatenate(samples)
+    ascendant = calculator.sidereal_ascendants(times, latitude, longitude, ayanamsa)
+    k, boundary, _ = _crossings(ascendant, 30)
+    inside = owner[k] == owner[k + 1]
+    k, boundary = k[inside], boundary[inside]
+    roots = _refine(
+        lambda t, rows: _wrap(
+            calculator.sidereal_ascendants(t, latitude, longitude, ayanamsa) - boundary[rows]
+        ),
+        times[k], times[k + 1],
+        _wrap(ascendant[k] - boundary), _wrap(ascendant[k + 1] - boundary)
+    ) if len(k) else np.empty(0)
+
+    fine_lo, fine_hi, fine_owner = [], [], []
+    for n, i in enumerate(survivors):
+        edges = np.concatenate([[lo[i]], np.sort(roots[owner[k] == n]), [hi[i]]])
+        fine_lo.append(edges[:-1])
+        fine_hi.append(edges[1:])
+        fine_owner.append(np.full(len(edges) - 1, i))
+    fine_lo, fine_hi = np.concatenate(fine_lo), np.concatenate(fine_hi)
+    fine_owner = np.concatenate(fine_owner)
+
+    lagna = np.minimum(
+        calculator.sidereal_ascendants((fine_lo + fine_hi) / 2, latitude, longitude, ayanamsa) // 30, 11
+    ).astype(int)
+    count = kendra_counts[fine_owner, lagna]
+    passing = rules['lagna'][lagna] & (count >= rules['min_benefics']) & (fine_hi > fine_lo)
+
+    windows = []
+    for j in np.nonzero(passing)[0]:
+        i = fine_owner[j]
+        state = {
+            'lagna': calculator.SIGNS[lagna[j]],
+            'moon_nakshatra': calculator.NAKSHATRAS[nakshatra[i]],
+            'tithi': TITHIS[tithi[i]]
+        }
+        windows.append({
+            'start_jd': float(fine_lo[j]),
+            'end_jd': float(fine_hi[j]),
+            'benefics_in_kendras': int(count[j]),
+            **{key: [value] for key, value in state.items()}
+        })
+    return merge_windows(windows)
+
+
+def merge_windows(windows: Sequence[Dict]) -> List[Dict]:
+    """Join windows that touch (e.g. split at chunk boundaries), sorted by start"""
+    merged = []
+    for window in sorted(windows, key=lambda w: w['start_jd']):
+        previous = merged[-1] if merged else None
+        if previous is None or window['start_jd'] > previous['end_jd'] + 1e-9:
+            merged.append(dict(window))
+            continue
+        previous['end_jd'] = max(previous['end_jd'], window['end_jd'])
+        previous['benefics_in_kendras'] = min(previous['benefics_in_kendras'], window['benefics_in_kendras'])
+        for key in ('lagna', 'moon_nakshatra', 'tithi'):
+            previous[key] = list(dict.fromkeys(previous[key] + window[key]))
+    return merged
+
+
+def rank_windows(windows: Sequence[Dict], top_k: int = 10, min_duration_minutes: float = 0) -> List[Dict]:
+    """
+    Best windows first: most benefics in kendras, then longest, then earliest
+
+    Args:
+        windows: Merged windows from find_muhurtas / merge_windows
+        top_k: Windows returned
+        min_duration_minutes: Shorter windows are dropped
+    """
+    long_enough = [
+        w for w in windows if (w['end_jd'] - w['start_jd']) * 1440 >= min_duration_minutes
+    ]
+    long_enough.sort(key=lambda w: (-w['benefics_in_kendras'], w['start_jd'] - w['end_jd'], w['start_jd']))
+    return long_enough[:top_k]
+
+
+def split_range(start_jd: float, end_jd: float, parts: int) -> List[Tuple[float, float]]:
+    """Split a range into at most parts consecutive chunks of at least a day"""
+    parts = max(1, min(parts, int(np.ceil(end_jd - start_jd))))
+    edges = np.linspace(start_jd, end_jd, parts + 1)
+    return [(float(a), float(b)) for a, b in zip(edges[:-1], edges[1:])]
+
+
+def describe_window(window: Dict, timezone: str) -> Dict:
+    """A window with local ISO 8601 start/end times and its duration in minutes"""
+    return {
+        'start': jd_to_local_iso(window['start_jd'], timezone),
+        'end': jd_to_local_iso(window['end_jd'], timezone),
+        'duration_minutes': round((window['end_jd'] - window['start_jd']) * 1440, 1),
+        **{key: window[key] for key in ('lagna', 'moon_nakshatra', 'tithi', 'benefics_in_kendras')}
+    }
+
+
+__all__ = [
+    'BENEFICS', 'MAX_RANGE_DAYS',
+    'find_muhurtas', 'merge_windows', 'rank_windows', 'split_range', 'describe_window'
+]
@@ -0,0 +1,238 @@
+"""
+Panchang (Hindu almanac) for a place and a run of days
+Per day, from sunrise to the next sunrise: vara, sunrise/sunset, the
+tithis, nakshatras, yogas and karanas in force with the times they end,
+and the Rahu Kaal, Yamaganda and Gulika periods.
+
+A whole range is computed in one batched pass: Sun and Moon positions on a
+quarter-day grid bracket every element change, and all brackets of an
+element are refined together with the event finder's vectorized root
+refinement, so end times are exact to the second.
+"""
+
+import numpy as np
+import swisseph as swe
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from app.astrology.events import _refined_crossings, jd_to_local_iso
+
+
+TITHIS = [
+    'Shukla Pratipada', 'Shukla Dwitiya', 'Shukla Tritiya', 'Shukla Chaturthi', 'Shukla Panchami',
+    'Shukla Shashthi', 'Shukla Saptami', 'Shukla Ashtami', 'Shukla Navami', 'Shukla Dashami',
+    'Shukla Ekadashi', 'Shukla Dwadashi', 'Shukla Trayodashi', 'Shukla Chaturdashi', 'Purnima',
+    'Krishna Pratipada', 'Krishna Dwitiya', 'Krishna Tritiya', 'Krishna Chaturthi', 'Krishna Panchami',
+    'Krishna Shashthi', 'Krishna Saptami', 'Krishna Ashtami', 'Krishna Navami', 'Krishna Dashami',
+    'Krishna Ekadashi', 'Krishna Dwadashi', 'Krishna Trayodashi', 'Krishna Chaturdashi', 'Amavasya'
+]
+
+YOGAS = [
+    'Vishkambha', 'Priti', 'Ayushman', 'Saubhagya', 'Shobhana', 'Atiganda', 'Sukarma',
+    'Dhriti', 'Shula', 'Ganda', 'Vriddhi', 'Dhruva', 'Vyaghata', 'Harshana', 'Vajra',
+    'Siddhi', 'Vyatipata', 'Variyana', 'Parigha', 'Shiva', 'Siddha', 'Sadhya', 'Shubha',
+    'Shukla', 'Brahma', 'Indra', 'Vaidhriti'
+]
+
+# Sixty half-tithis: one fixed karana, the seven movable ones eight times, three fixed
+KARANAS = (
+    ['Kimstughna']
+    + ['Bava', 'Balava', 'Kaulava', 'Taitila', 'Garaja', 'Vanija', 'Vishti'] * 8
+    + ['Shakuni', 'Chatushpada', 'Naga']
+)
+
+# Sunday first
+VARAS = ['Ravivara', 'Somavara', 'Mangalavara', 'Budhavara', 'Guruvara', 'Shukravara', 'Shanivara']
+
+# Which eighth of the daytime (1 = starting at sunrise) each period takes, by vara
+RAHU_KAAL_PART = (8, 2, 7, 5, 6, 4, 3)
+YAMAGANDA_PART = (5, 4, 3, 2, 1, 7, 6)
+GULIKA_PART = (7, 6, 5, 4, 3, 2, 1)
+
+# Coarse grid step in days. Moon-Sun elongation grows at most ~15.4 degrees
+# a day, under 4 in a quarter day: less than a karana (6 degrees), so no
+# grid interval holds two changes of one element.
+GRID_STEP = 0.25
+
+# Positions are sampled this long past the last sunrise, so the element in
+# force then gets its end time (no tithi or nakshatra lasts two days)
+LOOKAHEAD_DAYS = 2.0
+
+# Longest range accepted in one call
+MAX_DAYS = 366
+
+# Element -> (names, degrees per element)
+ELEMENTS = {
+    'tithi': (TITHIS, 12.0),
+    'nakshatra': (None, 360 / 27),  # the calculator's NAKSHATRAS
+    'yoga': (YOGAS, 360 / 27),
+    'karana': (KARANAS, 6.0),
+}
+
+# Columns of csv_row (after any extra leading columns)
+CSV_FIELDS = [
+    'date', 'vara', 'sunrise', 'sunset',
+    'tithi', 'tithi_end', 'nakshatra', 'nakshatra_end',
+    'yoga', 'yoga_end', 'karana', 'karana_end',
+    'rahu_kaal_start', 'rahu_kaal_end', 'yamaganda_start', 'yamaganda_end',
+    'gulika_start', 'gulika_end'
+]
+
+
+def _element_angle(element: str, sun, moon):
+    """Angle (degrees) whose width-sized segments are the element's values"""
+    if element in ('tithi', 'karana'):
+        return (moon - sun) % 360
+    if element == 'nakshatra':
+        return moon % 360
+    return (sun + moon) % 360  # yoga
+
+
+def _sun_events(jds, latitude: float, longitude: float, rsmi: int) -> np.ndarray:
+    """First sunrise or sunset after each instant (Moshier is ample for rise/set times)"""
+    times = np.empty(len(jds))
+    for i, jd in enumerate(jds):
+        result, tret = swe.rise_trans(jd, swe.SUN, rsmi, (longitude, latitude, 0.0), 0.0, 0.0, swe.FLG_MOSEPH)
+        if result != 0:
+            raise ValueError("The Sun does not rise or set every day at this latitude")
+        times[i] = tret[0]
+    return times
+
+
+def calculate_panchang(
+    calculator,
+    start_date: str,
+    days: int,
+    latitude: float,
+    longitude: float,
+    timezone: str,
+    ayanamsa: Optional[str] = None
+) -> List[Dict]:
+    """
+    Panchang for consecutive local days at one place
+
+    Args:
+        calculator: VedicChartCalculator (positions, ayanamsa, NAKSHATRAS)
+        start_date: First local day (YYYY-MM-DD)
+        days: Number of days
+        latitude, longitude: Place
+        timezone: Timezone string; times are reported in it
+        ayanamsa: Ayanamsa name for nakshatras and yogas (default: the calculator's)
+
+    Returns:
+        One dict per day: {'date', 'vara', 'sunrise', 'sunset', 'tithi',
+        'nakshatra', 'yoga', 'karana' (each a list of {'number', 'name',
+        'end'} in force from sunrise to the next sunrise), 'rahu_kaal',
+        'yamaganda', 'gulika' ({'start', 'end'})}
+
+    Raises:
+        ValueError: On a bad range, or where the Sun does not rise daily
+    """
+    if not 1 <= days <= MAX_DAYS:
+        raise ValueError(f"days must be between 1 and {MAX_DAYS}")
+    ayanamsa = calculator.ayanamsa_for(ayanamsa)
+    first = datetime.strptime(start_date, '%Y-%m-%d')
+    dates = [first + timedelta(days=i) for i in range(days + 1)]
+
+    midnights = np.array([calculator.julian_day(d.strftime('%Y-%m-%d'), '00:00', timezone) for d in dates])
+    sunrise = _sun_events(midnights, latitude, longitude, swe.CALC_RISE)
+    sunset = _sun_events(sunrise[:-1], latitude, longitude, swe.CALC_SET)
+
+    def angle_at(element, t):
+        moon, _ = calculator.sidereal_body_positions(t, 'Moon', ayanamsa)
+        if element == 'nakshatra':
+            return moon % 360
+        sun, _ = calculator.sidereal_body_positions(t, 'Sun', ayanamsa)
+        return _element_angle(element, sun, moon)
+
+    # Element changes over the whole range, refined to the second. Every
+    # tithi change is also a karana change, so tithis are derived below.
+    grid_end = sunrise[-1] + LOOKAHEAD_DAYS
+    grid = np.append(np.arange(sunrise[0], grid_end, GRID_STEP), grid_end)
+    sun, _ = calculator.sidereal_body_positions(grid, 'Sun', ayanamsa)
+    moon, _ = calculator.sidereal_body_positions(grid, 'Moon', ayanamsa)
+    refined = ('nakshatra', 'yoga', 'karana')
+    edges = {}
+    for element in refined:
+        crossings = _refined_crossings(
+            grid, _element_angle(element, sun, moon), ELEMENTS[element][1],
+            lambda t, element=element: angle_at(element, t)
+        )
+        edges[element] = np.concatenate([[grid[0]], np.sort(crossings), [grid_end]])
+
+    # Each span's value, read at its midpoint so it always agrees with its edges
+    midpoints = np.concatenate([(edges[element][:-1] + edges[element][1:]) / 2 for element in refined])
+    sun, _ = calculator.sidereal_body_positions(midpoints, 'Sun', ayanamsa)
+    moon, _ = calculator.sidereal_body_positions(midpoints, 'Moon', ayanamsa)
+    values, offset = {}, 0
+    for element in refined:
+        width = ELEMENTS[element][1]
+        count = len(edges[element]) - 1
+        angle = _element_angle(element, sun[offset:offset + count], moon[offset:offset + count])
+        values[element] = np.floor(angle / width).astype(int) % int(round(360 / width))
+        offset += count
+
+    # Karanas are half-tithis: a tithi starts wherever karana // 2 changes
+    tithi = values['karana'] // 2
+    starts = np.concatenate([[True], tithi[1:] != tithi[:-1]])
+    edges['tithi'] = np.append(edges['karana'][:-1][starts], grid_end)
+    values['tithi'] = tithi[starts]
+
+    def local(jd):
+        return jd_to_local_iso(jd, timezone)
+
+    def period(i, part):
+        length = (sunset[i] - sunrise[i]) / 8
+        start = sunrise[i] + (part - 1) * length
+        return {'start': local(start), 'end': local(start + length)}
+
+    result = []
+    for i in range(days):
+        vara = (dates[i].weekday() + 1) % 7
+        day = {
+            'date': dates[i].strftime('%Y-%m-%d'),
+            'vara': VARAS[vara],
+            'sunrise': local(sunrise[i]),
+            'sunset': local(sunset[i]),
+        }
+        for element, (names, _) in ELEMENTS.items():
+            names = names or calculator.NAKSHATRAS
+            e = edges[element]
+            spans = range(
+                np.searchsorted(e, sunrise[i], side='right') - 1,
+                np.searchsorted(e, sunrise[i + 1], side='left')
+            )
+            day[element] = [
+                {'number': int(values[element][m]) + 1, 'name': names[values[element][m]], 'end': local(e[m + 1])}
+                for m in spans
+            ]
+        day['rahu_kaal'] = period(i, RAHU_KAAL_PART[vara])
+        day['yamaganda'] = period(i, YAMAGANDA_PART[vara])
+        day['gulika'] = period(i, GULIKA_PART[vara])
+        result.append(day)
+    return result
+
+
+def csv_row(day: Dict, **extra) -> Dict:
+    """
+    One flat CSV row per day: the elements in force at sunrise and when they end
+
+    Args:
+        day: A day from calculate_panchang
+        **extra: Leading columns, e.g. city
+    """
+    row = dict(extra)
+    row.update({key: day[key] for key in ('date', 'vara', 'sunrise', 'sunset')})
+    for element in ELEMENTS:
+        row[element] = day[element][0]['name']
+        row[f'{element}_end'] = day[element][0]['end']
+    for name in ('rahu_kaal', 'yamaganda', 'gulika'):
+        row[f'{name}_start'] = day[name]['start']
+        row[f'{name}_end'] = day[name]['end']
+    return row
+
+
+__all__ = [
+    'TITHIS', 'YOGAS', 'KARANAS', 'VARAS', 'MAX_DAYS', 'CSV_FIELDS',
+    'calculate_panchang', 'csv_row'
+]
@@ -0,0 +1,90 @@
+"""
+Per (place, day) cache in front of the panchang calculation
+Days are cached one by one, but every run of missing days is computed in a
+single batched calculate_panchang call
+"""
+
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from app.utils.cache import LRUCache
+
+
+class PanchangCache:
+    """Memoize panchang days on (local date, rounded lat/lon, timezone, ayanamsa name)"""
+
+    def __init__(
+        self,
+        calculator,
+        max_entries: int = 20000,
+        ttl_seconds: Optional[float] = None,
+        coordinate_precision: int = 4
+    ):
+        """
+        Args:
+            calculator: VedicChartCalculator (resolves ayanamsa names)
+            max_entries: Maximum number of place-days kept in memory
+            ttl_seconds: Seconds a day stays valid (None: days never go stale)
+            coordinate_precision: Decimal places lat/lon are rounded to (4 ~ 11 m)
+        """
+        self.calculator = calculator
+        self.coordinate_precision = coordinate_precision
+        self._cache = LRUCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+
+    def make_key(self, date, latitude, longitude, timezone, ayanamsa=None):
+        """Build the normalized cache key for one place-day"""
+        return (
+            date,
+            round(float(latitude), self.coordinate_precision),
+            round(float(longitude), self.coordinate_precision),
+            timezone,
+            self.calculator.ayanamsa_for(ayanamsa)
+        )
+
+    async def days_async(self, executor, start_date, days, latitude, longitude, timezone,
+                         ayanamsa=None) -> List[Dict]:
+        """
+        Panchang for consecutive local days, computing only what is missing
+
+        Args:
+            executor: app.utils.executor.ChartExecutor running the calculation
+            start_date: First local day (YYYY-MM-DD)
+            days: Number of days
+            latitude, longitude, timezone: Place
+            ayanamsa: Ayanamsa name (default: the calculator's)
+
+        Returns:
+            Days as from calculate_panchang
+        """
+        first = datetime.strptime(start_date, '%Y-%m-%d')
+        dates = [(first + timedelta(days=i)).strftime('%Y-%m-%d') for i in range(days)]
+        keys = [self.make_key(date, latitude, longitude, timezone, ayanamsa) for date in dates]
+        result = [self._cache.get(key) for key in keys]
+
+        missing = [i for i, day in enumerate(result) if day is None]
+        if missing:
+            # One pass from the first to the last missing day (cached days in between are refreshed)
+            low, high = missing[0], missing[-1]
+            computed = await executor.run(
+                'calculate_panchang',
+                dates[low],
+                high - low + 1,
+                latitude,
+                longitude,
+                timezone,
+                ayanamsa=ayanamsa
+            )
+            for i, day in enumerate(computed, start=low):
+                self._cache.put(keys[i], day)
+                result[i] = day
+        return result
+
+    def stats(self) -> Dict:
+        """Hit/miss/eviction counters (one lookup per place-day)"""
+        return self._cache.stats()
+
+    def clear(self):
+        self._cache.clear()
+
+
+__all__ = ['PanchangCache']
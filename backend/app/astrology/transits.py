@@ -0,0 +1,201 @@
+"""
+Transit engine
+Computes sidereal positions over a date range in fixed-size NumPy chunks
+and relates them to a natal chart (sign, nakshatra, house from Moon and
+Lagna, conjunctions with natal points). Results are produced lazily so a
+multi-year hourly range never sits fully in memory.
+"""
+
+import json
+import numpy as np
+import swisseph as swe
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional, Sequence
+
+
+
+STEPS = {'day': timedelta(days=1), 'hour': timedelta(hours=1)}
+
+# Longest range accepted in one request (about 150 years)
+MAX_RANGE_DAYS = 150 * 365
+
+# Transiting bodies, in VedicChartCalculator.PLANETS order
+TRANSIT_PLANETS = ['Sun', 'Moon', 'Mars', 'Mercury', 'Jupiter', 'Venus', 'Saturn', 'Rahu', 'Ketu']
+
+# Default orb (degrees) for a conjunction with a natal point
+CONJUNCTION_ORB = 1.0
+
+
+class TransitEngine:
+    """Transits of the grahas over the natal points of one chart"""
+
+    def __init__(self, calculator, chunk_size: int = 1024):
+        """
+        Args:
+            calculator: VedicChartCalculator supplying the ephemeris, ayanamsa
+                and the SIGNS / NAKSHATRAS tables
+            chunk_size: Number of time steps evaluated per NumPy chunk
+        """
+        self.calculator = calculator
+        self.chunk_size = chunk_size
+
+    def positions(self, start: datetime, end: datetime, step: str = 'day',
+                  ayanamsa: Optional[str] = None,
+                  ephemeris: Optional[str] = None) -> Iterator[Dict]:
+        """
+        Sidereal positions from start to end (inclusive), one chunk at a time
+
+        Args:
+            start: First instant (UT)
+            end: Last instant (UT)
+            step: 'day' or 'hour'
+            ayanamsa: Ayanamsa name (default: the calculator's)
+            ephemeris: Ephemeris mode (default: the calculator's backend)
+
+        Yields:
+            Dicts with 'times' (list of datetimes), 'jd' (n,), 'longitude' (n, 9)
+            and 'speed' (n, 9) in TRANSIT_PLANETS order
+
+        Raises:
+            ValueError: On a bad step, range, ayanamsa or ephemeris mode
+                (raised on call, before iteration)
+        """
+        if step not in STEPS:
+            raise ValueError(f"Unknown step: {step} (use 'day' or 'hour')")
+        if end < start:
+            raise ValueError("end must not be before start")
+        if (end - start).days > MAX_RANGE_DAYS:
+            raise ValueError(f"Range is limited to {MAX_RANGE_DAYS} days")
+        ayanamsa = self.calculator.ayanamsa_for(ayanamsa)
+        # Resolved now so an unavailable mode fails before streaming starts
+        ephemeris = self.calculator.ephemeris_for(ephemeris).name
+        return self._iter_positions(start, end, STEPS[step], ayanamsa, ephemeris)
+
+    def _iter_positions(self, start, end, delta, ayanamsa, ephemeris):
+        total = int((end - start) / delta) + 1
+        start_jd = swe.julday(start.year, start.month, start.day,
+                              start.hour + start.minute / 60.0)
+        step_days = delta.total_seconds() / 86400
+
+        for offset in range(0, total, self.chunk_size):
+            count = min(self.chunk_size, total - offset)
+            jd = start_jd + (offset + np.arange(count)) * step_days
+
+            sidereal, speed = self.calculator.sidereal_positions_batch(jd, ayanamsa, ephemeris)
+
+            yield {
+                'times': [start + (offset + k) * delta for k in range(count)],
+                'jd': jd,
+                'longitude': sidereal,
+                'speed': speed
+            }
+
+    def transits(
+        self,
+        chart_data: Dict,
+        start: datetime,
+        end: datetime,
+        step: str = 'day',
+        planets: Optional[Sequence[str]] = None,
+        changes_only: bool = False,
+        orb: float = CONJUNCTION_ORB
+    ) -> Iterator[Dict]:
+        """
+        Transits over a natal chart, one record per time step
+
+        Transit longitudes use the natal chart's ephemeris mode and ayanamsa,
+        so they are measured in the same frame as the natal points.
+
+        Args:
+            chart_data: Natal chart from VedicChartCalculator.calculate_chart
+            start: First instant (UT)
+            end: Last instant (UT)
+            step: 'day' or 'hour'
+            planets: Transiting planets to report (default: all nine)
+            changes_only: Only yield steps where a planet changes sign,
+                nakshatra or natal conjunctions (the first step is always yielded)
+            orb: Conjunction orb in degrees
+
+        Yields:
+            {'time', 'planets': {name: {'longitude', 'sign', 'nakshatra',
+            'house_from_moon', 'house_from_lagna', 'retrograde', 'conjunct'}}}
+
+        Raises:
+            ValueError: On unknown planets, a bad step/range or a natal
+                ephemeris mode this deployment cannot provide (raised on call)
+        """
+        planets = list(planets or TRANSIT_PLANETS)
+        unknown = [p for p in planets if p not in TRANSIT_PLANETS]
+        if unknown:
+            raise ValueError(f"Unknown planets: {', '.join(unknown)}")
+        ayanamsa = chart_data['birth_details'].get('ayanamsa_name')
+        ephemeris = chart_data.get('ephemeris', {}).get('mode')
+        chunks = self.positions(start, end, step, ayanamsa, ephemeris)
+        return self._iter_transits(chart_data, chunks, step, planets, changes_only, orb)
+
+    def _iter_transits(self, chart_data, chunks, step, planets, changes_only, orb):
+        columns = [TRANSIT_PLANETS.index(p) for p in planets]
+        signs = self.calculator.SIGNS
+        nakshatras = self.calculator.NAKSHATRAS
+        moon_sign = chart_data['planets']['Moon']['sign_num']
+        lagna_sign = chart_data['ascendant']['sign_num']
+
+        # Natal points a transit can conjoin: the lagna and every natal graha
+        natal_names = ['Lagna'] + list(chart_data['planets'])
+        natal_longitudes = np.array(
+            [chart_data['ascendant']['longitude']]
+            + [data['longitude'] for data in chart_data['planets'].values()]
+        )
+
+        time_format = '%Y-%m-%d' if step == 'day' else '%Y-%m-%dT%H:%M'
+        previous = None
+
+        for chunk in chunks:
+            longitude = chunk['longitude'][:, columns]
+            speed = chunk['speed'][:, columns]
+
+            sign_num = np.minimum(longitude // 30, 11).astype(np.int8)
+            nakshatra_num = np.minimum(longitude // (360 / 27), 26).astype(np.int8)
+            house_from_moon = (sign_num - moon_sign) % 12 + 1
+            house_from_lagna = (sign_num - lagna_sign) % 12 + 1
+
+            # (steps, planets, natal points) angular separation
+            separation = np.abs((longitude[:, :, None] - natal_longitudes + 180) % 360 - 180)
+            conjunct = separation <= orb
+
+            for k, moment in enumerate(chunk['times']):
+                state = (sign_num[k].tobytes(), nakshatra_num[k].tobytes(), conjunct[k].tobytes())
+                if changes_only and state == previous:
+                    continue
+                previous = state
+
+                yield {
+                    'time': moment.strftime(time_format),
+                    'planets': {
+                        name: {
+                            'longitude': round(float(longitude[k, j]), 2),
+                            'sign': signs[sign_num[k, j]],
+                            'nakshatra': nakshatras[nakshatra_num[k, j]],
+                            'house_from_moon': int(house_from_moon[k, j]),
+                            'house_from_lagna': int(house_from_lagna[k, j]),
+                            'retrograde': bool(speed[k, j] < 0),
+                            'conjunct': [natal_names[i] for i in np.nonzero(conjunct[k, j])[0]]
+                        }
+                        for j, name in enumerate(planets)
+                    }
+                }
+
+    def transits_ndjson(self, *args, **kwargs) -> Iterator[str]:
+        """transits() serialized as newline-delimited JSON lines (validated on call)"""
+        records = self.transits(*args, **kwargs)
+        return (json.dumps(record, separators=(',', ':')) + '\n' for record in records)
+
+
+def parse_planets(planets: Optional[str]) -> Optional[List[str]]:
+    """Comma-separated planet names (e.g. 'Saturn,Jupiter') to a list"""
+    if not planets:
+        return None
+    return [name.strip().capitalize() for name in planets.split(',') if name.strip()]
+
+
+__all__ = ['TransitEngine', 'TRANSIT_PLANETS', 'MAX_RANGE_DAYS', 'parse_planets']
@@ -0,0 +1,102 @@
+"""
+Divisional charts (vargas)
+Maps sidereal longitudes to varga signs for the sixteen Parashari
+divisions (Shodasavarga) as array arithmetic: each uniform varga is a
+per-sign (start, step) lookup plus the part index within the sign, and
+the Trimsamsa (D30) uses per-parity boundary tables
+"""
+
+import numpy as np
+from typing import Dict, List, Optional, Sequence
+
+
+VARGAS = [1, 2, 3, 4, 7, 9, 10, 12, 16, 20, 24, 27, 30, 40, 45, 60]
+
+VARGA_NAMES = {
+    1: 'Rasi', 2: 'Hora', 3: 'Drekkana', 4: 'Chaturthamsa', 7: 'Saptamsa',
+    9: 'Navamsa', 10: 'Dasamsa', 12: 'Dwadasamsa', 16: 'Shodasamsa',
+    20: 'Vimsamsa', 24: 'Chaturvimsamsa', 27: 'Bhamsa', 30: 'Trimsamsa',
+    40: 'Khavedamsa', 45: 'Akshavedamsa', 60: 'Shashtiamsa'
+}
+
+_SIGN = np.arange(12)
+_ODD = _SIGN % 2 == 0           # Aries, Gemini, ... (odd counting from 1)
+_MODALITY = _SIGN % 3           # 0 movable, 1 fixed, 2 dual
+
+# Varga sign = (start[sign] + step[sign] * part) % 12, part = index of the
+# equal division of the sign the longitude falls in
+_RULES = {
+    1: (_SIGN, 0),
+    2: (np.where(_ODD, 4, 3), np.where(_ODD, -1, 1)),   # Sun/Moon hora: Leo, Cancer
+    3: (_SIGN, 4),                                       # 1st, 5th, 9th from the sign
+    4: (_SIGN, 3),                                       # 1st, 4th, 7th, 10th
+    7: (np.where(_ODD, _SIGN, _SIGN + 6), 1),
+    9: (_SIGN + np.array([0, 8, 4])[_MODALITY], 1),
+    10: (np.where(_ODD, _SIGN, _SIGN + 8), 1),
+    12: (_SIGN, 1),
+    16: (np.array([0, 4, 8])[_MODALITY], 1),             # Aries, Leo, Sagittarius
+    20: (np.array([0, 8, 4])[_MODALITY], 1),             # Aries, Sagittarius, Leo
+    24: (np.where(_ODD, 4, 3), 1),                       # Leo, Cancer
+    27: (np.array([0, 3, 6, 9])[_SIGN % 4], 1),          # by element
+    40: (np.where(_ODD, 0, 6), 1),                       # Aries, Libra
+    45: (np.array([0, 4, 8])[_MODALITY], 1),
+    60: (_SIGN, 1),
+}
+_RULES = {
+    n: (np.asarray(start) % 12, np.broadcast_to(step, 12))
+    for n, (start, step) in _RULES.items()
+}
+
+# Trimsamsa: unequal parts ruled by Mars, Saturn, Jupiter, Mercury, Venus
+# (reversed in even signs), each mapped to that planet's odd/even sign
+_D30_BOUNDS = np.array([[5, 10, 18, 25], [5, 12, 20, 25]], dtype=float)
+_D30_SIGNS = np.array([[0, 10, 8, 2, 6], [1, 5, 11, 9, 7]])
+
+
+def varga_signs(longitudes, divisions: Optional[Sequence[int]] = None) -> Dict[str, np.ndarray]:
+    """
+    Varga sign indices for any array of sidereal longitudes
+
+    Args:
+        longitudes: Sidereal longitudes in degrees, any shape
+        divisions: Varga numbers (default: all VARGAS)
+
+    Returns:
+        Dict of 'D<n>' -> int8 sign indices (0 = Aries) with the input's shape
+    """
+    divisions = VARGAS if divisions is None else divisions
+    unknown = [n for n in divisions if n not in VARGAS]
+    if unknown:
+        raise ValueError(f"Unsupported vargas: {', '.join(f'D{n}' for n in unknown)}")
+
+    longitudes = np.asarray(longitudes, dtype=float) % 360
+    sign = np.minimum(longitudes // 30, 11).astype(int)
+    degree = longitudes - sign * 30
+
+    result = {}
+    for n in divisions:
+        if n == 30:
+            parity = sign % 2
+            part = np.zeros_like(sign)
+            for bound in range(_D30_BOUNDS.shape[1]):
+                part += degree >= _D30_BOUNDS[parity, bound]
+            varga = _D30_SIGNS[parity, part]
+        else:
+            start, step = _RULES[n]
+            part = np.minimum((degree * n // 30).astype(int), n - 1)
+            varga = (start[sign] + step[sign] * part) % 12
+        result[f'D{n}'] = varga.astype(np.int8)
+    return result
+
+
+def parse_divisions(divisions: Optional[str]) -> Optional[List[int]]:
+    """Comma-separated varga names such as 'D9,D10' (or '9,10') to numbers"""
+    if not divisions:
+        return None
+    try:
+        return [int(name.strip().upper().lstrip('D')) for name in divisions.split(',') if name.strip()]
+    except ValueError:
+        raise ValueError(f"Invalid vargas: {divisions} (expected e.g. D9,D10)")
+
+
+__all__ = ['VARGAS', 'VARGA_NAMES', 'varga_signs', 'parse_divisions']
@@ -0,0 +1,461 @@
+"""
+Offline bulk chart pipeline
+Charts for large CSV dumps of birth records, without the API:
+
+    python -m app.bulk births.csv --output charts/ [--format npy|csv] [--workers N]
+
+Records are read in chunks and charted with calculate_charts_batch on a
+process pool; at most two chunks per worker are in flight, so memory stays
+bounded whatever the input size. Chunks are written in input order:
+
+- npy: one NumPy file per field (charts/<field>.npy, row i = input record i),
+  preallocated and filled through memory maps
+- csv: one flat row per record (2-D fields get one column per graha)
+
+After every chunk, charts/manifest.json records how many records are done;
+running the same command again resumes from there (--restart starts over).
+Records that cannot be charted (bad date, unknown timezone, ...) are kept in
+place with valid = False and NaN / -1 values.
+"""
+
+import argparse
+import csv
+import json
+import multiprocessing
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+
+from app.astrology.chart_calculator import VedicChartCalculator
+from app.utils.timezones import get_tz
+
+try:
+    from tqdm import tqdm
+except ImportError:  # optional dependency
+    tqdm = None
+
+
+# Bump when the output layout changes
+BULK_FORMAT_VERSION = 1
+
+# Input columns, named as in the API's BirthData
+INPUT_COLUMNS = ('date', 'time', 'latitude', 'longitude', 'timezone')
+
+# calculate_charts_batch columns written by default
+DEFAULT_FIELDS = [
+    'julian_day', 'ayanamsa', 'planet_longitude_exact', 'ascendant_longitude_exact',
+    'planet_sign_num', 'planet_nakshatra_num', 'ascendant_sign_num',
+    'moon_nakshatra_num', 'moon_pada', 'strength_score'
+]
+
+MANIFEST_NAME = 'manifest.json'
+CSV_NAME = 'charts.csv'
+
+# Stands in for records that cannot be charted when a whole chunk is bad
+PLACEHOLDER_RECORD = ('2000-01-01', '12:00', '0', '0', 'UTC')
+
+# Per-process calculator (built once by the pool initializer)
+_calculator: Optional[VedicChartCalculator] = None
+
+
+def _init_worker(ephemeris_backend=None, tables_path=None, calculator=None):
+    global _calculator
+    _calculator = calculator or VedicChartCalculator(ephemeris_backend=ephemeris_backend, tables_path=tables_path)
+
+
+def _missing(values: np.ndarray):
+    """Fill value for records that could not be charted"""
+    if values.dtype.kind == 'f':
+        return np.nan
+    if values.dtype.kind in 'iu':
+        return -1
+    if values.dtype.kind == 'b':
+        return False
+    return ''
+
+
+def chart_chunk(records: List[tuple], fields: List[str], ephemeris=None, ayanamsa=None) -> Dict[str, np.ndarray]:
+    """
+    Columnar charts for one chunk of records
+
+    Args:
+        records: (date, time, latitude, longitude, timezone) tuples, as read
+        fields: calculate_charts_batch columns to return
+        ephemeris: Ephemeris mode (default: the calculator's)
+        ayanamsa: Ayanamsa name (default: the calculator's)
+
+    Returns:
+        Dict of field -> array with one row per record, plus 'valid'
+    """
+    if _calculator is None:
+        _init_worker()
+
+    def batch(rows):
+        dates, times, latitudes, longitudes, timezones = zip(*rows)
+        # The calculator reads an unknown zone as naive local time; here that
+        # would be a plausible but wrong chart, so it is a bad record instead
+        unknown = sorted({name for name in timezones if not name or get_tz(name) is None})
+        if unknown:
+            raise ValueError(f"Unknown timezone(s): {', '.join(unknown)}")
+        columns = _calculator.calculate_charts_batch(
+            dates, times, [float(v) for v in latitudes], [float(v) for v in longitudes], timezones,
+            columnar=True, ephemeris=ephemeris, ayanamsa=ayanamsa
+        )
+        return {field: columns[field] for field in fields}
+
+    try:
+        result = batch(records)
+        result['valid'] = np.ones(len(records), dtype=bool)
+        return result
+    except Exception:
+        pass
+
+    # Some record is bad: chart the rest one by one and leave holes for the bad ones
+    valid = np.zeros(len(records), dtype=bool)
+    charted = {}
+    for i, record in enumerate(records):
+        try:
+            charted[i] = batch([record])
+            valid[i] = True
+        except Exception:
+            continue
+    template = next(iter(charted.values())) if charted else batch([PLACEHOLDER_RECORD])
+    result = {}
+    for field, values in template.items():
+        column = np.empty((len(records),) + values.shape[1:], dtype=values.dtype)
+        column[...] = _missing(values)
+        for i, chart in charted.items():
+            column[i] = chart[field][0]
+        result[field] = column
+    result['valid'] = valid
+    return result
+
+
+def read_records(path: str, columns: Dict[str, str], skip: int = 0) -> Iterator[tuple]:
+    """
+    Stream (date, time, latitude, longitude, timezone) tuples from a CSV file
+
+    Args:
+        path: Input CSV with a header row
+        columns: Input column -> CSV header name
+        skip: Records to skip (already done)
+    """
+    with open(path, newline='', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+        missing = [columns[c] for c in INPUT_COLUMNS if columns[c] not in (reader.fieldnames or [])]
+        if missing:
+            raise ValueError(f"{path} has no column(s): {', '.join(missing)}")
+        for row in islice(reader, skip, None):
+            yield tuple((row[columns[c]] or '').strip() for c in INPUT_COLUMNS)
+
+
+def count_records(path: str) -> int:
+    """Number of records (not lines) in a CSV file with a header row"""
+    with open(path, newline='', encoding='utf-8') as f:
+        # DictReader, as read_records uses, so blank lines are skipped alike
+        return sum(1 for _ in csv.DictReader(f))
+
+
+def chunked(records: Iterator[tuple], size: int) -> Iterator[List[tuple]]:
+    while True:
+        chunk = list(islice(records, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class NpyWriter:
+    """One memory-mapped .npy file per field, preallocated for every record"""
+
+    def __init__(self, directory: str, total: int):
+        self.directory = directory
+        self.total = total
+        self._arrays = {}
+
+    def _open(self, field: str, values: np.ndarray, resume: bool):
+        path = os.path.join(self.directory, f'{field}.npy')
+        if resume and os.path.exists(path):
+            return np.lib.format.open_memmap(path, mode='r+')
+        return np.lib.format.open_memmap(
+            path, mode='w+', dtype=values.dtype, shape=(self.total,) + values.shape[1:]
+        )
+
+    def write(self, start: int, columns: Dict[str, np.ndarray], resume: bool = False):
+        for field, values in columns.items():
+            if field not in self._arrays:
+                self._arrays[field] = self._open(field, values, resume)
+            self._arrays[field][start:start + len(values)] = values
+
+    def flush(self) -> Dict:
+        """Flush to disk; returns the position to resume from (none needed)"""
+        for array in self._arrays.values():
+            array.flush()
+        return {}
+
+    def describe(self) -> Dict:
+        return {
+            field: {'dtype': str(array.dtype), 'shape': list(array.shape)}
+            for field, array in self._arrays.items()
+        }
+
+    def close(self):
+        self.flush()
+        self._arrays.clear()
+
+
+class CsvWriter:
+    """One flat CSV row per record, appended in input order"""
+
+    def __init__(self, directory: str, planets: List[str]):
+        self.path = os.path.join(directory, CSV_NAME)
+        self.planets = planets
+        self._file = None
+        self._writer = None
+
+    def _header(self, columns: Dict[str, np.ndarray]) -> List[str]:
+        header = ['row']
+        for field, values in columns.items():
+            if values.ndim == 1:
+                header.append(field)
+            else:
+                header.extend(f'{field}_{planet}' for planet in self.planets[:values.shape[1]])
+        return header
+
+    def open(self, csv_bytes: Optional[int] = None):
+        """Open for appending, cut back to csv_bytes when resuming"""
+        if csv_bytes is not None and os.path.exists(self.path):
+            os.truncate(self.path, csv_bytes)
+            self._file = open(self.path, 'a', newline='', encoding='utf-8')
+        else:
+            self._file = open(self.path, 'w', newline='', encoding='utf-8')
+        self._writer = csv.writer(self._file)
+
+    def write(self, start: int, columns: Dict[str, np.ndarray], resume: bool = False):
+        if self._file.tell() == 0:
+            self._writer.writerow(self._header(columns))
+        values = [v.reshape(len(v), -1) for v in columns.values()]
+        table = np.concatenate([v.astype(object) for v in values], axis=1)
+        rows = np.column_stack([np.arange(start, start + len(table)), table])
+        self._writer.writerows(rows.tolist())
+
+    def flush(self) -> Dict:
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        return {'csv_bytes': self._file.tell()}
+
+    def describe(self) -> Dict:
+        return {'path': CSV_NAME}
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def _write_manifest(directory: str, manifest: Dict):
+    """Write the manifest atomically, so a crash never leaves a torn checkpoint"""
+    path = os.path.join(directory, MANIFEST_NAME)
+    with open(path + '.tmp', 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(path + '.tmp', path)
+
+
+def _load_manifest(directory: str) -> Optional[Dict]:
+    path = os.path.join(directory, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def run_bulk(
+    input_path: str,
+    output_dir: str,
+    output_format: str = 'npy',
+    fields: Optional[List[str]] = None,
+    chunk_size: int = 10000,
+    workers: Optional[int] = None,
+    ephemeris: Optional[str] = None,
+    ayanamsa: Optional[str] = None,
+    tables_path: Optional[str] = None,
+    columns: Optional[Dict[str, str]] = None,
+    restart: bool = False,
+    progress: bool = True
+) -> Dict:
+    """
+    Chart every record of a CSV file into output_dir, resuming if possible
+
+    Args:
+        input_path: Birth records CSV (header with date, time, latitude,
+            longitude, timezone; see columns)
+        output_dir: Output directory (created if needed)
+        output_format: 'npy' or 'csv'
+        fields: calculate_charts_batch columns to write (default: DEFAULT_FIELDS)
+        chunk_size: Records per chunk
+        workers: Process pool size (default: CPU count; 1 charts in this process)
+        ephemeris: Ephemeris mode (default: the calculator's)
+        ayanamsa: Ayanamsa name (default: the calculator's)
+        tables_path: Table file for the 'tables' ephemeris
+        columns: Input column -> CSV header name, for differently named headers
+        restart: Ignore an existing checkpoint and start over
+        progress: Show a progress bar
+
+    Returns:
+        The final manifest
+
+    Raises:
+        ValueError: On bad arguments, or a checkpoint written with other settings
+    """
+    if output_format not in ('npy', 'csv'):
+        raise ValueError(f"Unknown output format: {output_format} (expected npy or csv)")
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    fields = list(fields or DEFAULT_FIELDS)
+    columns = {**{c: c for c in INPUT_COLUMNS}, **(columns or {})}
+    workers = workers or os.cpu_count() or 1
+
+    calculator = VedicChartCalculator(ephemeris_backend=ephemeris, tables_path=tables_path)
+    date, time_, latitude, longitude, timezone = PLACEHOLDER_RECORD
+    sample = calculator.calculate_charts_batch(
+        [date], [time_], [float(latitude)], [float(longitude)], [timezone], columnar=True
+    )
+    unknown = [field for field in fields if field not in sample]
+    if unknown:
+        raise ValueError(f"Unknown field(s): {', '.join(unknown)} (expected some of {', '.join(sample)})")
+
+    settings = {
+        'version': BULK_FORMAT_VERSION,
+        'input': os.path.abspath(input_path),
+        'input_size': os.path.getsize(input_path),
+        'input_mtime': os.path.getmtime(input_path),
+        'format': output_format,
+        'fields': fields,
+        'ephemeris': calculator.ephemeris.name,
+        'ayanamsa': calculator.ayanamsa_for(ayanamsa),
+    }
+    os.makedirs(output_dir, exist_ok=True)
+    manifest = None if restart else _load_manifest(output_dir)
+    if manifest is not None and any(manifest.get(key) != value for key, value in settings.items()):
+        raise ValueError(
+            f"{output_dir} holds output for another input or other settings; "
+            f"pass --restart to overwrite it"
+        )
+    resume = manifest is not None
+    if manifest is None:
+        manifest = {
+            **settings,
+            'records_total': count_records(input_path),
+            'records_done': 0,
+            'records_invalid': 0,
+            'planet_order': list(calculator.PLANETS),
+            'complete': False,
+        }
+        _write_manifest(output_dir, manifest)
+
+    total, done = manifest['records_total'], manifest['records_done']
+    if output_format == 'npy':
+        writer = NpyWriter(output_dir, total)
+    else:
+        writer = CsvWriter(output_dir, manifest['planet_order'])
+        writer.open(manifest.get('csv_bytes') if resume else None)
+
+    bar = tqdm(total=total, initial=done, unit='chart', smoothing=0.1, disable=not progress) if tqdm else None
+    started = time.perf_counter()
+    chunks = chunked(read_records(input_path, columns, skip=done), chunk_size)
+    kwargs = {'ephemeris': ephemeris, 'ayanamsa': ayanamsa}
+
+    def record(result):
+        nonlocal done
+        writer.write(done, result, resume=resume)
+        done += len(result['valid'])
+        manifest['records_invalid'] += int((~result['valid']).sum())
+        manifest.update(writer.flush(), records_done=done)
+        _write_manifest(output_dir, manifest)
+        if bar is not None:
+            bar.update(len(result['valid']))
+        elif progress:
+            print(f"📦 {done}/{total} charts", file=sys.stderr)
+
+    try:
+        if workers == 1:
+            _init_worker(calculator=calculator)
+            for chunk in chunks:
+                record(chart_chunk(chunk, fields, **kwargs))
+        else:
+            # spawn, as the chart executor does; two chunks per worker keep them all busy
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_worker,
+                initargs=(ephemeris, tables_path)
+            ) as pool:
+                pending = deque()
+                for chunk in chunks:
+                    pending.append(pool.submit(chart_chunk, chunk, fields, **kwargs))
+                    if len(pending) >= 2 * workers:
+                        record(pending.popleft().result())
+                while pending:
+                    record(pending.popleft().result())
+    finally:
+        if bar is not None:
+            bar.close()
+        manifest['outputs'] = writer.describe()
+        writer.close()
+
+    manifest['complete'] = done >= total
+    _write_manifest(output_dir, manifest)
+    if progress:
+        elapsed = time.perf_counter() - started
+        print(f"✅ {done} charts in {output_dir} ({manifest['records_invalid']} invalid, {elapsed:.1f}s this run)",
+              file=sys.stderr)
+    return manifest
+
+
+def main(argv: Optional[list] = None):
+    parser = argparse.ArgumentParser(description="Chart a CSV of birth records offline")
+    parser.add_argument('input', help="CSV with date, time, latitude, longitude, timezone columns")
+    parser.add_argument('--output', required=True, help="Output directory")
+    parser.add_argument('--format', default='npy', choices=['npy', 'csv'],
+                        help="npy: one file per field; csv: one row per record")
+    parser.add_argument('--fields', help=f"Comma-separated fields (default: {','.join(DEFAULT_FIELDS)})")
+    parser.add_argument('--chunk-size', type=int, default=10000, help="Records per chunk")
+    parser.add_argument('--workers', type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument('--ephemeris', choices=['moshier', 'swisseph', 'tables'], help="Ephemeris mode")
+    parser.add_argument('--ayanamsa', help="Ayanamsa name (default: lahiri)")
+    parser.add_argument('--tables-path', help="Table file for --ephemeris tables")
+    for column in INPUT_COLUMNS:
+        parser.add_argument(f'--{column}-column', default=column, help=f"Header of the {column} column")
+    parser.add_argument('--restart', action='store_true', help="Discard the checkpoint and start over")
+    parser.add_argument('--quiet', action='store_true', help="No progress output")
+    args = parser.parse_args(argv)
+
+    try:
+        run_bulk(
+            args.input,
+            args.output,
+            output_format=args.format,
+            fields=[f.strip() for f in args.fields.split(',') if f.strip()] if args.fields else None,
+            chunk_size=args.chunk_size,
+            workers=args.workers,
+            ephemeris=args.ephemeris,
+            ayanamsa=args.ayanamsa,
+            tables_path=args.tables_path,
+            columns={column: getattr(args, f'{column}_column') for column in INPUT_COLUMNS},
+            restart=args.restart,
+            progress=not args.quiet
+        )
+    except (ValueError, FileNotFoundError) as e:
+        parser.exit(2, f"❌ {e}\n")
+
+
+__all__ = ['DEFAULT_FIELDS', 'INPUT_COLUMNS', 'chart_chunk', 'run_bulk']
+
+
+if __name__ == '__main__':
+    main()
@@ -1,20 +1,53 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, Header, HTTPException, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from pydantic import BaseModel, Field
+from datetime import datetime
 from typing import Optional, List
+import asyncio
+import calendar
+import csv
+import io
+import json
 import os
+import time
 from dotenv import load_dotenv
 
+from app.astrology.ayanamsa import AYANAMSAS, AYANAMSA_ALIASES, describe_ayanamsas
 from app.astrology.chart_calculator import VedicChartCalculator
-from app.ai.chatbot import AstroAIChatbot
-from app.models import BirthData, ChatMessage, ChatRequest
+from app.astrology.chart_cache import ChartCache
+from app.astrology.compatibility import chart_pada_index, pada_index, score_pair, top_matches
+from app.astrology.dasha import DASHA_LORDS, DashaTimeline, dasha_periods_batch, date_to_jd
+from app.astrology.muhurta import describe_window, merge_windows, rank_windows, split_range
+from app.astrology.panchang import CSV_FIELDS, MAX_DAYS as PANCHANG_MAX_DAYS, csv_row
+from app.astrology.panchang_cache import PanchangCache
+from app.astrology.transits import TransitEngine, parse_planets
+from app.astrology.varga import VARGA_NAMES, parse_divisions
+from app.ai.errors import LLMOverloaded
+from app.ai.response_cache import ResponseCache
+from app.ai.summarizer import ConversationSummarizer
+from app.utils.cache import LRUCache
+from app.utils.executor import get_chart_executor
+from app.utils.lazy import LazyService
+from app.utils.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, REGISTRY, MetricsMiddleware
+from app.utils.places import get_gazetteer
+from app.utils.responses import FastJSONResponse, StreamingAwareGZipMiddleware, dumps, etag_matches
+from app.utils.session_store import get_session_store, new_session_id
+from app.utils.timezones import TimezoneLookup
+from app.utils.warmup import Warmup
+from app.models import (
+    BirthData, BatchBirthChartRequest, ChatMessage, ChatRequest,
+    CompatibilityBatchRequest, CompatibilityRequest, DashaBatchRequest, MuhurtaRequest,
+    PanchangCity, PanchangExportRequest, VargaBatchRequest
+)
 
 load_dotenv()
 
 app = FastAPI(
     title="AstroHack AI Jyotish API",
     description="AI-powered Vedic Astrology Guidance System",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=FastJSONResponse
 )
 
 # CORS middleware
@@ -25,16 +58,187 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# Compress JSON bodies (SSE/NDJSON streams are left uncompressed)
+app.add_middleware(
+    StreamingAwareGZipMiddleware,
+    minimum_size=int(os.getenv("GZIP_MINIMUM_SIZE", "1024")),
+    compresslevel=int(os.getenv("GZIP_LEVEL", "6"))
+)
+# Request counts and latencies by route, for /metrics
+app.add_middleware(MetricsMiddleware)
 
-# Initialize services
+# Initialize services (cheap ones here; heavy ones lazily, see below)
 chart_calculator = VedicChartCalculator()
-chatbot = AstroAIChatbot(
-    api_key=os.getenv("OPENAI_API_KEY"),
-    model=os.getenv("OPENAI_MODEL", "gpt-4o-mini")  # Updated default
+chart_cache = ChartCache(
+    chart_calculator,
+    max_entries=int(os.getenv("CHART_CACHE_MAX_ENTRIES", "2048")),
+    ttl_seconds=float(os.getenv("CHART_CACHE_TTL_SECONDS", "86400"))
 )
+chart_executor = get_chart_executor(chart_calculator)
+transit_engine = TransitEngine(chart_calculator)
+# Event searches depend only on the range and filters, so results never go stale
+event_cache = LRUCache(max_entries=int(os.getenv("EVENT_CACHE_MAX_ENTRIES", "256")))
+# Panchang days per (place, local date); like events, they never go stale
+panchang_cache = PanchangCache(
+    chart_calculator,
+    max_entries=int(os.getenv("PANCHANG_CACHE_MAX_ENTRIES", "20000"))
+)
+timezone_lookup = TimezoneLookup()
+response_cache = None
+if os.getenv("RESPONSE_CACHE_ENABLED", "true").lower() == "true":
+    response_cache = ResponseCache(
+        max_entries=int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "5000")),
+        ttl_seconds=float(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "86400"))
+    )
+
+
+# Heavy services are built on first use (or during warm-up), keeping the
+# OpenAI SDK import and gazetteer indexing out of module import
+
+
+@LazyService
+def gazetteer():
+    """Offline place index (a GeoNames dump takes seconds to index)"""
+    return get_gazetteer(timezone_lookup)
+
+
+@LazyService
+def llm_client():
+    """Pooled, rate-limited chat completion client"""
+    from app.ai.llm_client import LLMClient
+    return LLMClient(
+        api_key=os.getenv("OPENAI_API_KEY"),
+        base_url=os.getenv("OPENAI_BASE_URL") or None,
+        max_in_flight=int(os.getenv("LLM_MAX_IN_FLIGHT", "16")),
+        max_queue=int(os.getenv("LLM_MAX_QUEUE", "64")),
+        queue_timeout=float(os.getenv("LLM_QUEUE_TIMEOUT_SECONDS", "10")),
+        timeout=float(os.getenv("LLM_TIMEOUT_SECONDS", "60")),
+        max_retries=int(os.getenv("LLM_MAX_RETRIES", "3"))
+    )
+
+
+@LazyService
+def chatbot():
+    """Chart-aware answer generation"""
+    from app.ai.chatbot import AstroAIChatbot
+    return AstroAIChatbot(
+        api_key=os.getenv("OPENAI_API_KEY"),
+        model=os.getenv("OPENAI_MODEL", "gpt-4o-mini"),  # Updated default
+        response_cache=response_cache,
+        summary_format=os.getenv("CHAT_SUMMARY_FORMAT", "compact"),
+        history_token_budget=int(os.getenv("CHAT_HISTORY_TOKEN_BUDGET", "1500")),
+        llm=llm_client()
+    )
+
+
+@LazyService
+def summarizer():
+    """Background conversation summarizer (None when disabled)"""
+    if os.getenv("CHAT_SUMMARIZATION_ENABLED", "true").lower() != "true":
+        return None
+    return ConversationSummarizer(
+        llm_client(),
+        model=chatbot().model,
+        after_messages=int(os.getenv("CHAT_SUMMARY_AFTER_MESSAGES", "12")),
+        keep_recent=int(os.getenv("CHAT_SUMMARY_KEEP_RECENT", "6")),
+        token_threshold=int(os.getenv("CHAT_SUMMARY_TOKEN_THRESHOLD", "1200"))
+    )
+
+
+LAZY_SERVICES = [gazetteer, llm_client, chatbot, summarizer]
+
+# Session storage: birth inputs + conversation only; charts come from chart_cache
+session_store = get_session_store()
+
+
+# Warm-up: runs in the background after startup; /ready reports when it is done
+warmup = Warmup()
+
+
+@warmup.step("chart_executor")
+async def warm_chart_executor():
+    # Ephemeris data, tables and first-call costs, in every chart worker
+    return {"workers": await chart_executor.warm_up()}
+
+
+@warmup.step("timezones", in_thread=True)
+def warm_timezones():
+    timezone_lookup.load()
+
 
-# In-memory storage (use Redis/DB in production)
-user_sessions = {}
+@warmup.step("gazetteer", in_thread=True)
+def warm_gazetteer():
+    places = gazetteer()
+    places.search("delhi", limit=1)
+    return {"places": places.stats()["places"]}
+
+
+@warmup.step("llm", in_thread=True)
+def warm_llm():
+    # Imports the OpenAI SDK; no API call is made
+    chatbot()
+    summarizer()
+
+
+@app.on_event("startup")
+async def start_services():
+    chart_executor.start()
+    if os.getenv("WARMUP_ENABLED", "true").lower() == "true":
+        warmup.start()
+    else:
+        warmup.skip()
+
+
+@app.on_event("shutdown")
+async def stop_services():
+    await warmup.cancel()
+    chart_executor.shutdown()
+    session_store.close()
+    if llm_client.built:
+        await llm_client().close()
+
+
+async def get_session_chart(session):
+    """Recompute (or fetch from cache) the chart for a stored session"""
+    birth_data = session["birth_data"]
+    return await chart_cache.calculate_chart_async(
+        chart_executor,
+        date=birth_data["date"],
+        time=birth_data["time"],
+        latitude=birth_data["latitude"],
+        longitude=birth_data["longitude"],
+        timezone=birth_data["timezone"],
+        ephemeris=birth_data.get("ephemeris"),
+        ayanamsa=birth_data.get("ayanamsa")
+    )
+
+
+# Divisional charts summarized for the chatbot (Navamsa and Dasamsa)
+PROMPT_VARGAS = [9, 10]
+
+
+async def build_prompt_context(birth_data, chart_data):
+    """Chart summary for prompts, including the PROMPT_VARGAS divisional charts"""
+    vargas = await chart_cache.vargas_async(
+        chart_executor,
+        date=birth_data["date"],
+        time=birth_data["time"],
+        latitude=birth_data["latitude"],
+        longitude=birth_data["longitude"],
+        timezone=birth_data["timezone"],
+        ephemeris=birth_data.get("ephemeris"),
+        ayanamsa=birth_data.get("ayanamsa"),
+        divisions=PROMPT_VARGAS
+    )
+    return chatbot().prepare_prompt_context(chart_data, vargas)
+
+
+async def get_prompt_context(session, chart_data):
+    """Per-session chart summary for prompts, built on first use and kept in the session"""
+    stored = session.get("prompt_context")
+    if stored is None or stored.get("version") != chatbot().PROMPT_CONTEXT_VERSION:
+        session["prompt_context"] = await build_prompt_context(session["birth_data"], chart_data)
+    return session["prompt_context"]
 
 
 @app.get("/")
@@ -43,85 +247,877 @@ async def root():
         "message": "AstroHack AI Jyotish API",
         "version": "1.0.0",
         "model": os.getenv("OPENAI_MODEL", "gpt-4o-mini"),
-        "endpoints": ["/birth-chart", "/chat", "/health"]
+        "endpoints": ["/birth-chart", "/birth-chart/{session_id}", "/birth-charts/batch", "/dasha/{session_id}", "/dasha/batch", "/transits/{session_id}", "/vargas/{session_id}", "/vargas/batch", "/events", "/compatibility", "/compatibility/batch", "/ephemeris", "/ayanamsas", "/ayanamsas/{session_id}", "/muhurta", "/panchang", "/panchang/export", "/places/search", "/places/resolve", "/chat", "/chat/stream", "/health", "/ready", "/metrics"]
     }
 
 
+# Chart payloads depend only on the birth inputs: clients revalidate with If-None-Match
+CHART_CACHE_CONTROL = "private, no-cache"
+
+
 @app.post("/birth-chart")
 async def calculate_birth_chart(birth_data: BirthData):
     """Calculate Vedic birth chart"""
     try:
-        chart_data = chart_calculator.calculate_chart(
+        compact = await chart_cache.compact_chart_async(
+            chart_executor,
             date=birth_data.date,
             time=birth_data.time,
             latitude=birth_data.latitude,
             longitude=birth_data.longitude,
-            timezone=birth_data.timezone
+            timezone=birth_data.timezone,
+            ephemeris=birth_data.ephemeris,
+            ayanamsa=birth_data.ayanamsa
         )
+        chart_data = chart_calculator.expand_chart(compact)
         
         # Store in session
-        session_id = birth_data.session_id or f"session_{len(user_sessions)}"
-        user_sessions[session_id] = {
-            "birth_data": birth_data.dict(),
-            "chart_data": chart_data,
+        session_id = birth_data.session_id or new_session_id()
+        birth_record = birth_data.dict(exclude={"session_id"})
+        session_store.save(session_id, {
+            "birth_data": birth_record,
+            "prompt_context": await build_prompt_context(birth_record, chart_data),
             "conversation_history": []
+        })
+        
+        return FastJSONResponse(
+            {
+                "session_id": session_id,
+                "chart_data": chart_data,
+                "message": "Birth chart calculated successfully"
+            },
+            headers={"ETag": compact.etag(), "Cache-Control": CHART_CACHE_CONTROL}
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/birth-chart/{session_id}")
+async def get_birth_chart(session_id: str, if_none_match: Optional[str] = Header(None)):
+    """
+    A session's chart, with an ETag
+    
+    Send the ETag back in If-None-Match to get 304 Not Modified (no body)
+    while the chart is unchanged.
+    """
+    session = session_store.get(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Session not found")
+    
+    birth_data = session["birth_data"]
+    try:
+        compact = await chart_cache.compact_chart_async(
+            chart_executor,
+            date=birth_data["date"],
+            time=birth_data["time"],
+            latitude=birth_data["latitude"],
+            longitude=birth_data["longitude"],
+            timezone=birth_data["timezone"],
+            ephemeris=birth_data.get("ephemeris"),
+            ayanamsa=birth_data.get("ayanamsa")
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    etag = compact.etag()
+    headers = {"ETag": etag, "Cache-Control": CHART_CACHE_CONTROL}
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    
+    return FastJSONResponse(
+        {"session_id": session_id, "chart_data": chart_calculator.expand_chart(compact)},
+        headers=headers
+    )
+
+
+@app.post("/birth-charts/batch")
+async def calculate_birth_charts_batch(request: BatchBirthChartRequest):
+    """Calculate many Vedic birth charts in one vectorized pass"""
+    try:
+        records = request.records
+        ephemeris, ayanamsa = batch_frame(request, records)
+        result = await chart_executor.run(
+            'calculate_charts_batch',
+            dates=[r.date for r in records],
+            times=[r.time for r in records],
+            latitudes=[r.latitude for r in records],
+            longitudes=[r.longitude for r in records],
+            timezones=[r.timezone for r in records],
+            columnar=request.columnar,
+            ephemeris=ephemeris,
+            ayanamsa=ayanamsa
+        )
+        
+        if request.columnar:
+            result = {
+                key: values.tolist() for key, values in result.items()
+            }
+            result['planet_order'] = list(chart_calculator.PLANETS)
+        
+        return {
+            "count": len(records),
+            "charts": result,
+            "message": "Birth charts calculated successfully"
+        }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/dasha/{session_id}")
+async def get_dasha(session_id: str, date: Optional[str] = None, level: str = "antardasha"):
+    """Vimshottari Dasha timeline and the periods active on a date (default: today)"""
+    session = session_store.get(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Session not found. Please create a birth chart first.")
+    if level not in ("mahadasha", "antardasha", "pratyantardasha"):
+        raise HTTPException(status_code=400, detail=f"Unknown dasha level: {level}")
+    
+    try:
+        chart_data = await get_session_chart(session)
+        timeline = DashaTimeline.from_chart(chart_data)
+        return {
+            "session_id": session_id,
+            "balance": chart_data["dasha"]["balance"],
+            "current": timeline.period_at(date_to_jd(date)),
+            "periods": timeline.periods(level)
         }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+def batch_frame(request, *record_lists):
+    """
+    Ephemeris mode and ayanamsa of a batch request
+    
+    They are set once for the whole batch; a record that sets its own
+    ephemeris or ayanamsa must agree with the batch's rather than being
+    silently computed in another frame.
+    
+    Raises:
+        ValueError: A record asks for a different ephemeris or ayanamsa
+    """
+    ephemeris = request.ephemeris or chart_calculator.ephemeris.name
+    ayanamsa = chart_calculator.ayanamsa_for(request.ayanamsa)
+    for records in record_lists:
+        for i, record in enumerate(records):
+            if record.ephemeris is not None and record.ephemeris != ephemeris:
+                raise ValueError(
+                    f"Record {i} asks for ephemeris {record.ephemeris}; set ephemeris on the batch instead"
+                )
+            if record.ayanamsa is not None and chart_calculator.ayanamsa_for(record.ayanamsa) != ayanamsa:
+                raise ValueError(
+                    f"Record {i} asks for ayanamsa {record.ayanamsa}; set ayanamsa on the batch instead"
+                )
+    return request.ephemeris, request.ayanamsa
+
+
+@app.post("/dasha/batch")
+async def get_dasha_batch(request: DashaBatchRequest):
+    """Active Mahadasha/Antardasha/Pratyantardasha lords for many charts at many dates"""
+    try:
+        records = request.records
+        ephemeris, ayanamsa = batch_frame(request, records)
+        columns = await chart_executor.run(
+            'calculate_charts_batch',
+            dates=[r.date for r in records],
+            times=[r.time for r in records],
+            latitudes=[r.latitude for r in records],
+            longitudes=[r.longitude for r in records],
+            timezones=[r.timezone for r in records],
+            columnar=True,
+            ephemeris=ephemeris,
+            ayanamsa=ayanamsa
+        )
+        lords = dasha_periods_batch(
+            columns['julian_day'],
+            columns['moon_longitude_exact'],
+            [date_to_jd(d) for d in request.dates]
+        )
         
+        names = [None] + DASHA_LORDS  # -1 (outside the timeline) maps to None
+        return {
+            "dates": request.dates,
+            "lords": DASHA_LORDS,
+            **{
+                level: [[names[idx + 1] for idx in row] for row in lords[:, :, k].tolist()]
+                for k, level in enumerate(("mahadasha", "antardasha", "pratyantardasha"))
+            }
+        }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/transits/{session_id}")
+async def get_transits(
+    session_id: str,
+    start: str,
+    end: str,
+    step: str = "day",
+    planets: Optional[str] = None,
+    changes_only: bool = False,
+    orb: float = 1.0
+):
+    """
+    Transits over the session's natal chart, streamed as NDJSON
+    
+    Positions use the chart's own ephemeris mode and ayanamsa.
+    
+    One JSON line per step (YYYY-MM-DD dates, UT); planets is a comma-separated
+    list such as "Saturn,Jupiter"; changes_only keeps only steps where a
+    sign, nakshatra or natal conjunction changes.
+    """
+    session = session_store.get(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Session not found. Please create a birth chart first.")
+    
+    try:
+        chart_data = await get_session_chart(session)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    try:
+        lines = transit_engine.transits_ndjson(
+            chart_data,
+            datetime.strptime(start, "%Y-%m-%d"),
+            datetime.strptime(end, "%Y-%m-%d"),
+            step=step,
+            planets=parse_planets(planets),
+            changes_only=changes_only,
+            orb=orb
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return StreamingResponse(lines, media_type="application/x-ndjson")
+
+
+@app.get("/vargas/{session_id}")
+async def get_vargas(session_id: str, divisions: Optional[str] = None):
+    """Divisional charts (D1-D60) of the session's birth chart; divisions e.g. "D9,D10" """
+    session = session_store.get(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Session not found. Please create a birth chart first.")
+    
+    try:
+        birth_data = session["birth_data"]
+        vargas = await chart_cache.vargas_async(
+            chart_executor,
+            date=birth_data["date"],
+            time=birth_data["time"],
+            latitude=birth_data["latitude"],
+            longitude=birth_data["longitude"],
+            timezone=birth_data["timezone"],
+            ephemeris=birth_data.get("ephemeris"),
+            ayanamsa=birth_data.get("ayanamsa"),
+            divisions=parse_divisions(divisions)
+        )
         return {
             "session_id": session_id,
-            "chart_data": chart_data,
-            "message": "Birth chart calculated successfully"
+            "names": {name: VARGA_NAMES[int(name[1:])] for name in vargas},
+            "vargas": vargas
+        }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/vargas/batch")
+async def get_vargas_batch(request: VargaBatchRequest):
+    """Divisional charts for many birth records in one vectorized pass"""
+    try:
+        records = request.records
+        ephemeris, ayanamsa = batch_frame(request, records)
+        result = await chart_executor.run(
+            'calculate_vargas_batch',
+            dates=[r.date for r in records],
+            times=[r.time for r in records],
+            latitudes=[r.latitude for r in records],
+            longitudes=[r.longitude for r in records],
+            timezones=[r.timezone for r in records],
+            divisions=request.divisions,
+            columnar=request.columnar,
+            ephemeris=ephemeris,
+            ayanamsa=ayanamsa
+        )
+        
+        if request.columnar:
+            result = {name: signs.tolist() for name, signs in result.items()}
+            result['body_order'] = ['Lagna'] + list(chart_calculator.PLANETS)
+        
+        return {
+            "count": len(records),
+            "vargas": result
+        }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/events")
+async def get_events(
+    year: Optional[int] = None,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    planets: Optional[str] = None,
+    types: Optional[str] = None,
+    ayanamsa: Optional[str] = None
+):
+    """
+    Sign ingresses, nakshatra changes, stations and Moon phases (UT)
+    
+    Pass a year, or start and end dates (YYYY-MM-DD); planets and types are
+    comma-separated filters, e.g. planets=Saturn,Jupiter&types=sign_ingress,station;
+    ayanamsa selects the zodiac ingresses and nakshatras are measured in
+    """
+    try:
+        if year is not None:
+            start_jd = date_to_jd(f"{year:04d}-01-01")
+            end_jd = date_to_jd(f"{year + 1:04d}-01-01")
+        elif start and end:
+            start_jd, end_jd = date_to_jd(start), date_to_jd(end)
+        else:
+            raise ValueError("Pass either year or both start and end")
+        planet_list = parse_planets(planets)
+        type_list = [t.strip() for t in types.split(",") if t.strip()] if types else None
+        ayanamsa_name = chart_calculator.ayanamsa_for(ayanamsa)
+        
+        key = (start_jd, end_jd, tuple(planet_list or ()), tuple(type_list or ()), ayanamsa_name)
+        events = await event_cache.get_or_compute_async(
+            key,
+            lambda: chart_executor.run('find_events', start_jd, end_jd, planet_list, type_list, ayanamsa_name)
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    return FastJSONResponse(
+        {"count": len(events), "events": events},
+        headers={"Cache-Control": "public, max-age=86400"}
+    )
+
+
+async def moon_pada_indices(records, ephemeris=None, ayanamsa=None):
+    """Moon pada indices (0-107) of many birth records, via the batch calculator"""
+    columns = await chart_executor.run(
+        'calculate_charts_batch',
+        dates=[r.date for r in records],
+        times=[r.time for r in records],
+        latitudes=[r.latitude for r in records],
+        longitudes=[r.longitude for r in records],
+        timezones=[r.timezone for r in records],
+        columnar=True,
+        ephemeris=ephemeris,
+        ayanamsa=ayanamsa
+    )
+    return pada_index(columns['moon_nakshatra_num'], columns['moon_pada'])
+
+
+@app.post("/compatibility")
+async def get_compatibility(request: CompatibilityRequest):
+    """Ashtakoota (Guna Milan) score of one couple with a per-koota breakdown"""
+    try:
+        charts = []
+        for person in (request.groom, request.bride):
+            charts.append(await chart_cache.calculate_chart_async(
+                chart_executor,
+                date=person.date,
+                time=person.time,
+                latitude=person.latitude,
+                longitude=person.longitude,
+                timezone=person.timezone,
+                ephemeris=person.ephemeris,
+                ayanamsa=person.ayanamsa
+            ))
+        groom_chart, bride_chart = charts
+        return {
+            "groom_moon": groom_chart["moon_nakshatra"],
+            "bride_moon": bride_chart["moon_nakshatra"],
+            **score_pair(chart_pada_index(groom_chart), chart_pada_index(bride_chart))
         }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/compatibility/batch")
+async def get_compatibility_batch(request: CompatibilityBatchRequest):
+    """Top-k Ashtakoota matches of each profile among the candidates"""
+    try:
+        ephemeris, ayanamsa = batch_frame(request, request.profiles, request.candidates)
+        profiles = await moon_pada_indices(request.profiles, ephemeris, ayanamsa)
+        candidates = await moon_pada_indices(request.candidates, ephemeris, ayanamsa)
+        matches = top_matches(
+            profiles,
+            candidates,
+            role=request.role,
+            k=request.top_k,
+            min_score=request.min_score
+        )
+        return {
+            "role": request.role,
+            "count": len(candidates),
+            "matches": matches
+        }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/ephemeris")
+async def get_ephemeris_modes():
+    """Ephemeris modes with their declared accuracy (arc seconds) and availability here"""
+    return {"modes": chart_calculator.ephemeris_modes()}
+
+
+@app.post("/muhurta")
+async def find_muhurta(request: MuhurtaRequest):
+    """
+    Best windows in the coming days for an event at a place
+    
+    The range is split into chunks searched in parallel on the chart
+    executor; windows come back best first (most benefics in kendras, then
+    longest, then earliest) with local start/end times.
+    """
+    try:
+        start_jd = chart_calculator.julian_day(request.start, "00:00", request.timezone)
+        parts = chart_executor.max_workers if chart_executor.mode != "inline" else 1
+        chunks = await asyncio.gather(*(
+            chart_executor.run(
+                'find_muhurtas',
+                chunk_start,
+                chunk_end,
+                request.latitude,
+                request.longitude,
+                constraints=request.constraints.dict(),
+                timezone=request.timezone,
+                ayanamsa=request.ayanamsa
+            )
+            for chunk_start, chunk_end in split_range(start_jd, start_jd + request.days, parts)
+        ))
+        windows = rank_windows(
+            merge_windows([window for chunk in chunks for window in chunk]),
+            top_k=request.top_k,
+            min_duration_minutes=request.min_duration_minutes
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    return {
+        "count": len(windows),
+        "windows": [describe_window(window, request.timezone) for window in windows]
+    }
+
+
+def resolve_panchang_place(city: PanchangCity, country: Optional[str] = None) -> dict:
+    """Label, coordinates and timezone of a panchang place (by coordinates or gazetteer name)"""
+    if city.latitude is not None and city.longitude is not None:
+        timezone = city.timezone or timezone_lookup.timezone_at(city.latitude, city.longitude)
+        if timezone is None:
+            raise ValueError(f"No timezone known at {city.latitude}, {city.longitude}; pass one")
+        return {
+            "city": city.name or f"{city.latitude},{city.longitude}",
+            "latitude": city.latitude,
+            "longitude": city.longitude,
+            "timezone": timezone
+        }
+    if not city.name:
+        raise ValueError("Pass a city name or both latitude and longitude")
+    place = gazetteer().resolve_name(city.name, country=country)
+    if place is None:
+        raise ValueError(f"Place not found: {city.name}")
+    return {
+        "city": place["name"],
+        "latitude": place["latitude"],
+        "longitude": place["longitude"],
+        "timezone": city.timezone or place["timezone"]
+    }
+
+
+@app.get("/panchang")
+async def get_panchang(
+    date: str,
+    days: int = 1,
+    city: Optional[str] = None,
+    country: Optional[str] = None,
+    lat: Optional[float] = None,
+    lon: Optional[float] = None,
+    timezone: Optional[str] = None,
+    ayanamsa: Optional[str] = None
+):
+    """
+    Panchang for days starting at a local date (YYYY-MM-DD)
+    
+    Pass a city name (optionally with an ISO country code), or lat and lon
+    (timezone defaults to the one there). Each day runs from sunrise to the
+    next sunrise, listing the tithis, nakshatras, yogas and karanas in force
+    with their end times, plus Rahu Kaal, Yamaganda and Gulika.
+    """
+    try:
+        if not 1 <= days <= PANCHANG_MAX_DAYS:
+            raise ValueError(f"days must be between 1 and {PANCHANG_MAX_DAYS}")
+        place = resolve_panchang_place(
+            PanchangCity(name=city, latitude=lat, longitude=lon, timezone=timezone), country=country
+        )
+        panchang = await panchang_cache.days_async(
+            chart_executor, date, days, place["latitude"], place["longitude"], place["timezone"], ayanamsa
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    return FastJSONResponse(
+        {"place": place, "ayanamsa": chart_calculator.ayanamsa_for(ayanamsa), "days": panchang},
+        headers={"Cache-Control": "public, max-age=86400"}
+    )
+
+
+@app.post("/panchang/export")
+async def export_panchang(request: PanchangExportRequest):
+    """
+    Multi-city panchang calendars streamed as CSV or NDJSON
+    
+    CSV has one row per city and day (the elements in force at sunrise);
+    NDJSON has one full day per line with a leading "city" field. A city
+    that cannot be computed gets a single row/line with only "city" and
+    "error" set, and the export carries on with the next one. Cities
+    are computed a few at a time on the chart executor, each city's range in
+    one batched pass, and rows are sent as soon as a city is done.
+    """
+    try:
+        if request.year is not None:
+            start = f"{request.year:04d}-01-01"
+            days = 366 if calendar.isleap(request.year) else 365
+        elif request.start:
+            start, days = request.start, request.days
+            datetime.strptime(start, "%Y-%m-%d")
+        else:
+            raise ValueError("Pass either year or start")
+        chart_calculator.ayanamsa_for(request.ayanamsa)
+        places = [resolve_panchang_place(city) for city in request.cities]
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    def compute(place):
+        return asyncio.ensure_future(panchang_cache.days_async(
+            chart_executor, start, days, place["latitude"], place["longitude"], place["timezone"],
+            request.ayanamsa
+        ))
+    
+    async def rows():
+        # Keep as many cities in flight as there are chart workers, in request order
+        in_flight = chart_executor.max_workers if chart_executor.mode != "inline" else 1
+        pending = [compute(place) for place in places[:in_flight]]
+        try:
+            if request.format == "csv":
+                buffer = io.StringIO()
+                writer = csv.DictWriter(buffer, fieldnames=["city"] + CSV_FIELDS + ["error"])
+                writer.writeheader()
+                yield buffer.getvalue()
+            for i, place in enumerate(places):
+                # The status line is already sent, so a city that cannot be
+                # computed (e.g. no daily sunrise) becomes an error row instead
+                try:
+                    panchang = await pending[i]
+                    error = None
+                except ValueError as e:
+                    panchang, error = [], str(e)
+                if i + in_flight < len(places):
+                    pending.append(compute(places[i + in_flight]))
+                if request.format == "csv":
+                    buffer.seek(0)
+                    buffer.truncate()
+                    if error is not None:
+                        writer.writerow({"city": place["city"], "error": error})
+                    writer.writerows(csv_row(day, city=place["city"]) for day in panchang)
+                    yield buffer.getvalue()
+                elif error is not None:
+                    yield dumps({"city": place["city"], "error": error}) + b"\n"
+                else:
+                    yield b"".join(dumps({"city": place["city"], **day}) + b"\n" for day in panchang)
+        finally:
+            for task in pending:
+                task.cancel()
+    
+    if request.format == "csv":
+        return StreamingResponse(
+            rows(),
+            media_type="text/csv",
+            headers={"Content-Disposition": 'attachment; filename="panchang.csv"'}
+        )
+    return StreamingResponse(rows(), media_type="application/x-ndjson")
+
+
+@app.get("/ayanamsas")
+async def get_ayanamsas():
+    """Supported ayanamsa names (with accepted aliases) and the server default"""
+    return {
+        "default": chart_calculator.default_ayanamsa,
+        "ayanamsas": describe_ayanamsas(),
+        "aliases": AYANAMSA_ALIASES
+    }
+
+
+@app.get("/ayanamsas/{session_id}")
+async def get_ayanamsa_variants(session_id: str, names: Optional[str] = None):
+    """
+    The session's planets and ascendant under several ayanamsas
+    
+    names is comma-separated, e.g. "lahiri,raman,kp" (default: every
+    supported ayanamsa); tropical positions are computed once for all of them.
+    """
+    session = session_store.get(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Session not found. Please create a birth chart first.")
+    
+    try:
+        birth_data = session["birth_data"]
+        name_list = [n.strip() for n in names.split(",") if n.strip()] if names else list(AYANAMSAS)
+        variants = await chart_executor.run(
+            'calculate_ayanamsa_variants',
+            date=birth_data["date"],
+            time=birth_data["time"],
+            latitude=birth_data["latitude"],
+            longitude=birth_data["longitude"],
+            timezone=birth_data["timezone"],
+            ayanamsas=name_list,
+            ephemeris=birth_data.get("ephemeris")
+        )
+        return FastJSONResponse({"session_id": session_id, "variants": variants})
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/places/search")
+async def search_places(q: str, limit: int = 10, country: Optional[str] = None):
+    """Place name suggestions (prefix, then fuzzy matches) from the offline gazetteer"""
+    if not 1 <= limit <= 50:
+        raise HTTPException(status_code=400, detail="limit must be between 1 and 50")
+    return {"query": q, "places": gazetteer().search(q, limit=limit, country=country)}
+
+
+@app.get("/places/resolve")
+async def resolve_place(
+    name: Optional[str] = None,
+    lat: Optional[float] = None,
+    lon: Optional[float] = None,
+    country: Optional[str] = None
+):
+    """
+    Coordinates and timezone of a birth place
+    
+    Pass a place name (optionally with an ISO country code), or lat and lon
+    to get the timezone there and the nearest known place
+    """
+    if lat is not None and lon is not None:
+        if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+            raise HTTPException(status_code=400, detail="lat/lon out of range")
+        return gazetteer().resolve_coordinates(lat, lon)
+    if not name:
+        raise HTTPException(status_code=400, detail="Pass either name or both lat and lon")
+    
+    place = gazetteer().resolve_name(name, country=country)
+    if place is None:
+        raise HTTPException(status_code=404, detail=f"Place not found: {name}")
+    return place
+
+
+def save_turn(session_id, session, user_message, reply):
+    """
+    Append one user/assistant turn to the session's stored history
+    
+    The session is re-read rather than written back from the copy taken
+    before the LLM call, so a compaction or another turn saved in the
+    meantime is kept; only the new pair is appended.
+    
+    Args:
+        session_id: Session id
+        session: The session as read at the start of the turn
+        user_message: The user's message
+        reply: The assistant's reply
+    """
+    latest = session_store.get(session_id)
+    if latest is None:
+        return
+    if "prompt_context" in session:
+        latest["prompt_context"] = session["prompt_context"]
+    history = latest["conversation_history"] + [
+        {"role": "user", "content": user_message},
+        {"role": "assistant", "content": reply}
+    ]
+    # Keep only last 20 messages
+    latest["conversation_history"] = history[-20:]
+    session_store.save(session_id, latest)
+    
+    if summarizer():
+        summarizer().schedule(session_id, latest, session_store)
+
+
 @app.post("/chat")
 async def chat(request: ChatRequest):
     """Handle chat interaction"""
     try:
         session_id = request.session_id
         
-        if session_id not in user_sessions:
+        session = session_store.get(session_id)
+        if session is None:
             raise HTTPException(status_code=404, detail="Session not found. Please create a birth chart first.")
         
-        session = user_sessions[session_id]
-        chart_data = session["chart_data"]
+        chart_data = await get_session_chart(session)
         conversation_history = session["conversation_history"]
         
-        # Add user message to history
-        conversation_history.append({
-            "role": "user",
-            "content": request.message
-        })
-        
-        # Get AI response
-        response = await chatbot.get_response(
+        # Get AI response (history holds only the previous turns)
+        result = await chatbot().generate_response(
             user_message=request.message,
             chart_data=chart_data,
             conversation_history=conversation_history,
-            context=request.context
+            context=request.context,
+            use_cache=request.use_cache,
+            prompt_context=await get_prompt_context(session, chart_data),
+            conversation_summary=session.get("summary")
         )
+        response = result["content"]
         
-        # Add AI response to history
-        conversation_history.append({
-            "role": "assistant",
-            "content": response
-        })
-        
-        # Keep only last 20 messages
-        session["conversation_history"] = conversation_history[-20:]
+        # Add both turns to the stored history; fold older turns into the
+        # rolling summary in the background
+        save_turn(session_id, session, request.message, response)
         
         return {
             "response": response,
-            "session_id": session_id
+            "session_id": session_id,
+            "usage": result["usage"]
         }
     except HTTPException:
         raise
+    except LLMOverloaded as e:
+        raise HTTPException(
+            status_code=503,
+            detail=str(e),
+            headers={"Retry-After": str(max(1, round(e.retry_after)))}
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def sse_event(event: str, data: dict) -> str:
+    """Format one Server-Sent Event"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@app.post("/chat/stream")
+async def chat_stream(request: ChatRequest):
+    """Handle chat interaction, streaming the reply as Server-Sent Events"""
+    session_id = request.session_id
+    
+    session = session_store.get(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Session not found. Please create a birth chart first.")
+    
+    try:
+        chart_data = await get_session_chart(session)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    conversation_history = session["conversation_history"]
+    prompt_context = await get_prompt_context(session, chart_data)
+    
+    async def event_stream():
+        started = time.perf_counter()
+        first_token_at = None
+        chunks = []
+        usage = {}
+        
+        try:
+            async for chunk in chatbot().stream_response(
+                user_message=request.message,
+                chart_data=chart_data,
+                conversation_history=conversation_history,
+                context=request.context,
+                use_cache=request.use_cache,
+                prompt_context=prompt_context,
+                conversation_summary=session.get("summary"),
+                usage=usage
+            ):
+                if first_token_at is None:
+                    first_token_at = time.perf_counter()
+                chunks.append(chunk)
+                yield sse_event("token", {"content": chunk})
+        except LLMOverloaded as e:
+            # Shed before any token: nothing was generated or stored
+            yield sse_event("error", {"detail": str(e), "retry_after": e.retry_after})
+        else:
+            finished = time.perf_counter()
+            yield sse_event("done", {
+                "session_id": session_id,
+                "ttft_ms": round(((first_token_at or finished) - started) * 1000, 1),
+                "total_ms": round((finished - started) * 1000, 1),
+                "usage": usage
+            })
+        finally:
+            # Persist whatever was delivered, even if the client disconnected
+            if chunks:
+                save_turn(session_id, session, request.message, "".join(chunks))
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy", "model": os.getenv("OPENAI_MODEL", "gpt-4o-mini")}
\ No newline at end of file
+    return {
+        "status": "healthy",
+        "model": os.getenv("OPENAI_MODEL", "gpt-4o-mini"),
+        "ephemeris": chart_calculator.ephemeris.describe(),
+        "ayanamsa": chart_calculator.default_ayanamsa,
+        "chart_cache": chart_cache.stats(),
+        "chart_executor": chart_executor.stats(),
+        "sessions": session_store.stats(),
+        "response_cache": response_cache.stats() if response_cache else None,
+        "summarizer": summarizer.peek().stats() if summarizer.peek() else None,
+        "event_cache": event_cache.stats(),
+        "panchang_cache": panchang_cache.stats(),
+        "places": gazetteer.peek().stats() if gazetteer.built else None,
+        "llm": llm_client.peek().stats() if llm_client.built else None
+    }
+
+
+@app.get("/ready")
+async def readiness_check():
+    """
+    Readiness probe: 200 once warm-up has finished, 503 until then
+    
+    /health answers as soon as the worker is up (liveness); route traffic
+    to a worker only after /ready does.
+    """
+    return FastJSONResponse(
+        {
+            **warmup.stats(),
+            "services": {service.name: service.stats() for service in LAZY_SERVICES}
+        },
+        status_code=200 if warmup.ready else 503
+    )
+
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus exposition of request, chart stage and LLM metrics (this worker)"""
+    return PlainTextResponse(REGISTRY.render(), media_type=METRICS_CONTENT_TYPE)
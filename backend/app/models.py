@@ -1,8 +1,11 @@
 from pydantic import BaseModel, Field
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Union
 from datetime import date, time
 
 
+EPHEMERIS_MODE_PATTERN = "^(moshier|swisseph|tables)$"
+
+
 class BirthData(BaseModel):
     date: str = Field(..., description="Birth date in YYYY-MM-DD format")
     time: str = Field(..., description="Birth time in HH:MM format")
@@ -10,13 +13,124 @@ class BirthData(BaseModel):
     longitude: float = Field(..., description="Birth place longitude")
     timezone: str = Field(..., description="Timezone (e.g., Asia/Kolkata)")
     name: Optional[str] = Field(None, description="User's name")
+    ephemeris: Optional[str] = Field(
+        None, pattern=EPHEMERIS_MODE_PATTERN,
+        description="Ephemeris mode: moshier, swisseph or tables (default: the server's)"
+    )
+    ayanamsa: Optional[str] = Field(
+        None, max_length=32,
+        description="Ayanamsa: lahiri, raman, kp, true_chitra, ... (default: the server's, Lahiri)"
+    )
     session_id: Optional[str] = None
 
 
+class BatchBirthChartRequest(BaseModel):
+    records: List[BirthData] = Field(..., min_length=1, max_length=10000, description="Birth records to chart")
+    columnar: bool = Field(False, description="Return per-field arrays instead of per-chart dicts")
+    ephemeris: Optional[str] = Field(
+        None, pattern=EPHEMERIS_MODE_PATTERN,
+        description="Ephemeris mode for the whole batch (records may only repeat it)"
+    )
+    ayanamsa: Optional[str] = Field(
+        None, max_length=32,
+        description="Ayanamsa for the whole batch (records may only repeat it)"
+    )
+
+
+class DashaBatchRequest(BaseModel):
+    records: List[BirthData] = Field(..., min_length=1, max_length=10000, description="Birth records")
+    dates: List[str] = Field(..., min_length=1, max_length=1000, description="Query dates (YYYY-MM-DD)")
+    ephemeris: Optional[str] = Field(
+        None, pattern=EPHEMERIS_MODE_PATTERN,
+        description="Ephemeris mode for the whole batch (records may only repeat it)"
+    )
+    ayanamsa: Optional[str] = Field(
+        None, max_length=32,
+        description="Ayanamsa for the whole batch (records may only repeat it)"
+    )
+
+
+class VargaBatchRequest(BaseModel):
+    records: List[BirthData] = Field(..., min_length=1, max_length=10000, description="Birth records")
+    divisions: Optional[List[int]] = Field(None, description="Varga numbers, e.g. [9, 10] (default: all sixteen)")
+    columnar: bool = Field(False, description="Return per-varga sign index arrays instead of per-chart dicts")
+    ephemeris: Optional[str] = Field(
+        None, pattern=EPHEMERIS_MODE_PATTERN,
+        description="Ephemeris mode for the whole batch (records may only repeat it)"
+    )
+    ayanamsa: Optional[str] = Field(
+        None, max_length=32,
+        description="Ayanamsa for the whole batch (records may only repeat it)"
+    )
+
+
+class CompatibilityRequest(BaseModel):
+    groom: BirthData
+    bride: BirthData
+
+
+class CompatibilityBatchRequest(BaseModel):
+    profiles: List[BirthData] = Field(..., min_length=1, max_length=1000, description="Profiles to match")
+    role: str = Field("groom", pattern="^(groom|bride)$", description="Side the profiles are on")
+    candidates: List[BirthData] = Field(..., min_length=1, max_length=10000, description="Candidates to score against every profile")
+    top_k: int = Field(10, ge=1, le=1000, description="Matches returned per profile")
+    min_score: float = Field(0, ge=0, le=36, description="Minimum Ashtakoota total (out of 36)")
+    ephemeris: Optional[str] = Field(
+        None, pattern=EPHEMERIS_MODE_PATTERN,
+        description="Ephemeris mode for the whole batch (records may only repeat it)"
+    )
+    ayanamsa: Optional[str] = Field(
+        None, max_length=32,
+        description="Ayanamsa for the whole batch (records may only repeat it)"
+    )
+
+
+class TimeRange(BaseModel):
+    start: str = Field(..., description="Local start time (YYYY-MM-DDTHH:MM)")
+    end: str = Field(..., description="Local end time (YYYY-MM-DDTHH:MM)")
+
+
+class MuhurtaConstraints(BaseModel):
+    lagna_signs: Optional[List[str]] = Field(None, description="Acceptable lagna signs, e.g. [\"Taurus\", \"Leo\"]")
+    moon_nakshatras: Optional[List[str]] = Field(None, description="Acceptable Moon nakshatras")
+    tithis: Optional[List[Union[int, str]]] = Field(None, description="Acceptable tithis: numbers 1-30 or names")
+    min_benefics_in_kendras: int = Field(0, ge=0, le=3, description="Least Mercury/Jupiter/Venus in houses 1, 4, 7, 10")
+    avoid: List[TimeRange] = Field([], max_length=1000, description="Periods to exclude")
+
+
+class MuhurtaRequest(BaseModel):
+    latitude: float = Field(..., description="Event place latitude")
+    longitude: float = Field(..., description="Event place longitude")
+    timezone: str = Field(..., description="Timezone (e.g., Asia/Kolkata)")
+    start: str = Field(..., description="First day searched (YYYY-MM-DD, local)")
+    days: int = Field(30, ge=1, le=366, description="Number of days searched")
+    constraints: MuhurtaConstraints = Field(default_factory=MuhurtaConstraints)
+    min_duration_minutes: float = Field(15, ge=0, description="Shortest window returned")
+    top_k: int = Field(10, ge=1, le=500, description="Windows returned")
+    ayanamsa: Optional[str] = Field(None, max_length=32, description="Ayanamsa (default: the server's)")
+
+
+class PanchangCity(BaseModel):
+    name: Optional[str] = Field(None, description="Place name, resolved with the gazetteer unless coordinates are given")
+    latitude: Optional[float] = Field(None, ge=-90, le=90)
+    longitude: Optional[float] = Field(None, ge=-180, le=180)
+    timezone: Optional[str] = Field(None, description="Timezone (default: the gazetteer's / the one at the coordinates)")
+
+
+class PanchangExportRequest(BaseModel):
+    cities: List[PanchangCity] = Field(..., min_length=1, max_length=500)
+    year: Optional[int] = Field(None, ge=1, le=9999, description="Whole calendar year (overrides start/days)")
+    start: Optional[str] = Field(None, description="First local day (YYYY-MM-DD)")
+    days: int = Field(366, ge=1, le=366, description="Number of days from start")
+    format: str = Field("csv", pattern="^(csv|ndjson)$", description="csv (one row per day) or ndjson (full days)")
+    ayanamsa: Optional[str] = Field(None, max_length=32, description="Ayanamsa (default: the server's)")
+
+
 class ChatRequest(BaseModel):
     session_id: str
     message: str
     context: Optional[str] = Field(None, description="Context: career, marriage, finance, general")
+    use_cache: bool = Field(True, description="Allow a cached answer for opening questions")
 
 
 class ChatMessage(BaseModel):
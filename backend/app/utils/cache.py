@@ -0,0 +1,203 @@
+"""
+Bounded in-memory cache with LRU + TTL eviction
+Thread-safe, with single-flight deduplication of concurrent misses
+"""
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+
+class _InFlight:
+    """A computation that other callers for the same key can wait on"""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class LRUCache:
+    """Least-recently-used cache with optional per-entry time-to-live"""
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: Optional[float] = None):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._inflight: Dict[Hashable, _InFlight] = {}
+        self._async_inflight: Dict[Hashable, asyncio.Task] = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._coalesced = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        with self._lock:
+            return self._lookup_locked(key, count=False) is not _MISSING
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for key, or default"""
+        with self._lock:
+            value = self._lookup_locked(key)
+        return default if value is _MISSING else value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Insert or refresh a value, evicting the least recently used entry if full"""
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds else None
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove key and return its value, or default"""
+        with self._lock:
+            entry = self._entries.pop(key, None)
+        return default if entry is None else entry[1]
+
+    def clear(self) -> None:
+        """Drop every entry (counters are kept)"""
+        with self._lock:
+            self._entries.clear()
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        Return the cached value for key, computing it on a miss
+
+        Concurrent callers missing on the same key share one computation:
+        the first caller runs compute() and the others wait for its result.
+
+        Args:
+            key: Cache key
+            compute: Zero-argument callable producing the value
+
+        Returns:
+            Cached or freshly computed value
+        """
+        with self._lock:
+            value = self._lookup_locked(key)
+            if value is not _MISSING:
+                return value
+            inflight = self._inflight.get(key)
+            owner = inflight is None
+            if owner:
+                inflight = self._inflight[key] = _InFlight()
+            else:
+                self._coalesced += 1
+
+        if not owner:
+            inflight.event.wait()
+            if inflight.error is not None:
+                raise inflight.error
+            return inflight.value
+
+        try:
+            inflight.value = compute()
+            self.put(key, inflight.value)
+            return inflight.value
+        except BaseException as e:
+            inflight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            inflight.event.set()
+
+    async def get_or_compute_async(
+        self,
+        key: Hashable,
+        compute: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """
+        Async variant of get_or_compute for use on one event loop
+
+        The computation runs as its own task. A waiter that is cancelled
+        (e.g. its client disconnected) stops waiting, but the computation
+        carries on for the other waiters and still fills the cache.
+
+        Args:
+            key: Cache key
+            compute: Zero-argument callable returning an awaitable value
+
+        Returns:
+            Cached or freshly computed value
+        """
+        with self._lock:
+            value = self._lookup_locked(key)
+            if value is not _MISSING:
+                return value
+            task = self._async_inflight.get(key)
+            if task is not None:
+                self._coalesced += 1
+            else:
+                # Detached from the caller: cancelling any one waiter (the
+                # first included) must not cancel the result the others share
+                task = asyncio.ensure_future(self._compute_async(key, compute))
+                task.add_done_callback(_retrieve_exception)
+                self._async_inflight[key] = task
+
+        return await asyncio.shield(task)
+
+    async def _compute_async(self, key, compute):
+        try:
+            value = await compute()
+            self.put(key, value)
+            return value
+        finally:
+            self._async_inflight.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss/eviction counters and current size"""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                'size': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl_seconds': self.ttl_seconds,
+                'hits': self._hits,
+                'misses': self._misses,
+                'hit_rate': round(self._hits / lookups, 4) if lookups else 0.0,
+                'evictions': self._evictions,
+                'expirations': self._expirations,
+                'coalesced': self._coalesced,
+                'in_flight': len(self._inflight) + len(self._async_inflight)
+            }
+
+    def _lookup_locked(self, key, count=True):
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                self._expirations += 1
+            else:
+                self._entries.move_to_end(key)
+                if count:
+                    self._hits += 1
+                return value
+        if count:
+            self._misses += 1
+        return _MISSING
+
+
+_MISSING = object()
+
+
+def _retrieve_exception(task):
+    """Mark a shared computation's error retrieved, so one nobody awaited is not logged"""
+    if not task.cancelled():
+        task.exception()
+
+
+__all__ = ['LRUCache']
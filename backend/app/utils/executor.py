@@ -0,0 +1,235 @@
+"""
+Run CPU-bound chart work off the event loop
+Supports inline, thread-pool and process-pool execution modes
+"""
+
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Dict, Optional
+
+from app.astrology.chart_calculator import VedicChartCalculator
+
+
+EXECUTION_MODES = ('inline', 'thread', 'process')
+
+# Per-worker calculator. Process workers each get their own Swiss Ephemeris
+# state; thread workers get their own calculator object but share the
+# process's. Calls never depend on that shared state: the ayanamsa is passed
+# per call and only app.astrology.ayanamsa sets the sidereal mode, under a lock.
+_worker_state = threading.local()
+
+
+def _init_worker(ephemeris_backend=None, tables_path=None):
+    """Pool initializer: build and warm up this worker's calculator once"""
+    calculator = VedicChartCalculator(
+        ephemeris_backend=ephemeris_backend,
+        tables_path=tables_path
+    )
+    calculator.warm_up()
+    _worker_state.calculator = calculator
+    _worker_state.init_args = (ephemeris_backend, tables_path)
+
+
+def _warm_worker(init_args):
+    """Make sure this worker is initialized; returns an id for the worker"""
+    if getattr(_worker_state, 'calculator', None) is None:
+        _init_worker(*init_args)
+    return (os.getpid(), threading.get_ident())
+
+
+def _run_in_worker(method, args, kwargs, init_args):
+    """Call a calculator method inside a worker; returns (result, started_at)"""
+    started_at = time.time()
+    if getattr(_worker_state, 'calculator', None) is None:
+        # Thread pools initialize per thread lazily
+        _init_worker(*init_args)
+    result = getattr(_worker_state.calculator, method)(*args, **kwargs)
+    return result, started_at
+
+
+class ChartExecutor:
+    """Dispatch VedicChartCalculator calls inline, to threads or to processes"""
+
+    def __init__(
+        self,
+        mode: str = 'inline',
+        max_workers: Optional[int] = None,
+        ephemeris_backend: Optional[str] = None,
+        tables_path: Optional[str] = None,
+        calculator: Optional[VedicChartCalculator] = None
+    ):
+        """
+        Args:
+            mode: 'inline' (on the event loop), 'thread' or 'process'
+            max_workers: Pool size (defaults to the CPU count)
+            ephemeris_backend: Backend each worker's calculator is built with
+            tables_path: Table file for the 'tables' backend
+            calculator: Calculator used in inline mode
+        """
+        if mode not in EXECUTION_MODES:
+            raise ValueError(f"Unknown chart execution mode: {mode} (expected one of {EXECUTION_MODES})")
+
+        self.mode = mode
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._init_args = (ephemeris_backend, tables_path)
+        self._calculator = calculator
+        self._pool = None
+        self._lock = threading.Lock()
+
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._in_flight = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._run_total = 0.0
+        self._run_max = 0.0
+
+    def start(self):
+        """Create the worker pool (no-op for inline mode or if already started)"""
+        with self._lock:
+            if self._pool is not None or self.mode == 'inline':
+                return
+            if self.mode == 'thread':
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix='chart-worker'
+                )
+            else:
+                # spawn, not fork: forking a process that runs an event loop
+                # and other threads is unsafe
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=_init_worker,
+                    initargs=self._init_args
+                )
+        print(f"⚙️  Chart executor started ({self.mode}, {self.max_workers} workers)")
+
+    def shutdown(self, wait: bool = True):
+        """Stop the worker pool"""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait)
+
+    async def run(self, method: str, *args, **kwargs) -> Any:
+        """
+        Run a VedicChartCalculator method according to the execution mode
+
+        Args:
+            method: Calculator method name, e.g. 'calculate_chart'
+            *args, **kwargs: Passed to the method
+
+        Returns:
+            The method's return value
+        """
+        submitted_at = time.time()
+        self._record_submit()
+        try:
+            if self.mode == 'inline':
+                if self._calculator is None:
+                    self._calculator = VedicChartCalculator(*self._init_args)
+                result = getattr(self._calculator, method)(*args, **kwargs)
+                started_at = submitted_at
+            else:
+                self.start()
+                loop = asyncio.get_running_loop()
+                result, started_at = await loop.run_in_executor(
+                    self._pool, _run_in_worker, method, args, kwargs, self._init_args
+                )
+        except Exception:
+            self._record_done(submitted_at, submitted_at, failed=True)
+            raise
+
+        self._record_done(submitted_at, started_at)
+        return result
+
+    async def warm_up(self) -> int:
+        """
+        Start the pool and initialize (and warm up) its workers ahead of traffic
+
+        Process workers warm up in their initializer, so every process the
+        pool spawns is warm even if it did not answer one of the calls.
+
+        Returns:
+            Number of distinct workers that answered a warm-up call (1 for inline mode)
+        """
+        if self.mode == 'inline':
+            if self._calculator is None:
+                self._calculator = VedicChartCalculator(*self._init_args)
+            self._calculator.warm_up()
+            return 1
+
+        self.start()
+        loop = asyncio.get_running_loop()
+        # Submitted together, so an idle-less pool spawns a worker for each
+        workers = await asyncio.gather(*(
+            loop.run_in_executor(self._pool, _warm_worker, self._init_args)
+            for _ in range(self.max_workers)
+        ))
+        return len(set(workers))
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth, wait time and run time metrics"""
+        with self._lock:
+            finished = self._completed + self._failed
+            return {
+                'mode': self.mode,
+                'workers': self.max_workers if self.mode != 'inline' else 0,
+                'submitted': self._submitted,
+                'completed': self._completed,
+                'failed': self._failed,
+                'in_flight': self._in_flight,
+                'queue_depth': max(0, self._in_flight - self.max_workers) if self.mode != 'inline' else 0,
+                'avg_wait_ms': round(self._wait_total / finished * 1000, 3) if finished else 0.0,
+                'max_wait_ms': round(self._wait_max * 1000, 3),
+                'avg_run_ms': round(self._run_total / finished * 1000, 3) if finished else 0.0,
+                'max_run_ms': round(self._run_max * 1000, 3)
+            }
+
+    def _record_submit(self):
+        with self._lock:
+            self._submitted += 1
+            self._in_flight += 1
+
+    def _record_done(self, submitted_at, started_at, failed=False):
+        finished_at = time.time()
+        wait = max(0.0, started_at - submitted_at)
+        run = max(0.0, finished_at - started_at)
+        with self._lock:
+            self._in_flight -= 1
+            if failed:
+                self._failed += 1
+            else:
+                self._completed += 1
+            self._wait_total += wait
+            self._wait_max = max(self._wait_max, wait)
+            self._run_total += run
+            self._run_max = max(self._run_max, run)
+
+
+def get_chart_executor(calculator: Optional[VedicChartCalculator] = None) -> ChartExecutor:
+    """
+    Build the chart executor configured by environment
+
+    CHART_EXECUTOR_MODE selects inline/thread/process (default: thread, so
+    chart work never blocks the event loop; inline is opt-in) and
+    CHART_EXECUTOR_WORKERS sizes the pool. Under `uvicorn --workers N` every
+    uvicorn worker owns its own pool, so size it to roughly cores / N.
+    """
+    workers = os.getenv("CHART_EXECUTOR_WORKERS")
+    return ChartExecutor(
+        mode=os.getenv("CHART_EXECUTOR_MODE", "thread").lower(),
+        max_workers=int(workers) if workers else None,
+        ephemeris_backend=os.getenv("EPHEMERIS_BACKEND"),
+        tables_path=os.getenv("EPHEMERIS_TABLES_PATH"),
+        calculator=calculator
+    )
+
+
+__all__ = ['ChartExecutor', 'EXECUTION_MODES', 'get_chart_executor']
@@ -0,0 +1,64 @@
+"""
+Lazily constructed services
+Heavy objects (and the imports behind them) are built on first use rather
+than when the app module is imported, so workers start accepting
+connections sooner; the warm-up phase builds them ahead of traffic
+"""
+
+import threading
+import time
+from typing import Callable, Dict, Generic, Optional, TypeVar
+
+
+T = TypeVar('T')
+
+
+class LazyService(Generic[T]):
+    """
+    Zero-argument factory whose result is built once, on the first call
+
+    Concurrent first calls (event loop and warm-up thread) build it only
+    once; later calls return the same object. Used as a decorator:
+
+        @LazyService
+        def get_chatbot():
+            from app.ai.chatbot import AstroAIChatbot
+            return AstroAIChatbot(...)
+    """
+
+    def __init__(self, factory: Callable[[], T]):
+        self.factory = factory
+        self.name = factory.__name__
+        self.__doc__ = factory.__doc__
+        self._value: Optional[T] = None
+        self._built = False
+        self._build_seconds = None
+        self._lock = threading.Lock()
+
+    def __call__(self) -> T:
+        if self._built:
+            return self._value
+        with self._lock:
+            if not self._built:
+                start = time.perf_counter()
+                self._value = self.factory()
+                self._build_seconds = time.perf_counter() - start
+                self._built = True
+        return self._value
+
+    @property
+    def built(self) -> bool:
+        return self._built
+
+    def peek(self) -> Optional[T]:
+        """The service if it has been built, else None (never builds it)"""
+        return self._value if self._built else None
+
+    def stats(self) -> Dict:
+        return {
+            'built': self._built,
+            'build_ms': round(self._build_seconds * 1000, 1) if self._build_seconds is not None else None
+        }
+
+
+__all__ = ['LazyService']
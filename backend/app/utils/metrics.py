@@ -0,0 +1,392 @@
+"""
+Prometheus-format metrics
+Dependency-free counters and histograms with a text exposition for
+/metrics, plus an ASGI middleware timing every request. Histograms keep
+per-bucket counts and cumulate only when rendered, so observing is one
+bisect and three additions under a lock.
+"""
+
+import bisect
+import threading
+import time
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+
+# Seconds: sub-millisecond chart stages up to slow LLM calls
+DEFAULT_BUCKETS = (
+    0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+    0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0
+)
+TOKEN_BUCKETS = (16, 32, 64, 128, 256, 512, 1024, 2048, 4096, 8192, 16384)
+
+CONTENT_TYPE = "text/plain; version=0.0.4"
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = 'untyped'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _check(self, labels: Tuple) -> Tuple:
+        """Validate a new label set (series are keyed by the raw label values)"""
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {labels}")
+        return labels
+
+    def _header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    """Monotonically increasing count per label set"""
+
+    kind = 'counter'
+
+    def __init__(self, name, documentation, labelnames=()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple, float] = {}
+
+    def inc(self, *labels, amount: float = 1) -> None:
+        with self._lock:
+            if labels in self._values:
+                self._values[labels] += amount
+            else:
+                self._values[self._check(labels)] = amount
+
+    def value(self, *labels) -> float:
+        return self._values.get(labels, 0)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            values = list(self._values.items())
+        return self._header() + [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in values
+        ]
+
+
+class Gauge(_Metric):
+    """Value that can go up and down, per label set"""
+
+    kind = 'gauge'
+
+    def __init__(self, name, documentation, labelnames=()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple, float] = {}
+
+    def set(self, value: float, *labels) -> None:
+        with self._lock:
+            self._values[labels if labels in self._values else self._check(labels)] = value
+
+    def inc(self, *labels, amount: float = 1) -> None:
+        with self._lock:
+            if labels in self._values:
+                self._values[labels] += amount
+            else:
+                self._values[self._check(labels)] = amount
+
+    def dec(self, *labels, amount: float = 1) -> None:
+        self.inc(*labels, amount=-amount)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            values = list(self._values.items())
+        return self._header() + [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in values
+        ]
+
+
+class _Timer:
+    """Context manager observing the elapsed time of its block"""
+
+    __slots__ = ('histogram', 'labels', 'start')
+
+    def __init__(self, histogram, labels):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.start, *self.labels)
+
+
+class StageTimer:
+    """
+    Laps through consecutive stages of one computation
+
+        stages = CHART_STAGE_SECONDS.stage_timer()
+        ...; stages.lap('parse')
+        ...; stages.lap('julday')
+    """
+
+    __slots__ = ('histogram', 'last')
+
+    def __init__(self, histogram):
+        self.histogram = histogram
+        self.last = time.perf_counter()
+
+    def lap(self, stage: str) -> None:
+        now = time.perf_counter()
+        self.histogram.observe(now - self.last, stage)
+        self.last = now
+
+
+class _NullStageTimer:
+    """StageTimer stand-in for callers that are not being timed"""
+
+    __slots__ = ()
+
+    def lap(self, stage: str) -> None:
+        pass
+
+
+NULL_STAGE_TIMER = _NullStageTimer()
+
+
+class Histogram(_Metric):
+    """Bucketed distribution (count, sum and cumulative buckets) per label set"""
+
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets: Iterable[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(float(b) for b in buckets))
+        self._series: Dict[Tuple, List] = {}  # key -> [bucket counts..., +Inf count, sum]
+
+    def observe(self, value: float, *labels) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[self._check(labels)] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+
+    def time(self, *labels) -> _Timer:
+        """Time a block: with histogram.time('label'): ..."""
+        return _Timer(self, labels)
+
+    def stage_timer(self) -> StageTimer:
+        """Stage laps for a histogram with a single 'stage' label"""
+        return StageTimer(self)
+
+    def count(self, *labels) -> int:
+        series = self._series.get(labels)
+        return sum(series[:-1]) if series else 0
+
+    def render(self) -> List[str]:
+        with self._lock:
+            snapshot = [(key, list(series)) for key, series in self._series.items()]
+        lines = self._header()
+        for key, series in snapshot:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), series[:-1]):
+                cumulative += count
+                le = 'le="' + _format_value(bound) + '"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(series[-1])}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class Registry:
+    """Named metrics rendered together for /metrics"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric):
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                if type(existing) is not type(metric) or existing.labelnames != metric.labelnames:
+                    raise ValueError(f"Metric {metric.name} already registered differently")
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name, documentation, labelnames=()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name, documentation, labelnames=()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+# --- Application metrics ---
+
+# Recorded by the process that runs the calculation: with
+# CHART_EXECUTOR_MODE=process the stage timings stay in the pool workers
+CHART_STAGE_SECONDS = REGISTRY.histogram(
+    'chart_stage_seconds',
+    'Time spent in each stage of VedicChartCalculator.calculate_chart',
+    ['stage']
+)
+
+LLM_REQUEST_SECONDS = REGISTRY.histogram(
+    'llm_request_seconds',
+    'Chat completion latency (whole reply; streams until the last chunk)',
+    ['model', 'mode', 'outcome']
+)
+LLM_FIRST_TOKEN_SECONDS = REGISTRY.histogram(
+    'llm_time_to_first_token_seconds',
+    'Streamed chat completion latency until the first content chunk',
+    ['model']
+)
+LLM_PROMPT_TOKENS = REGISTRY.histogram(
+    'llm_prompt_tokens',
+    'Prompt tokens per chat completion (estimated for streams)',
+    ['model', 'mode'],
+    buckets=TOKEN_BUCKETS
+)
+LLM_COMPLETION_TOKENS = REGISTRY.histogram(
+    'llm_completion_tokens',
+    'Completion tokens per chat completion (estimated for streams)',
+    ['model', 'mode'],
+    buckets=TOKEN_BUCKETS
+)
+LLM_ERRORS = REGISTRY.counter(
+    'llm_errors_total',
+    'Failed chat completions by exception class',
+    ['model', 'error']
+)
+LLM_CACHE_HITS = REGISTRY.counter(
+    'llm_response_cache_hits_total',
+    'Chat replies served from the response cache without a model call',
+    ['mode']
+)
+LLM_IN_FLIGHT = REGISTRY.gauge(
+    'llm_in_flight',
+    'Chat completion calls holding a concurrency slot'
+)
+LLM_QUEUE_DEPTH = REGISTRY.gauge(
+    'llm_queue_depth',
+    'Chat completion calls waiting for a concurrency slot'
+)
+LLM_CONCURRENCY_LIMIT = REGISTRY.gauge(
+    'llm_concurrency_limit',
+    'Current adaptive limit on concurrent chat completion calls'
+)
+LLM_QUEUE_WAIT_SECONDS = REGISTRY.histogram(
+    'llm_queue_wait_seconds',
+    'Time chat completion calls waited for a concurrency slot'
+)
+LLM_ATTEMPT_SECONDS = REGISTRY.histogram(
+    'llm_attempt_seconds',
+    'Latency of individual API attempts (until the response or first stream bytes)',
+    ['outcome']
+)
+LLM_RETRIES = REGISTRY.counter(
+    'llm_retries_total',
+    'Retried chat completion attempts by reason',
+    ['reason']
+)
+LLM_SHED = REGISTRY.counter(
+    'llm_shed_total',
+    'Chat completion calls rejected without reaching the API',
+    ['reason']
+)
+
+HTTP_REQUESTS = REGISTRY.counter(
+    'http_requests_total',
+    'HTTP requests by route template, method and status',
+    ['method', 'route', 'status']
+)
+HTTP_REQUEST_SECONDS = REGISTRY.histogram(
+    'http_request_duration_seconds',
+    'HTTP request latency until the last response byte',
+    ['method', 'route']
+)
+HTTP_IN_FLIGHT = REGISTRY.gauge(
+    'http_requests_in_flight',
+    'HTTP requests currently being served'
+)
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording count, status and latency of every HTTP request
+
+    Routes are labelled by their path template (/dasha/{session_id}), so
+    label cardinality stays bounded; unmatched paths share one label.
+    Latency runs until the final body chunk, which covers streamed replies.
+    """
+
+    def __init__(self, app, registry_path: str = '/metrics'):
+        self.app = app
+        self.registry_path = registry_path
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http' or scope['path'] == self.registry_path:
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+        HTTP_IN_FLIGHT.inc()
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = message['status']
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_IN_FLIGHT.dec()
+            route = scope.get('route')
+            template = getattr(route, 'path', None) or '<unmatched>'
+            method = scope.get('method', '')
+            HTTP_REQUESTS.inc(method, template, status)
+            HTTP_REQUEST_SECONDS.observe(time.perf_counter() - start, method, template)
+
+
+__all__ = [
+    'Counter', 'Gauge', 'Histogram', 'Registry', 'REGISTRY', 'CONTENT_TYPE',
+    'DEFAULT_BUCKETS', 'TOKEN_BUCKETS', 'MetricsMiddleware', 'StageTimer', 'NULL_STAGE_TIMER',
+    'CHART_STAGE_SECONDS', 'LLM_REQUEST_SECONDS', 'LLM_FIRST_TOKEN_SECONDS',
+    'LLM_PROMPT_TOKENS', 'LLM_COMPLETION_TOKENS', 'LLM_ERRORS', 'LLM_CACHE_HITS',
+    'LLM_IN_FLIGHT', 'LLM_QUEUE_DEPTH', 'LLM_CONCURRENCY_LIMIT', 'LLM_QUEUE_WAIT_SECONDS',
+    'LLM_ATTEMPT_SECONDS', 'LLM_RETRIES', 'LLM_SHED',
+    'HTTP_REQUESTS', 'HTTP_REQUEST_SECONDS', 'HTTP_IN_FLIGHT'
+]
@@ -0,0 +1,315 @@
+"""
+Offline place resolution
+Loads a local gazetteer (the bundled seed CSV or a GeoNames dump) into
+in-memory indexes: a sorted prefix index and a trigram index for names,
+and an H3 cell index (or a vectorized scan without h3) for reverse lookups
+"""
+
+import bisect
+import csv
+import os
+import re
+import unicodedata
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from app.utils.timezones import TimezoneLookup
+
+try:
+    import h3
+except ImportError:  # optional dependency
+    h3 = None
+
+
+DEFAULT_GAZETTEER_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'gazetteer.csv')
+
+EARTH_RADIUS_KM = 6371.0088
+
+# Fuzzy (trigram) matches below this similarity are dropped
+MIN_TRIGRAM_SIMILARITY = 0.3
+
+# Longest prefix-match list ranked per query (short prefixes on big gazetteers)
+MAX_PREFIX_CANDIDATES = 5000
+
+
+def normalize_name(name: str) -> str:
+    """Accent-free lowercase name with punctuation collapsed to single spaces"""
+    name = unicodedata.normalize('NFKD', name).encode('ascii', 'ignore').decode()
+    return " ".join(re.sub(r"[^a-z0-9]+", " ", name.lower()).split())
+
+
+def _trigrams(key: str) -> set:
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _h3_cell(latitude, longitude, resolution):
+    if hasattr(h3, 'latlng_to_cell'):
+        return h3.latlng_to_cell(latitude, longitude, resolution)
+    return h3.geo_to_h3(latitude, longitude, resolution)
+
+
+def _h3_disk(cell, k):
+    if hasattr(h3, 'grid_disk'):
+        return h3.grid_disk(cell, k)
+    return h3.k_ring(cell, k)
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Great-circle distance in km (NumPy broadcasting)"""
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    a = (np.sin((lat2 - lat1) / 2) ** 2
+         + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+
+class Gazetteer:
+    """Name search, name/coordinate resolution and nearest-place lookup"""
+
+    def __init__(
+        self,
+        path: str = DEFAULT_GAZETTEER_PATH,
+        timezones: Optional[TimezoneLookup] = None,
+        h3_resolution: int = 4,
+        max_ring: int = 8
+    ):
+        """
+        Args:
+            path: Seed CSV (name,alternate_names,country,admin1,latitude,
+                longitude,timezone,population) or a GeoNames .txt dump
+            timezones: Coordinate timezone lookup (a new one if omitted)
+            h3_resolution: H3 cell resolution of the reverse index (4 ~ 23 km edges)
+            max_ring: Rings searched around a cell before scanning every place
+        """
+        self.path = path
+        self.timezones = timezones or TimezoneLookup()
+        self.h3_resolution = h3_resolution
+        self.max_ring = max_ring
+
+        records = self._load(path)
+        self.names = [r['name'] for r in records]
+        self.countries = [r['country'] for r in records]
+        self.admin1 = [r['admin1'] for r in records]
+        self.timezone_names = [r['timezone'] for r in records]
+        self.latitudes = np.array([r['latitude'] for r in records], dtype=float)
+        self.longitudes = np.array([r['longitude'] for r in records], dtype=float)
+        self.populations = np.array([r['population'] for r in records], dtype=np.int64)
+
+        self._build_name_indexes(records)
+        self._build_spatial_index()
+        print(f"🗺️  Gazetteer loaded: {len(records)} places from {os.path.basename(path)}")
+
+    # --- Loading ---
+
+    def _load(self, path) -> List[Dict]:
+        if path.endswith('.txt'):
+            return self._load_geonames(path)
+        with open(path, encoding='utf-8') as f:
+            rows = csv.DictReader(line for line in f if not line.startswith('#'))
+            return [
+                {
+                    'name': row['name'],
+                    'alternate_names': [n for n in row['alternate_names'].split('|') if n],
+                    'country': row['country'],
+                    'admin1': row['admin1'],
+                    'latitude': float(row['latitude']),
+                    'longitude': float(row['longitude']),
+                    'timezone': row['timezone'] or None,
+                    'population': int(row['population'] or 0)
+                }
+                for row in rows
+            ]
+
+    def _load_geonames(self, path):
+        """GeoNames 'geoname' table dump (tab-separated, e.g. cities15000.txt)"""
+        records = []
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                fields = line.rstrip('\n').split('\t')
+                if len(fields) < 18:
+                    continue
+                records.append({
+                    'name': fields[1],
+                    'alternate_names': [fields[2]] + [n for n in fields[3].split(',') if n],
+                    'country': fields[8],
+                    'admin1': fields[10],
+                    'latitude': float(fields[4]),
+                    'longitude': float(fields[5]),
+                    'timezone': fields[17] or None,
+                    'population': int(fields[14] or 0)
+                })
+        return records
+
+    # --- Indexes ---
+
+    def _build_name_indexes(self, records):
+        """Sorted (key, place) pairs for prefix search and trigram postings for fuzzy search"""
+        pairs = set()
+        trigram_postings = defaultdict(list)
+        self._primary_keys = []
+        for i, record in enumerate(records):
+            primary = normalize_name(record['name'])
+            self._primary_keys.append(primary)
+            for key in {primary, *map(normalize_name, record['alternate_names'])}:
+                if key:
+                    pairs.add((key, i))
+            for trigram in _trigrams(primary):
+                trigram_postings[trigram].append(i)
+
+        pairs = sorted(pairs)
+        self._keys = [key for key, _ in pairs]
+        self._key_places = np.array([i for _, i in pairs], dtype=np.int64)
+        self._trigrams = {t: np.array(ids, dtype=np.int64) for t, ids in trigram_postings.items()}
+        self._trigram_counts = np.array([len(_trigrams(k)) for k in self._primary_keys])
+
+    def _build_spatial_index(self):
+        self._cells = None
+        if h3 is None:
+            return
+        cells = defaultdict(list)
+        for i, (lat, lon) in enumerate(zip(self.latitudes, self.longitudes)):
+            cells[_h3_cell(lat, lon, self.h3_resolution)].append(i)
+        self._cells = {cell: np.array(ids, dtype=np.int64) for cell, ids in cells.items()}
+
+    # --- Queries ---
+
+    def search(self, query: str, limit: int = 10, country: Optional[str] = None) -> List[Dict]:
+        """
+        Places matching a name
+
+        Prefix matches (on names and alternate names) come first, exact names
+        before longer ones and larger places first; trigram matches fill any
+        remaining slots, so small typos still find the place.
+
+        Args:
+            query: Place name or prefix
+            limit: Maximum results
+            country: Optional ISO country code filter
+        """
+        key = normalize_name(query)
+        if not key:
+            return []
+        country = country.upper() if country else None
+
+        start = bisect.bisect_left(self._keys, key)
+        end = bisect.bisect_left(self._keys, key + '\x7f', lo=start)
+        end = min(end, start + MAX_PREFIX_CANDIDATES)
+        ranked = {}
+        for position in range(start, end):
+            place = int(self._key_places[position])
+            exact = self._keys[position] == key
+            ranked[place] = ranked.get(place, False) or exact
+
+        results = sorted(
+            (p for p in ranked if country is None or self.countries[p] == country),
+            key=lambda p: (not ranked[p], -self.populations[p])
+        )[:limit]
+
+        if len(results) < limit:
+            seen = set(results)
+            for place, _ in self._fuzzy(key, country):
+                if place not in seen:
+                    results.append(place)
+                    seen.add(place)
+                if len(results) == limit:
+                    break
+
+        return [self.place(p) for p in results]
+
+    def _fuzzy(self, key, country):
+        """(place, similarity) pairs by trigram Jaccard similarity, best first"""
+        query_trigrams = _trigrams(key)
+        postings = [self._trigrams[t] for t in query_trigrams if t in self._trigrams]
+        if not postings:
+            return []
+        shared = np.bincount(np.concatenate(postings), minlength=len(self.names))
+        places = np.nonzero(shared)[0]
+        if country is not None:
+            places = places[np.array([self.countries[p] == country for p in places], dtype=bool)]
+        counts = shared[places]
+        similarity = counts / (len(query_trigrams) + self._trigram_counts[places] - counts)
+        keep = similarity >= MIN_TRIGRAM_SIMILARITY
+        places, similarity = places[keep], similarity[keep]
+        order = np.lexsort((-self.populations[places], -similarity))
+        return list(zip(places[order].tolist(), similarity[order].tolist()))
+
+    def nearest(self, latitude: float, longitude: float):
+        """
+        Closest gazetteer place to a point
+
+        Returns:
+            (place index, distance in km), or (None, None) for an empty gazetteer
+        """
+        if len(self.names) == 0:
+            return None, None
+
+        candidates = None
+        if self._cells is not None:
+            cell = _h3_cell(latitude, longitude, self.h3_resolution)
+            for k in range(self.max_ring + 1):
+                found = [self._cells[c] for c in _h3_disk(cell, k) if c in self._cells]
+                if found:
+                    # One more ring: the closest place may sit just across a cell edge
+                    found += [self._cells[c] for c in _h3_disk(cell, k + 1) if c in self._cells]
+                    candidates = np.unique(np.concatenate(found))
+                    break
+        if candidates is None:
+            candidates = np.arange(len(self.names))
+
+        distances = haversine_km(latitude, longitude,
+                                 self.latitudes[candidates], self.longitudes[candidates])
+        best = int(np.argmin(distances))
+        return int(candidates[best]), float(distances[best])
+
+    def place(self, i: int) -> Dict:
+        """Public record of gazetteer entry i"""
+        return {
+            'name': self.names[i],
+            'country': self.countries[i],
+            'admin1': self.admin1[i],
+            'latitude': float(self.latitudes[i]),
+            'longitude': float(self.longitudes[i]),
+            'timezone': self.timezone_names[i] or self.timezones.timezone_at(
+                self.latitudes[i], self.longitudes[i]
+            ),
+            'population': int(self.populations[i])
+        }
+
+    def resolve_name(self, name: str, country: Optional[str] = None) -> Optional[Dict]:
+        """Best match for a place name, or None"""
+        matches = self.search(name, limit=1, country=country)
+        return matches[0] if matches else None
+
+    def resolve_coordinates(self, latitude: float, longitude: float) -> Dict:
+        """Timezone at a point plus the nearest gazetteer place"""
+        place, distance = self.nearest(latitude, longitude)
+        return {
+            'latitude': latitude,
+            'longitude': longitude,
+            'timezone': self.timezones.timezone_at(latitude, longitude),
+            'nearest': None if place is None else {
+                **self.place(place),
+                'distance_km': round(distance, 2)
+            }
+        }
+
+    def stats(self) -> Dict:
+        return {
+            'places': len(self.names),
+            'name_keys': len(self._keys),
+            'spatial_index': 'h3' if self._cells is not None else 'scan',
+            'timezones': self.timezones.stats()
+        }
+
+
+def get_gazetteer(timezones: Optional[TimezoneLookup] = None) -> Gazetteer:
+    """Gazetteer from GAZETTEER_PATH (defaults to the bundled seed file)"""
+    return Gazetteer(
+        path=os.getenv("GAZETTEER_PATH") or DEFAULT_GAZETTEER_PATH,
+        timezones=timezones
+    )
+
+
+__all__ = ['Gazetteer', 'get_gazetteer', 'normalize_name', 'haversine_km', 'DEFAULT_GAZETTEER_PATH']
@@ -0,0 +1,101 @@
+"""
+HTTP response helpers
+Fast JSON encoding (orjson when installed), gzip that leaves streamed
+responses alone, and ETag matching for conditional GETs
+"""
+
+import json
+
+from fastapi.responses import JSONResponse
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import GZipMiddleware, GZipResponder
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency
+    np = None
+
+
+# Streamed as they are produced; gzip would hold chunks back in its buffer
+STREAMING_MEDIA_TYPES = ('text/event-stream', 'application/x-ndjson')
+
+
+def _default(value):
+    """Fallback encoder for NumPy values (orjson handles them natively)"""
+    if np is not None:
+        if isinstance(value, np.ndarray):
+            return value.tolist()
+        if isinstance(value, np.generic):
+            return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+if orjson is not None:
+    _ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+    def dumps(content) -> bytes:
+        """Compact UTF-8 JSON"""
+        return orjson.dumps(content, default=_default, option=_ORJSON_OPTIONS)
+else:
+    def dumps(content) -> bytes:
+        """Compact UTF-8 JSON"""
+        return json.dumps(
+            content, default=_default, ensure_ascii=False, allow_nan=False, separators=(',', ':')
+        ).encode('utf-8')
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson (or compact json.dumps without it)"""
+
+    def render(self, content) -> bytes:
+        return dumps(content)
+
+
+class _StreamingAwareGZipResponder(GZipResponder):
+    async def send_with_gzip(self, message):
+        await super().send_with_gzip(message)
+        if message['type'] == 'http.response.start':
+            content_type = Headers(raw=message['headers']).get('content-type', '')
+            if content_type.startswith(STREAMING_MEDIA_TYPES):
+                # Treated like an already-encoded body: passed through as is
+                self.content_encoding_set = True
+
+
+class StreamingAwareGZipMiddleware(GZipMiddleware):
+    """GZipMiddleware that skips SSE and NDJSON streams so each chunk is flushed at once"""
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'http' and 'gzip' in Headers(scope=scope).get('Accept-Encoding', ''):
+            responder = _StreamingAwareGZipResponder(
+                self.app, self.minimum_size, compresslevel=self.compresslevel
+            )
+            await responder(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Whether an If-None-Match header value matches etag (weak comparison)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+    bare = etag[2:] if etag.startswith('W/') else etag
+    for candidate in if_none_match.split(','):
+        candidate = candidate.strip()
+        if candidate.startswith('W/'):
+            candidate = candidate[2:]
+        if candidate == bare:
+            return True
+    return False
+
+
+__all__ = [
+    'dumps', 'FastJSONResponse', 'StreamingAwareGZipMiddleware', 'etag_matches',
+    'STREAMING_MEDIA_TYPES'
+]
@@ -0,0 +1,231 @@
+"""
+Session storage for chat consultations
+Sessions hold only birth inputs and conversation state; charts are
+recomputed (and cached) on demand from the birth inputs
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional
+
+from app.utils.cache import LRUCache
+
+
+def new_session_id() -> str:
+    """Collision-free session identifier"""
+    return f"session_{uuid.uuid4().hex}"
+
+
+class SessionStore(ABC):
+    """
+    Interface for session backends
+
+    A session record is a JSON-serializable dict, e.g.
+    {"birth_data": {...}, "conversation_history": [...]}
+    """
+
+    name = 'base'
+
+    @abstractmethod
+    def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Return the session record, or None if missing or expired"""
+
+    @abstractmethod
+    def save(self, session_id: str, record: Dict[str, Any]) -> None:
+        """Create or replace a session record"""
+
+    @abstractmethod
+    def delete(self, session_id: str) -> None:
+        """Remove a session"""
+
+    @abstractmethod
+    def stats(self) -> Dict[str, Any]:
+        """Size and eviction metrics"""
+
+    def close(self) -> None:
+        """Release backend resources"""
+
+
+class MemorySessionStore(SessionStore):
+    """Bounded in-process store with LRU + TTL eviction (single worker only)"""
+
+    name = 'memory'
+
+    def __init__(self, max_entries: int = 10000, ttl_seconds: Optional[float] = 7 * 86400):
+        self._cache = LRUCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+
+    def get(self, session_id):
+        return self._cache.get(session_id)
+
+    def save(self, session_id, record):
+        self._cache.put(session_id, record)
+
+    def delete(self, session_id):
+        self._cache.pop(session_id)
+
+    def stats(self):
+        return {'backend': self.name, **self._cache.stats()}
+
+
+class SQLiteSessionStore(SessionStore):
+    """
+    SQLite store in WAL mode, shareable by several workers on one host
+
+    Every uvicorn worker opens the same database file; WAL lets readers
+    proceed while one writer commits. Records are stored as compact JSON.
+    """
+
+    name = 'sqlite'
+
+    # Size/TTL enforcement runs every N writes rather than on each one
+    PRUNE_EVERY = 100
+
+    def __init__(
+        self,
+        path: str = 'sessions.db',
+        max_entries: int = 100000,
+        ttl_seconds: Optional[float] = 7 * 86400
+    ):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+        conn = self._connection()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS sessions ("
+            " session_id TEXT PRIMARY KEY,"
+            " data TEXT NOT NULL,"
+            " updated_at REAL NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_sessions_updated ON sessions (updated_at)")
+        conn.commit()
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, session_id):
+        row = self._connection().execute(
+            "SELECT data, updated_at FROM sessions WHERE session_id = ?", (session_id,)
+        ).fetchone()
+
+        if row is not None and self.ttl_seconds and row[1] < time.time() - self.ttl_seconds:
+            self.delete(session_id)
+            with self._lock:
+                self._expirations += 1
+            row = None
+
+        with self._lock:
+            if row is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+        return None if row is None else json.loads(row[0])
+
+    def save(self, session_id, record):
+        conn = self._connection()
+        conn.execute(
+            "INSERT OR REPLACE INTO sessions (session_id, data, updated_at) VALUES (?, ?, ?)",
+            (session_id, json.dumps(record, separators=(',', ':')), time.time())
+        )
+        conn.commit()
+
+        with self._lock:
+            self._writes += 1
+            prune = self._writes % self.PRUNE_EVERY == 0
+        if prune:
+            self.prune()
+
+    def delete(self, session_id):
+        conn = self._connection()
+        conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+        conn.commit()
+
+    def prune(self):
+        """Drop expired sessions, then the least recently updated beyond max_entries"""
+        conn = self._connection()
+        expired = 0
+        if self.ttl_seconds:
+            expired = conn.execute(
+                "DELETE FROM sessions WHERE updated_at < ?", (time.time() - self.ttl_seconds,)
+            ).rowcount
+        evicted = conn.execute(
+            "DELETE FROM sessions WHERE session_id IN ("
+            " SELECT session_id FROM sessions ORDER BY updated_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,)
+        ).rowcount
+        conn.commit()
+
+        with self._lock:
+            self._expirations += expired
+            self._evictions += evicted
+
+    def stats(self):
+        size = self._connection().execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                'backend': self.name,
+                'size': size,
+                'max_entries': self.max_entries,
+                'ttl_seconds': self.ttl_seconds,
+                'hits': self._hits,
+                'misses': self._misses,
+                'hit_rate': round(self._hits / lookups, 4) if lookups else 0.0,
+                'evictions': self._evictions,
+                'expirations': self._expirations
+            }
+
+    def close(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+def get_session_store() -> SessionStore:
+    """
+    Build the session store configured by environment
+
+    SESSION_STORE selects 'memory' (default) or 'sqlite'; SESSION_DB_PATH,
+    SESSION_MAX_ENTRIES and SESSION_TTL_SECONDS tune it. Use 'sqlite' when
+    running more than one uvicorn worker.
+    """
+    backend = os.getenv("SESSION_STORE", "memory").lower()
+    ttl = float(os.getenv("SESSION_TTL_SECONDS", str(7 * 86400))) or None
+
+    if backend == 'memory':
+        return MemorySessionStore(
+            max_entries=int(os.getenv("SESSION_MAX_ENTRIES", "10000")),
+            ttl_seconds=ttl
+        )
+    if backend == 'sqlite':
+        return SQLiteSessionStore(
+            path=os.getenv("SESSION_DB_PATH", "sessions.db"),
+            max_entries=int(os.getenv("SESSION_MAX_ENTRIES", "100000")),
+            ttl_seconds=ttl
+        )
+    raise ValueError(f"Unknown session store: {backend}")
+
+
+__all__ = [
+    'SessionStore', 'MemorySessionStore', 'SQLiteSessionStore',
+    'get_session_store', 'new_session_id'
+]
@@ -0,0 +1,60 @@
+"""
+Timezone helpers
+Cached tzinfo objects by name and cached coordinate -> timezone lookups
+against a single in-memory TimezoneFinder
+"""
+
+import threading
+from functools import lru_cache
+from typing import Dict, Optional
+
+from dateutil import tz
+
+from app.utils.cache import LRUCache
+
+
+@lru_cache(maxsize=1024)
+def get_tz(name: str):
+    """tz.gettz(name), memoized (None for unknown names, as gettz returns)"""
+    return tz.gettz(name)
+
+
+class TimezoneLookup:
+    """Coordinate -> IANA timezone name, without network calls"""
+
+    def __init__(self, coordinate_precision: int = 3, max_entries: int = 20000):
+        """
+        Args:
+            coordinate_precision: Decimal places coordinates are rounded to
+                for caching (3 ~ 110 m)
+            max_entries: Maximum cached lookups
+        """
+        self.coordinate_precision = coordinate_precision
+        self._cache = LRUCache(max_entries=max_entries)
+        self._finder = None
+        self._lock = threading.Lock()
+
+    def load(self):
+        """Load the timezone polygons into memory (done once; later calls are no-ops)"""
+        with self._lock:
+            if self._finder is None:
+                from timezonefinder import TimezoneFinder  # deferred: only needed once loaded
+                self._finder = TimezoneFinder(in_memory=True)
+        return self
+
+    def timezone_at(self, latitude: float, longitude: float) -> Optional[str]:
+        """IANA timezone at a point (Etc/GMT zones at sea, None if unknown)"""
+        key = (
+            round(float(latitude), self.coordinate_precision),
+            round(float(longitude), self.coordinate_precision)
+        )
+        return self._cache.get_or_compute(key, lambda: self._find(*key))
+
+    def _find(self, latitude, longitude):
+        return self.load()._finder.timezone_at(lat=latitude, lng=longitude)
+
+    def stats(self) -> Dict:
+        return {'loaded': self._finder is not None, **self._cache.stats()}
+
+
+__all__ = ['get_tz', 'TimezoneLookup']
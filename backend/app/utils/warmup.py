@@ -0,0 +1,106 @@
+"""
+Startup warm-up and readiness
+Named steps (preloading ephemeris data, starting chart workers, loading
+timezone polygons, building lazy services) run once in the background after
+startup. The worker serves /health at once but reports ready only after
+every step has finished, so load balancers route traffic to warm workers.
+"""
+
+import asyncio
+import inspect
+import time
+from typing import Callable, Dict, List, Optional
+
+
+WARMUP_STATES = ('pending', 'running', 'ready', 'failed', 'skipped')
+
+
+class Warmup:
+    """Ordered warm-up steps and the readiness they gate"""
+
+    def __init__(self):
+        self.state = 'pending'
+        self._steps: List[tuple] = []  # (name, fn, in_thread)
+        self._results: Dict[str, Dict] = {}
+        self._created_at = time.perf_counter()
+        self._ready_after = None
+        self._task: Optional[asyncio.Task] = None
+
+    def step(self, name: str, in_thread: bool = False) -> Callable:
+        """
+        Decorator registering a warm-up step (run in registration order)
+
+        Args:
+            name: Step name reported by stats()
+            in_thread: Run a blocking function in a thread so the event loop
+                keeps serving while it runs (coroutine functions are awaited)
+        """
+        def register(fn):
+            self._steps.append((name, fn, in_thread))
+            return fn
+        return register
+
+    @property
+    def ready(self) -> bool:
+        return self.state in ('ready', 'skipped')
+
+    def start(self) -> asyncio.Task:
+        """Run the steps in a background task (call from the startup event)"""
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self.run())
+        return self._task
+
+    def skip(self):
+        """Report ready without warming up: services are then built on first use"""
+        self.state = 'skipped'
+        self._ready_after = time.perf_counter() - self._created_at
+
+    async def run(self):
+        """Run every step once; a failed step is recorded and the rest still run"""
+        self.state = 'running'
+        started = time.perf_counter()
+        for name, fn, in_thread in self._steps:
+            step_started = time.perf_counter()
+            result = {}
+            try:
+                if inspect.iscoroutinefunction(fn):
+                    detail = await fn()
+                elif in_thread:
+                    detail = await asyncio.to_thread(fn)
+                else:
+                    detail = fn()
+                if detail is not None:
+                    result['detail'] = detail
+            except Exception as e:
+                result['error'] = f"{type(e).__name__}: {e}"
+                print(f"⚠️  Warm-up step {name} failed: {result['error']}")
+            result['ms'] = round((time.perf_counter() - step_started) * 1000, 1)
+            self._results[name] = result
+
+        failed = [name for name, result in self._results.items() if 'error' in result]
+        self.state = 'failed' if failed else 'ready'
+        self._ready_after = time.perf_counter() - self._created_at
+        print(f"🔥 Warm-up {'failed' if failed else 'finished'} in "
+              f"{(time.perf_counter() - started) * 1000:.0f} ms")
+
+    async def cancel(self):
+        """Stop an unfinished warm-up (shutdown)"""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    def stats(self) -> Dict:
+        return {
+            'state': self.state,
+            'ready': self.ready,
+            # From the creation of this object (app import) to the end of warm-up
+            'ready_after_ms': round(self._ready_after * 1000, 1) if self._ready_after is not None else None,
+            # None for steps that have not run yet
+            'steps': {name: self._results.get(name) for name, _, _ in self._steps}
+        }
+
+
+__all__ = ['Warmup', 'WARMUP_STATES']
@@ -0,0 +1,10 @@
+"""
+Performance benchmarks
+Micro-benchmarks of the chart math and prompt assembly, and load tests of
+the HTTP API against a local OpenAI-compatible stand-in. Run from backend/:
+
+    python -m benchmarks micro
+    python -m benchmarks load --llm-latency-ms 300
+    python -m benchmarks startup --startup-runs 5
+    python -m benchmarks all --output results.json --compare baseline.json
+"""
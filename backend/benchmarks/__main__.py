@@ -0,0 +1,77 @@
+"""
+Benchmark runner
+
+    python -m benchmarks [micro|load|startup|all] [--output FILE] [--compare BASELINE]
+
+Exits with status 1 when --compare finds a regression beyond --threshold.
+"""
+
+import argparse
+import sys
+
+from benchmarks import results as results_file
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Chart math and API benchmarks")
+    parser.add_argument('suite', nargs='?', default='all', choices=['micro', 'load', 'startup', 'all'])
+    parser.add_argument('--output', default='benchmark_results.json', help="Results JSON to write")
+    parser.add_argument('--compare', help="Earlier results JSON to compare against")
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help="Relative slowdown reported as a regression (default 0.10)")
+
+    micro = parser.add_argument_group('micro-benchmarks')
+    micro.add_argument('--repeat', type=int, default=5, help="Timing rounds per benchmark")
+    micro.add_argument('--min-time', type=float, default=0.2, help="Minimum seconds per round")
+    micro.add_argument('--records', type=int, default=64, help="Birth records per round")
+
+    load = parser.add_argument_group('load tests')
+    load.add_argument('--requests', type=int, default=200, help="Requests per scenario")
+    load.add_argument('--concurrency', type=int, default=16)
+    load.add_argument('--llm-latency-ms', type=float, default=300.0,
+                      help="Fake LLM delay before the reply / first token")
+    load.add_argument('--token-delay-ms', type=float, default=5.0,
+                      help="Fake LLM delay between streamed tokens")
+    load.add_argument('--completion-tokens', type=int, default=120)
+
+    startup = parser.add_argument_group('startup')
+    startup.add_argument('--startup-runs', type=int, default=5,
+                         help="Fresh imports and worker launches to time")
+    args = parser.parse_args()
+
+    results = {}
+    if args.suite in ('micro', 'all'):
+        from benchmarks.micro import run_micro
+        print("⏱️  Micro-benchmarks (median per call)")
+        results['micro'] = run_micro(repeat=args.repeat, min_time=args.min_time, records=args.records)
+    if args.suite in ('load', 'all'):
+        from benchmarks.load import run_load
+        print(f"🚦 Load tests ({args.requests} requests, concurrency {args.concurrency}, "
+              f"LLM latency {args.llm_latency_ms:g} ms)")
+        results['load'] = run_load(
+            requests=args.requests,
+            concurrency=args.concurrency,
+            llm_latency_ms=args.llm_latency_ms,
+            token_delay_ms=args.token_delay_ms,
+            completion_tokens=args.completion_tokens
+        )
+    if args.suite in ('startup', 'all'):
+        from benchmarks.startup import run_startup
+        print(f"🚀 Startup ({args.startup_runs} runs: import, /health, /ready)")
+        results['startup'] = run_startup(runs=args.startup_runs)
+
+    settings = {k: v for k, v in vars(args).items() if k not in ('output', 'compare')}
+    results_file.save(args.output, results, settings)
+    print(f"💾 Results written to {args.output}")
+
+    if args.compare:
+        baseline = results_file.load(args.compare)
+        rows = results_file.compare(baseline['results'], results, threshold=args.threshold)
+        print(f"📊 Compared with {args.compare} (threshold {args.threshold:.0%})")
+        results_file.print_comparison(rows)
+        if any(row['regression'] for row in rows):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,138 @@
+"""
+OpenAI-compatible stand-in for load tests
+Answers /v1/chat/completions (plain and streamed) with canned text after a
+configurable delay, so API throughput can be measured without network
+calls or token spend:
+
+    python -m benchmarks.fake_llm --port 8100 --latency-ms 300 --token-delay-ms 10
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+import uuid
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+
+# Overridden from the command line
+CONFIG = {
+    'latency_ms': 300.0,      # before the reply (or its first token)
+    'token_delay_ms': 10.0,   # between streamed tokens
+    'completion_tokens': 120,
+    'rate_limit_fraction': 0.0,   # share of calls answered 429
+    'retry_after_ms': 200
+}
+
+WORDS = (
+    "Your chart shows a strong Jupiter influence on the tenth house which "
+    "favours steady growth in career and learning during the current dasha"
+).split()
+
+app = FastAPI(title="Fake OpenAI")
+stats = {'requests': 0, 'streams': 0, 'rate_limited': 0}
+
+
+def _reply_tokens():
+    n = CONFIG['completion_tokens']
+    return [WORDS[i % len(WORDS)] + " " for i in range(n)]
+
+
+def _prompt_tokens(messages):
+    # Rough 4-characters-per-token estimate; only used for reported usage
+    return sum(len(m.get('content') or '') for m in messages) // 4
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+    stats['requests'] += 1
+    if random.random() < CONFIG['rate_limit_fraction']:
+        stats['rate_limited'] += 1
+        return JSONResponse(
+            {'error': {'message': 'Rate limit reached', 'type': 'requests', 'code': 'rate_limit_exceeded'}},
+            status_code=429,
+            headers={'retry-after-ms': str(CONFIG['retry_after_ms'])}
+        )
+    completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+    created = int(time.time())
+    model = body.get('model', 'fake')
+    tokens = _reply_tokens()
+
+    await asyncio.sleep(CONFIG['latency_ms'] / 1000)
+
+    if not body.get('stream'):
+        return {
+            'id': completion_id,
+            'object': 'chat.completion',
+            'created': created,
+            'model': model,
+            'choices': [{
+                'index': 0,
+                'message': {'role': 'assistant', 'content': "".join(tokens)},
+                'finish_reason': 'stop'
+            }],
+            'usage': {
+                'prompt_tokens': _prompt_tokens(body.get('messages', [])),
+                'completion_tokens': len(tokens),
+                'total_tokens': _prompt_tokens(body.get('messages', [])) + len(tokens)
+            }
+        }
+
+    stats['streams'] += 1
+
+    def chunk(delta, finish_reason=None):
+        return "data: " + json.dumps({
+            'id': completion_id,
+            'object': 'chat.completion.chunk',
+            'created': created,
+            'model': model,
+            'choices': [{'index': 0, 'delta': delta, 'finish_reason': finish_reason}]
+        }) + "\n\n"
+
+    async def events():
+        yield chunk({'role': 'assistant', 'content': ''})
+        for token in tokens:
+            yield chunk({'content': token})
+            if CONFIG['token_delay_ms']:
+                await asyncio.sleep(CONFIG['token_delay_ms'] / 1000)
+        yield chunk({}, finish_reason='stop')
+        yield "data: [DONE]\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
+@app.get("/stats")
+async def get_stats():
+    return {**stats, 'config': CONFIG}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8100)
+    parser.add_argument('--latency-ms', type=float, default=CONFIG['latency_ms'])
+    parser.add_argument('--token-delay-ms', type=float, default=CONFIG['token_delay_ms'])
+    parser.add_argument('--completion-tokens', type=int, default=CONFIG['completion_tokens'])
+    parser.add_argument('--rate-limit-fraction', type=float, default=CONFIG['rate_limit_fraction'],
+                        help="Share of calls answered with HTTP 429")
+    parser.add_argument('--retry-after-ms', type=int, default=CONFIG['retry_after_ms'])
+    args = parser.parse_args()
+
+    CONFIG.update(
+        latency_ms=args.latency_ms,
+        token_delay_ms=args.token_delay_ms,
+        completion_tokens=args.completion_tokens,
+        rate_limit_fraction=args.rate_limit_fraction,
+        retry_after_ms=args.retry_after_ms
+    )
+
+    import uvicorn
+    uvicorn.run(app, host=args.host, port=args.port, log_level='warning')
+
+
+if __name__ == '__main__':
+    main()
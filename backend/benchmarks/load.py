@@ -0,0 +1,199 @@
+"""
+API load tests
+Starts the fake LLM and the API as local uvicorn processes, then drives
+/birth-chart, /chat and /chat/stream at a fixed concurrency and reports
+throughput and latency percentiles
+"""
+
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from typing import Dict, List
+
+import httpx
+
+from benchmarks.micro import sample_births
+
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+QUESTIONS = [
+    "What does my chart say about my career?",
+    "When is a good period for marriage?",
+    "How is my financial outlook this year?",
+    "Which planets are strongest in my chart?",
+]
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def _wait_until_up(url: str, process, timeout: float = 30.0, interval: float = 0.1):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Process serving {url} exited with code {process.returncode}")
+        try:
+            if httpx.get(url, timeout=1.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(interval)
+    raise RuntimeError(f"Timed out waiting for {url}")
+
+
+@contextmanager
+def servers(llm_latency_ms: float, token_delay_ms: float, completion_tokens: int, env: Dict = None):
+    """
+    Fake LLM plus API processes for the duration of the block
+
+    Yields:
+        Base URL of the API
+    """
+    llm_port, api_port = _free_port(), _free_port()
+    llm = subprocess.Popen(
+        [sys.executable, '-m', 'benchmarks.fake_llm', '--port', str(llm_port),
+         '--latency-ms', str(llm_latency_ms), '--token-delay-ms', str(token_delay_ms),
+         '--completion-tokens', str(completion_tokens)],
+        cwd=BACKEND_DIR
+    )
+    api_env = {
+        **os.environ,
+        'OPENAI_API_KEY': 'benchmark',
+        'OPENAI_BASE_URL': f'http://127.0.0.1:{llm_port}/v1',
+        # Every chat call should reach the model stand-in
+        'RESPONSE_CACHE_ENABLED': 'false',
+        **(env or {})
+    }
+    api = subprocess.Popen(
+        [sys.executable, '-m', 'uvicorn', 'app.main:app', '--port', str(api_port), '--log-level', 'warning'],
+        cwd=BACKEND_DIR,
+        env=api_env
+    )
+    try:
+        _wait_until_up(f'http://127.0.0.1:{llm_port}/stats', llm)
+        # Measure warm workers only: /ready answers 200 once warm-up is done
+        _wait_until_up(f'http://127.0.0.1:{api_port}/ready', api, timeout=120.0)
+        yield f'http://127.0.0.1:{api_port}'
+    finally:
+        for process in (api, llm):
+            process.terminate()
+        for process in (api, llm):
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+
+def summarize(latencies: List[float], errors: int, elapsed: float) -> Dict:
+    """Throughput and latency percentiles (ms) of one scenario"""
+    ordered = sorted(latencies)
+
+    def percentile(p):
+        if not ordered:
+            return None
+        return round(ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))] * 1000, 2)
+
+    return {
+        'requests': len(latencies) + errors,
+        'errors': errors,
+        'elapsed_s': round(elapsed, 3),
+        'throughput_rps': round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        'p50_ms': percentile(50),
+        'p90_ms': percentile(90),
+        'p99_ms': percentile(99),
+        'max_ms': round(ordered[-1] * 1000, 2) if ordered else None
+    }
+
+
+async def _drive(send, payloads: List, concurrency: int) -> Dict:
+    """Send every payload with at most concurrency requests in flight"""
+    queue = asyncio.Queue()
+    for payload in payloads:
+        queue.put_nowait(payload)
+    latencies, errors = [], 0
+
+    async def worker():
+        nonlocal errors
+        while not queue.empty():
+            payload = queue.get_nowait()
+            start = time.perf_counter()
+            try:
+                await send(payload)
+                latencies.append(time.perf_counter() - start)
+            except (httpx.HTTPError, RuntimeError):
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, errors, time.perf_counter() - start)
+
+
+async def run_scenarios(base_url: str, requests: int, concurrency: int) -> Dict[str, Dict]:
+    limits = httpx.Limits(max_connections=concurrency * 2)
+    async with httpx.AsyncClient(base_url=base_url, timeout=120.0, limits=limits) as client:
+
+        async def post(path, payload):
+            response = await client.post(path, json=payload)
+            if response.status_code != 200:
+                raise RuntimeError(f"{path}: HTTP {response.status_code}")
+            return response
+
+        results = {}
+
+        # Distinct births: every request computes a chart (cold chart cache)
+        births = sample_births(requests)
+        results['birth_chart_cold'] = await _drive(lambda b: post('/birth-chart', b), births, concurrency)
+
+        # The same births again: chart cache hits
+        results['birth_chart_warm'] = await _drive(lambda b: post('/birth-chart', b), births, concurrency)
+
+        sessions = []
+        for birth in births[:concurrency]:
+            sessions.append((await post('/birth-chart', birth)).json()['session_id'])
+        chats = [
+            {'session_id': sessions[i % len(sessions)], 'message': QUESTIONS[i % len(QUESTIONS)]}
+            for i in range(requests)
+        ]
+        results['chat'] = await _drive(lambda c: post('/chat', c), chats, concurrency)
+
+        async def stream(payload):
+            async with client.stream('POST', '/chat/stream', json=payload) as response:
+                if response.status_code != 200:
+                    raise RuntimeError(f"/chat/stream: HTTP {response.status_code}")
+                async for _ in response.aiter_bytes():
+                    pass
+
+        results['chat_stream'] = await _drive(stream, chats, concurrency)
+        return results
+
+
+def run_load(
+    requests: int = 200,
+    concurrency: int = 16,
+    llm_latency_ms: float = 300.0,
+    token_delay_ms: float = 5.0,
+    completion_tokens: int = 120
+) -> Dict[str, Dict]:
+    """
+    Run every load scenario against fresh local servers
+
+    Returns:
+        Scenario name -> summarize() dict
+    """
+    with servers(llm_latency_ms, token_delay_ms, completion_tokens) as base_url:
+        results = asyncio.run(run_scenarios(base_url, requests, concurrency))
+    for name, result in results.items():
+        print(f"  {name:<20} {result['throughput_rps']:>8.1f} req/s  "
+              f"p50 {result['p50_ms']} ms  p99 {result['p99_ms']} ms  errors {result['errors']}")
+    return results
+
+
+__all__ = ['servers', 'summarize', 'run_load']
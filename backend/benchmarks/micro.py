@@ -0,0 +1,167 @@
+"""
+Micro-benchmarks
+Times calculate_chart, each of its stages, and the chatbot's chart
+summaries over a fixed set of birth records, plus single and batch charts
+in every ephemeris mode available here
+"""
+
+import random
+import statistics
+import time
+from typing import Callable, Dict, List
+
+from app.astrology.ayanamsa import AYANAMSAS, ayanamsa_value
+from app.astrology.chart_calculator import VedicChartCalculator
+
+
+# Fixed birth records so results are comparable between runs
+SAMPLE_SEED = 20240101
+SAMPLE_TIMEZONES = ['Asia/Kolkata', 'Europe/London', 'America/New_York', 'Asia/Tokyo']
+
+
+def sample_births(count: int = 64) -> List[Dict]:
+    """Deterministic spread of birth dates, times and places"""
+    rng = random.Random(SAMPLE_SEED)
+    return [
+        {
+            'date': f"{rng.randint(1940, 2020):04d}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+            'time': f"{rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}",
+            'latitude': round(rng.uniform(-50, 60), 4),
+            'longitude': round(rng.uniform(-120, 140), 4),
+            'timezone': rng.choice(SAMPLE_TIMEZONES)
+        }
+        for _ in range(count)
+    ]
+
+
+def measure(fn: Callable, inputs: List, repeat: int = 5, min_time: float = 0.2) -> Dict:
+    """
+    Time fn over every input, in repeated rounds
+
+    Each round runs fn once per input (looping until min_time has passed);
+    the median round is reported, which is robust to one-off stalls.
+
+    Returns:
+        {'mean_us', 'median_us', 'min_us', 'stdev_us', 'calls'} per call
+    """
+    fn(inputs[0])  # warm-up (imports, caches, lazy tables)
+    per_call = []
+    calls = 0
+    for _ in range(repeat):
+        n = 0
+        start = time.perf_counter()
+        while True:
+            for item in inputs:
+                fn(item)
+            n += len(inputs)
+            elapsed = time.perf_counter() - start
+            if elapsed >= min_time:
+                break
+        per_call.append(elapsed / n * 1e6)
+        calls += n
+    return {
+        'mean_us': round(statistics.mean(per_call), 2),
+        'median_us': round(statistics.median(per_call), 2),
+        'min_us': round(min(per_call), 2),
+        'stdev_us': round(statistics.stdev(per_call), 2) if len(per_call) > 1 else 0.0,
+        'calls': calls
+    }
+
+
+def stage_inputs(calculator: VedicChartCalculator, births: List[Dict]) -> List[Dict]:
+    """Intermediate values of calculate_chart, so each stage can be timed alone"""
+    staged = []
+    for birth in births:
+        jd = calculator.julian_day(birth['date'], birth['time'], birth['timezone'])
+        ayanamsa = ayanamsa_value(jd, calculator.default_ayanamsa)
+        tropical, _ = calculator.ephemeris.positions(jd)
+        planets = calculator._calculate_planets(jd, ayanamsa, tropical)
+        ascendant = calculator._calculate_ascendant(jd, birth['latitude'], birth['longitude'], ayanamsa)
+        staged.append({
+            **birth,
+            'jd': jd,
+            'ayanamsa': ayanamsa,
+            'tropical': tropical,
+            'planets': planets,
+            'ascendant': ascendant,
+            'moon_nakshatra': calculator._calculate_nakshatra(planets['Moon']['longitude'])
+        })
+    return staged
+
+
+def run_micro(repeat: int = 5, min_time: float = 0.2, records: int = 64) -> Dict[str, Dict]:
+    """
+    Run every micro-benchmark
+
+    Returns:
+        Benchmark name -> timing dict from measure()
+    """
+    # Imported here: the chatbot module pulls in the OpenAI client
+    from app.ai.chatbot import AstroAIChatbot
+
+    calculator = VedicChartCalculator()
+    chatbot = AstroAIChatbot(api_key='benchmark')
+    births = sample_births(records)
+    staged = stage_inputs(calculator, births)
+    charts = [calculator.calculate_chart(**birth) for birth in births]
+
+    benchmarks = {
+        'calculate_chart': (lambda b: calculator.calculate_chart(**b), births),
+        'julian_day': (lambda b: calculator.julian_day(b['date'], b['time'], b['timezone']), births),
+        'ephemeris_positions': (lambda s: calculator.ephemeris.positions(s['jd']), staged),
+        '_calculate_planets': (
+            lambda s: calculator._calculate_planets(s['jd'], s['ayanamsa'], s['tropical']), staged
+        ),
+        '_calculate_ascendant': (
+            lambda s: calculator._calculate_ascendant(s['jd'], s['latitude'], s['longitude'], s['ayanamsa']),
+            staged
+        ),
+        '_calculate_houses': (lambda s: calculator._calculate_houses(s['ascendant']), staged),
+        '_calculate_nakshatra': (
+            lambda s: calculator._calculate_nakshatra(s['planets']['Moon']['longitude']), staged
+        ),
+        '_calculate_strengths': (
+            lambda s: calculator._calculate_strengths(s['planets'], s['ascendant']), staged
+        ),
+        '_generate_basic_interpretation': (
+            lambda s: calculator._generate_basic_interpretation(s['planets'], s['ascendant'], s['moon_nakshatra']),
+            staged
+        ),
+        '_prepare_chart_summary': (chatbot._prepare_chart_summary, charts),
+        '_prepare_compact_summary': (chatbot._prepare_compact_summary, charts),
+        # Every supported ayanamsa from one set of tropical positions
+        'calculate_ayanamsa_variants': (
+            lambda b: calculator.calculate_ayanamsa_variants(**b, ayanamsas=list(AYANAMSAS)), births
+        ),
+    }
+
+    # Throughput per ephemeris mode (modes this deployment cannot provide are skipped)
+    columns = {key: [birth[key] for birth in births] for key in births[0]}
+    for mode, info in calculator.ephemeris_modes().items():
+        if not info['available']:
+            print(f"  (skipping ephemeris mode {mode}: {info['error']})")
+            continue
+        benchmarks[f'calculate_chart[{mode}]'] = (
+            lambda b, mode=mode: calculator.calculate_chart(**b, ephemeris=mode), births
+        )
+        # Per chart: one call charts the whole sample
+        benchmarks[f'calculate_charts_batch[{mode}]'] = (
+            lambda _, mode=mode: calculator.calculate_charts_batch(
+                **{f'{key}s': values for key, values in columns.items()}, columnar=True, ephemeris=mode
+            ),
+            [None]
+        )
+
+    results = {}
+    for name, (fn, inputs) in benchmarks.items():
+        results[name] = measure(fn, inputs, repeat=repeat, min_time=min_time)
+        if name.startswith('calculate_charts_batch['):
+            results[name] = {
+                key: round(value / len(births), 2) if key.endswith('_us') else value
+                for key, value in results[name].items()
+            }
+        print(f"  {name:<34} {results[name]['median_us']:>10.1f} µs")
+    return results
+
+
+__all__ = ['sample_births', 'measure', 'run_micro']
@@ -0,0 +1,111 @@
+"""
+Benchmark results files
+One JSON document per run (environment plus metrics), and a comparison
+that flags metrics that got worse than a baseline run by more than a
+relative threshold
+"""
+
+import json
+import os
+import platform
+import subprocess
+from datetime import datetime, timezone
+from typing import Dict, List
+
+import numpy as np
+
+
+# Metric name -> True when larger is better
+METRIC_DIRECTIONS = {
+    'median_us': False,
+    'median_ms': False,
+    'p50_ms': False,
+    'p90_ms': False,
+    'p99_ms': False,
+    'throughput_rps': True,
+    'errors': False,
+}
+
+
+def _git_revision():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment() -> Dict:
+    """Where and on what code a run happened"""
+    return {
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'git_revision': _git_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'numpy': np.__version__,
+        'ephemeris_backend': os.getenv('EPHEMERIS_BACKEND', 'moshier'),
+        'chart_executor': os.getenv('CHART_EXECUTOR_MODE', 'inline')
+    }
+
+
+def save(path: str, results: Dict, settings: Dict):
+    with open(path, 'w') as f:
+        json.dump({'environment': environment(), 'settings': settings, 'results': results}, f, indent=2)
+
+
+def load(path: str) -> Dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare(baseline: Dict, current: Dict, threshold: float = 0.10) -> List[Dict]:
+    """
+    Metric changes between two runs' results
+
+    Args:
+        baseline: 'results' section of the earlier run
+        current: 'results' section of this run
+        threshold: Relative change counted as a regression (0.10 = 10%)
+
+    Returns:
+        One dict per metric present in both runs: {'suite', 'name', 'metric',
+        'baseline', 'current', 'change', 'regression'}
+    """
+    rows = []
+    for suite, benchmarks in current.items():
+        for name, metrics in benchmarks.items():
+            before = baseline.get(suite, {}).get(name)
+            if not before:
+                continue
+            for metric, higher_is_better in METRIC_DIRECTIONS.items():
+                old, new = before.get(metric), metrics.get(metric)
+                if old is None or new is None:
+                    continue
+                if old == 0:
+                    change = 0.0 if new == 0 else float('inf')
+                else:
+                    change = (new - old) / old
+                worse = -change if higher_is_better else change
+                rows.append({
+                    'suite': suite,
+                    'name': name,
+                    'metric': metric,
+                    'baseline': old,
+                    'current': new,
+                    'change': round(change, 4),
+                    'regression': worse > threshold
+                })
+    return rows
+
+
+def print_comparison(rows: List[Dict]):
+    for row in rows:
+        flag = "❌ REGRESSION" if row['regression'] else ""
+        print(f"  {row['suite']}/{row['name']:<32} {row['metric']:<15} "
+              f"{row['baseline']:>10} -> {row['current']:>10} ({row['change']:+.1%}) {flag}")
+
+
+__all__ = ['environment', 'save', 'load', 'compare', 'print_comparison']
@@ -0,0 +1,89 @@
+"""
+Startup benchmarks
+Time to import the app module in a fresh interpreter, and for a fresh
+uvicorn worker the time until /health answers (accepting connections) and
+until /ready does (warm-up finished)
+"""
+
+import os
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+import numpy as np
+
+from benchmarks.load import BACKEND_DIR, _free_port, _wait_until_up
+
+
+IMPORT_SNIPPET = (
+    "import time; start = time.perf_counter(); import app.main; "
+    "print(time.perf_counter() - start)"
+)
+
+
+def _env() -> Dict:
+    # No API call is made during startup; the key only has to be present
+    return {**os.environ, 'OPENAI_API_KEY': os.getenv('OPENAI_API_KEY') or 'benchmark'}
+
+
+def measure_import(runs: int) -> List[float]:
+    """Seconds to import app.main, one fresh interpreter per run"""
+    timings = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, '-c', IMPORT_SNIPPET],
+            cwd=BACKEND_DIR, env=_env(), capture_output=True, text=True, check=True
+        ).stdout
+        timings.append(float(output.strip().splitlines()[-1]))
+    return timings
+
+
+def measure_boot() -> Dict[str, float]:
+    """Seconds from launching a uvicorn worker until /health, then /ready, answer 200"""
+    port = _free_port()
+    start = time.perf_counter()
+    api = subprocess.Popen(
+        [sys.executable, '-m', 'uvicorn', 'app.main:app', '--port', str(port), '--log-level', 'warning'],
+        cwd=BACKEND_DIR, env=_env(), stdout=subprocess.DEVNULL
+    )
+    try:
+        _wait_until_up(f'http://127.0.0.1:{port}/health', api, timeout=60.0, interval=0.01)
+        live = time.perf_counter() - start
+        _wait_until_up(f'http://127.0.0.1:{port}/ready', api, timeout=120.0, interval=0.01)
+        ready = time.perf_counter() - start
+    finally:
+        api.terminate()
+        try:
+            api.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            api.kill()
+    return {'live': live, 'ready': ready}
+
+
+def run_startup(runs: int = 5) -> Dict[str, Dict]:
+    """
+    Run the startup benchmarks
+
+    Returns:
+        Benchmark name -> {'median_ms', 'min_ms', 'runs'}
+    """
+    boots = [measure_boot() for _ in range(runs)]
+    timings = {
+        'import_app': measure_import(runs),
+        'time_to_live': [boot['live'] for boot in boots],
+        'time_to_ready': [boot['ready'] for boot in boots]
+    }
+
+    results = {}
+    for name, seconds in timings.items():
+        results[name] = {
+            'median_ms': round(float(np.median(seconds)) * 1000, 1),
+            'min_ms': round(min(seconds) * 1000, 1),
+            'runs': runs
+        }
+        print(f"  {name:<20} {results[name]['median_ms']:>10.1f} ms (min {results[name]['min_ms']:.1f})")
+    return results
+
+
+__all__ = ['measure_import', 'measure_boot', 'run_startup']
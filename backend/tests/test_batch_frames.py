@@ -0,0 +1,57 @@
+from fastapi.testclient import TestClient
+
+from app.astrology.chart_calculator import VedicChartCalculator
+from app.astrology.dasha import DASHA_LORDS, dasha_periods_batch, date_to_jd
+from app.main import app
+
+
+RECORDS = [
+    {'date': '1990-05-15', 'time': '14:30', 'latitude': 28.6139, 'longitude': 77.2090, 'timezone': 'Asia/Kolkata'},
+    {'date': '1985-11-02', 'time': '03:45', 'latitude': 51.5074, 'longitude': -0.1278, 'timezone': 'Europe/London'},
+]
+KEYS = ('date', 'time', 'latitude', 'longitude', 'timezone')
+
+
+def test_vargas_batch_uses_the_batch_ayanamsa():
+    response = TestClient(app).post('/vargas/batch', json={
+        'records': RECORDS, 'divisions': [9, 60], 'ayanamsa': 'raman'
+    })
+    assert response.status_code == 200
+
+    calculator = VedicChartCalculator()
+    for record, vargas in zip(RECORDS, response.json()['vargas']):
+        assert vargas == calculator.calculate_vargas(**record, divisions=[9, 60], ayanamsa='raman')
+
+
+def test_dasha_batch_uses_the_batch_ayanamsa():
+    dates = ['2024-01-01', '2030-06-15']
+    response = TestClient(app).post('/dasha/batch', json={'records': RECORDS, 'dates': dates, 'ayanamsa': 'kp'})
+    assert response.status_code == 200
+
+    columns = VedicChartCalculator().calculate_charts_batch(
+        *[[r[key] for r in RECORDS] for key in KEYS], columnar=True, ayanamsa='krishnamurti'
+    )
+    lords = dasha_periods_batch(
+        columns['julian_day'], columns['moon_longitude_exact'], [date_to_jd(d) for d in dates]
+    )
+    expected = [[DASHA_LORDS[i] for i in row] for row in lords[:, :, 2].tolist()]
+    assert response.json()['pratyantardasha'] == expected
+
+
+def test_batches_reject_records_in_another_frame():
+    client = TestClient(app)
+    records = [RECORDS[0], {**RECORDS[1], 'ayanamsa': 'raman'}]
+
+    assert client.post('/birth-charts/batch', json={'records': records}).status_code == 400
+    assert client.post('/vargas/batch', json={'records': records}).status_code == 400
+    assert client.post('/dasha/batch', json={'records': records, 'dates': ['2024-01-01']}).status_code == 400
+    assert client.post('/compatibility/batch', json={
+        'profiles': RECORDS[:1], 'candidates': records
+    }).status_code == 400
+    # Repeating the batch's own setting (under an alias) is fine
+    assert client.post('/vargas/batch', json={
+        'records': [{**RECORDS[0], 'ayanamsa': 'kp'}], 'ayanamsa': 'krishnamurti'
+    }).status_code == 200
+    assert client.post('/vargas/batch', json={
+        'records': [{**RECORDS[0], 'ephemeris': 'swisseph'}]
+    }).status_code == 400
@@ -0,0 +1,38 @@
+import json
+
+import numpy as np
+
+from app.bulk import run_bulk
+
+
+HEADER = 'date,time,latitude,longitude,timezone\n'
+RECORDS = [
+    '1990-05-15,14:30,28.6139,77.2090,Asia/Kolkata\n',
+    '1985-11-02,03:45,51.5074,-0.1278,Europe/London\n',
+    '2001-01-01,00:00,40.7128,-74.0060,America/New_York\n',
+    '1975-07-20,18:10,-33.8688,151.2093,Australia/Sydney\n',
+]
+
+
+def test_trailing_blank_line_is_not_a_record(tmp_path):
+    source = tmp_path / 'births.csv'
+    source.write_text(HEADER + ''.join(RECORDS) + '\n')
+
+    manifest = run_bulk(str(source), str(tmp_path / 'out'), workers=1, progress=False)
+
+    assert manifest['records_total'] == manifest['records_done'] == 4
+    assert manifest['complete']
+    julian_day = np.load(tmp_path / 'out' / 'julian_day.npy')
+    assert julian_day.shape == (4,)
+    assert json.loads((tmp_path / 'out' / 'manifest.json').read_text())['complete']
+
+
+def test_unknown_timezone_is_invalid(tmp_path):
+    source = tmp_path / 'births.csv'
+    source.write_text(HEADER + RECORDS[0] + '1990-05-15,14:30,28.6139,77.2090,Bogus/Zone\n' + RECORDS[1])
+
+    manifest = run_bulk(str(source), str(tmp_path / 'out'), workers=1, progress=False)
+
+    assert manifest['records_invalid'] == 1
+    assert np.load(tmp_path / 'out' / 'valid.npy').tolist() == [True, False, True]
+    assert np.isnan(np.load(tmp_path / 'out' / 'julian_day.npy')[1])
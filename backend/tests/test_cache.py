@@ -0,0 +1,56 @@
+import asyncio
+
+import pytest
+
+from app.utils.cache import LRUCache
+
+
+def test_get_or_compute_async_survives_owner_cancel():
+    async def scenario():
+        cache = LRUCache(max_entries=8)
+        release = asyncio.Event()
+        calls = 0
+
+        async def compute():
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return 'value'
+
+        owner = asyncio.ensure_future(cache.get_or_compute_async('key', compute))
+        await asyncio.sleep(0)
+        waiter = asyncio.ensure_future(cache.get_or_compute_async('key', compute))
+        await asyncio.sleep(0)
+
+        owner.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await owner
+        release.set()
+
+        assert await waiter == 'value'
+        assert calls == 1
+        assert cache.get('key') == 'value'
+        assert cache.stats()['coalesced'] == 1
+        assert cache.stats()['in_flight'] == 0
+
+    asyncio.run(scenario())
+
+
+def test_get_or_compute_async_shares_errors():
+    async def scenario():
+        cache = LRUCache(max_entries=8)
+
+        async def compute():
+            await asyncio.sleep(0.01)
+            raise ValueError('bad input')
+
+        results = await asyncio.gather(
+            cache.get_or_compute_async('key', compute),
+            cache.get_or_compute_async('key', compute),
+            return_exceptions=True
+        )
+        assert all(isinstance(r, ValueError) for r in results)
+        assert 'key' not in cache
+        assert cache.stats()['in_flight'] == 0
+
+    asyncio.run(scenario())
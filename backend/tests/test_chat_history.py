@@ -0,0 +1,67 @@
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import main
+from app.ai.summarizer import ConversationSummarizer
+
+
+BIRTH = {
+    'date': '1990-05-15', 'time': '14:30', 'latitude': 28.6139, 'longitude': 77.2090,
+    'timezone': 'Asia/Kolkata', 'name': None, 'ephemeris': None, 'ayanamsa': None
+}
+
+
+class FakeSummaryClient:
+    async def complete(self, **kwargs):
+        message = SimpleNamespace(content='Earlier: career questions.')
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+class CompactingChatbot:
+    """Answers after a compaction of the same session has finished"""
+
+    PROMPT_CONTEXT_VERSION = 1
+
+    def __init__(self, session_id):
+        self.session_id = session_id
+        self.summarizer = ConversationSummarizer(FakeSummaryClient(), after_messages=12, keep_recent=6)
+
+    async def _compact(self):
+        assert await self.summarizer.compact(self.session_id, main.session_store)
+
+    async def generate_response(self, **kwargs):
+        await self._compact()
+        return {'content': 'reply', 'usage': {}}
+
+    async def stream_response(self, **kwargs):
+        await self._compact()
+        yield 're'
+        yield 'ply'
+
+
+@pytest.mark.parametrize('path', ['/chat', '/chat/stream'])
+def test_turn_keeps_compaction_finished_during_it(monkeypatch, path):
+    session_id = f'compaction-race{path.replace("/", "-")}'
+    history = [
+        {'role': 'user' if i % 2 == 0 else 'assistant', 'content': f'message {i}'}
+        for i in range(14)
+    ]
+    main.session_store.save(session_id, {
+        'birth_data': BIRTH,
+        'prompt_context': {'version': 1},
+        'conversation_history': history
+    })
+    monkeypatch.setattr(main, 'chatbot', lambda: CompactingChatbot(session_id))
+    monkeypatch.setattr(main, 'summarizer', lambda: None)
+
+    response = TestClient(main.app).post(path, json={'session_id': session_id, 'message': 'new question'})
+    assert response.status_code == 200
+
+    stored = main.session_store.get(session_id)
+    assert stored['summary'] == 'Earlier: career questions.'
+    assert stored['conversation_history'] == history[-6:] + [
+        {'role': 'user', 'content': 'new question'},
+        {'role': 'assistant', 'content': 'reply'}
+    ]
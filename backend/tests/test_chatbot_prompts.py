@@ -0,0 +1,22 @@
+import pytest
+
+from app.ai.chatbot import AstroAIChatbot
+from app.astrology.chart_calculator import VedicChartCalculator
+
+
+@pytest.fixture(scope='module')
+def chatbot():
+    return AstroAIChatbot(api_key='test', llm=object())
+
+
+@pytest.mark.parametrize('ayanamsa, label', [('raman', 'Raman'), ('kp', 'Krishnamurti')])
+def test_summaries_name_the_charts_ayanamsa(chatbot, ayanamsa, label):
+    chart = VedicChartCalculator().calculate_chart(
+        '1990-05-15', '14:30', 28.6139, 77.2090, 'Asia/Kolkata', ayanamsa=ayanamsa
+    )
+    compact = chatbot._prepare_compact_summary(chart)
+    full = chatbot._prepare_chart_summary(chart)
+
+    assert f"sidereal, {label} ayanamsa" in compact
+    assert f"Sidereal/{label} Ayanamsa" in full
+    assert 'Lahiri' not in compact + full
@@ -0,0 +1,28 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+
+GROOM = {'date': '1990-05-15', 'time': '14:30', 'latitude': 28.6139, 'longitude': 77.2090, 'timezone': 'Asia/Kolkata'}
+BRIDE = {'date': '1992-08-20', 'time': '06:10', 'latitude': 19.0760, 'longitude': 72.8777, 'timezone': 'Asia/Kolkata'}
+
+
+@pytest.mark.parametrize('bad', [{'date': '1992-02-30'}, {'time': '25:61'}, {'ayanamsa': 'no_such_ayanamsa'}])
+def test_compatibility_rejects_bad_input_with_400(bad):
+    response = TestClient(app).post('/compatibility', json={'groom': GROOM, 'bride': {**BRIDE, **bad}})
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize('bad', [{'date': '1992-02-30'}, {'time': '25:61'}])
+def test_compatibility_batch_rejects_bad_input_with_400(bad):
+    response = TestClient(app).post('/compatibility/batch', json={
+        'profiles': [GROOM], 'candidates': [BRIDE, {**BRIDE, **bad}], 'role': 'groom'
+    })
+    assert response.status_code == 400
+
+
+def test_compatibility_scores_valid_input():
+    response = TestClient(app).post('/compatibility', json={'groom': GROOM, 'bride': BRIDE})
+    assert response.status_code == 200
+    assert 0 <= response.json()['total'] <= response.json()['max']
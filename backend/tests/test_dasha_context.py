@@ -0,0 +1,90 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.ai import response_cache
+from app.ai.chatbot import AstroAIChatbot
+from app.ai.response_cache import ResponseCache, chart_fingerprint
+from app.astrology import dasha
+from app.astrology.chart_calculator import VedicChartCalculator
+from app.astrology.dasha import DashaTimeline
+
+
+@pytest.fixture(scope='module')
+def chart():
+    return VedicChartCalculator().calculate_chart('1990-05-15', '14:30', 28.6139, 77.2090, 'Asia/Kolkata')
+
+
+def leaf_midpoint(chart, leaf):
+    """An instant inside the chart's leaf-th pratyantardasha"""
+    boundaries = DashaTimeline.from_chart(chart).boundaries
+    return (boundaries[leaf] + boundaries[leaf + 1]) / 2
+
+
+@pytest.mark.parametrize('summary_format', ['compact', 'full'])
+def test_current_dasha_is_rendered_per_request(monkeypatch, chart, summary_format):
+    chatbot = AstroAIChatbot(api_key='test', llm=object(), summary_format=summary_format)
+    prompt_context = chatbot.prepare_prompt_context(chart)
+    assert 'dasha' not in prompt_context['summary'].lower()
+
+    prompts = []
+    for leaf in (200, 300):
+        jd = leaf_midpoint(chart, leaf)
+        monkeypatch.setattr(dasha, 'date_to_jd', lambda date=None, jd=jd: jd)
+        messages, _ = chatbot._build_messages('How is my career?', [], None, prompt_context, chart_data=chart)
+        prompt = '\n'.join(message['content'] for message in messages)
+        period = dasha.current_dasha(chart, jd)['pratyantardasha']
+        assert f"{period['start']} to {period['end']}" in prompt
+        prompts.append(prompt)
+    assert prompts[0] != prompts[1]
+
+
+def test_fingerprint_tracks_pratyantardasha(monkeypatch, chart):
+    # Consecutive pratyantardashas inside one antardasha: same MD and AD lords
+    first, second = leaf_midpoint(chart, 9 * 20 + 3), leaf_midpoint(chart, 9 * 20 + 4)
+    periods = [dasha.current_dasha(chart, jd) for jd in (first, second)]
+    assert periods[0]['antardasha'] == periods[1]['antardasha']
+    assert periods[0]['pratyantardasha']['lord'] != periods[1]['pratyantardasha']['lord']
+
+    fingerprints = []
+    for jd in (first, second):
+        monkeypatch.setattr(response_cache, 'current_dasha', lambda c, jd=jd: dasha.current_dasha(c, jd))
+        fingerprints.append(chart_fingerprint(chart))
+    assert fingerprints[0] != fingerprints[1]
+
+
+def test_fingerprint_leaves_out_period_dates(chart):
+    # A minute later: same placements and periods, different period dates
+    later = VedicChartCalculator().calculate_chart('1990-05-15', '14:31', 28.6139, 77.2090, 'Asia/Kolkata')
+    now, then = dasha.current_dasha(chart), dasha.current_dasha(later)
+    assert now['pratyantardasha']['lord'] == then['pratyantardasha']['lord']
+    assert now['mahadasha']['start'] != then['mahadasha']['start']
+    assert chart_fingerprint(chart) == chart_fingerprint(later)
+
+
+class RecordingLLM:
+    def __init__(self):
+        self.prompts = []
+
+    async def complete(self, model, messages, **params):
+        self.prompts.append('\n'.join(message['content'] for message in messages))
+        message = SimpleNamespace(content='reply')
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=None)
+
+
+def test_only_uncached_prompts_carry_period_dates(chart):
+    llm = RecordingLLM()
+    chatbot = AstroAIChatbot(api_key='test', llm=llm, response_cache=ResponseCache())
+    period = dasha.current_dasha(chart)['pratyantardasha']
+    dates = f"{period['start']} to {period['end']}"
+
+    async def ask(history):
+        await chatbot.generate_response('How is my career?', chart, history)
+
+    asyncio.run(ask([]))
+    asyncio.run(ask([{'role': 'user', 'content': 'Hi'}, {'role': 'assistant', 'content': 'Hello'}]))
+
+    opening, follow_up = llm.prompts
+    assert f"{period['lord']} PD" in opening and dates not in opening
+    assert dates in follow_up
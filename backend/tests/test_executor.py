@@ -0,0 +1,18 @@
+import asyncio
+
+from app.utils.executor import get_chart_executor
+
+
+def test_default_mode_keeps_charts_off_the_event_loop(monkeypatch):
+    monkeypatch.delenv('CHART_EXECUTOR_MODE', raising=False)
+    executor = get_chart_executor()
+    assert executor.mode == 'thread'
+
+    async def chart():
+        return await executor.run('julian_day', '1990-05-15', '14:30', 'Asia/Kolkata')
+
+    try:
+        assert asyncio.run(chart()) > 2440000
+        assert executor.stats()['workers'] == executor.max_workers
+    finally:
+        executor.shutdown()
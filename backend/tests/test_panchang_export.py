@@ -0,0 +1,31 @@
+import csv
+import io
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+
+CITIES = [
+    {'name': 'Delhi', 'latitude': 28.6139, 'longitude': 77.2090, 'timezone': 'Asia/Kolkata'},
+    {'name': 'Longyearbyen', 'latitude': 78.2, 'longitude': 15.6, 'timezone': 'Arctic/Longyearbyen'},
+    {'name': 'London', 'latitude': 51.5074, 'longitude': -0.1278, 'timezone': 'Europe/London'},
+]
+
+
+@pytest.mark.parametrize('format', ['csv', 'ndjson'])
+def test_city_without_daily_sunrise_becomes_an_error_row(format):
+    response = TestClient(app).post('/panchang/export', json={
+        'cities': CITIES, 'start': '2024-06-01', 'days': 3, 'format': format
+    })
+    assert response.status_code == 200
+
+    if format == 'csv':
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+    else:
+        rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row['city'] for row in rows] == ['Delhi'] * 3 + ['Longyearbyen'] + ['London'] * 3
+    assert 'Sun does not rise' in rows[3]['error']
+    assert not rows[0].get('error') and not rows[-1].get('error')
@@ -0,0 +1,44 @@
+import asyncio
+from types import SimpleNamespace
+
+from app.ai.chatbot import AstroAIChatbot
+from app.ai.response_cache import ResponseCache, chart_fingerprint
+from app.astrology.chart_calculator import VedicChartCalculator
+
+
+class CountingLLM:
+    def __init__(self):
+        self.calls = 0
+
+    async def complete(self, model, messages, **params):
+        self.calls += 1
+        message = SimpleNamespace(content=f'reply {self.calls}')
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=None)
+
+
+def test_cached_answers_cover_the_prompt_vargas():
+    calculator = VedicChartCalculator()
+    birth = ('1990-05-15', 28.6139, 77.2090, 'Asia/Kolkata')
+    charts, vargas = [], []
+    # A minute apart: same D1 placements, but the Dasamsa lagna moves on
+    for time in ('14:34', '14:35'):
+        date, latitude, longitude, timezone = birth
+        charts.append(calculator.calculate_chart(date, time, latitude, longitude, timezone))
+        vargas.append(calculator.calculate_vargas(date, time, latitude, longitude, timezone, divisions=[9, 10]))
+    assert chart_fingerprint(charts[0]) == chart_fingerprint(charts[1])
+    assert vargas[0] != vargas[1]
+
+    llm = CountingLLM()
+    chatbot = AstroAIChatbot(api_key='test', llm=llm, response_cache=ResponseCache())
+
+    async def ask(chart, chart_vargas):
+        prompt_context = chatbot.prepare_prompt_context(chart, chart_vargas)
+        return await chatbot.generate_response('How is my career?', chart, [], prompt_context=prompt_context)
+
+    first = asyncio.run(ask(charts[0], vargas[0]))
+    second = asyncio.run(ask(charts[1], vargas[1]))
+    again = asyncio.run(ask(charts[0], vargas[0]))
+
+    assert llm.calls == 2
+    assert first['content'] != second['content']
+    assert again['usage'] == {'cache_hit': True} and again['content'] == first['content']
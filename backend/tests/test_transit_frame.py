@@ -0,0 +1,52 @@
+from datetime import datetime
+
+import pytest
+
+from app.astrology.chart_calculator import VedicChartCalculator
+from app.astrology.ephemeris import MoshierEphemeris
+from app.astrology.transits import TransitEngine
+
+
+class ShiftedEphemeris(MoshierEphemeris):
+    """Moshier positions moved one degree on, standing in for a second mode"""
+
+    name = 'tables'
+
+    def positions(self, jd):
+        longitudes, speeds = super().positions(jd)
+        return (longitudes + 1) % 360, speeds
+
+
+@pytest.fixture
+def calculator():
+    return VedicChartCalculator()
+
+
+def first_moon(engine, chart, start):
+    record = next(engine.transits(chart, start, start, step='hour', planets=['Moon']))
+    return record['planets']['Moon']['longitude']
+
+
+def test_transits_use_the_chart_ayanamsa(calculator):
+    # 14:30 in Delhi is 09:00 UT: the transiting Moon sits on the natal Moon
+    chart = calculator.calculate_chart('1990-05-15', '14:30', 28.6139, 77.2090, 'Asia/Kolkata', ayanamsa='raman')
+    moon = first_moon(TransitEngine(calculator), chart, datetime(1990, 5, 15, 9))
+    assert moon == pytest.approx(chart['planets']['Moon']['longitude'], abs=0.01)
+
+
+def test_transits_use_the_chart_ephemeris(calculator):
+    calculator._ephemerides['tables'] = ShiftedEphemeris()
+    engine = TransitEngine(calculator)
+    chart = calculator.calculate_chart('1990-05-15', '14:30', 28.6139, 77.2090, 'Asia/Kolkata')
+    start = datetime(2024, 1, 1)
+
+    default = first_moon(engine, chart, start)
+    chart['ephemeris']['mode'] = 'tables'
+    assert first_moon(engine, chart, start) == pytest.approx((default + 1) % 360, abs=0.01)
+
+
+def test_unavailable_chart_ephemeris_fails_on_call(calculator):
+    chart = calculator.calculate_chart('1990-05-15', '14:30', 28.6139, 77.2090, 'Asia/Kolkata')
+    chart['ephemeris']['mode'] = 'swisseph'
+    with pytest.raises(ValueError):
+        TransitEngine(calculator).transits_ndjson(chart, datetime(2024, 1, 1), datetime(2024, 1, 2))
@@ -29,6 +29,44 @@ const SUGGESTED_QUESTIONS = {
   ]
 };
 
+// Read a Server-Sent Events response from /chat/stream, calling onToken per chunk
+const streamChat = async (payload, onToken) => {
+  const response = await fetch(`${API_URL}/chat/stream`, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json' },
+    body: JSON.stringify(payload)
+  });
+
+  if (!response.ok || !response.body) {
+    throw new Error(`Streaming request failed with status ${response.status}`);
+  }
+
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+
+  while (true) {
+    const { done, value } = await reader.read();
+    if (done) break;
+
+    buffer += decoder.decode(value, { stream: true });
+    const events = buffer.split('\n\n');
+    buffer = events.pop();
+
+    for (const rawEvent of events) {
+      let eventType = 'message';
+      let data = '';
+      for (const line of rawEvent.split('\n')) {
+        if (line.startsWith('event:')) eventType = line.slice(6).trim();
+        else if (line.startsWith('data:')) data += line.slice(5).trim();
+      }
+      if (eventType === 'token' && data) {
+        onToken(JSON.parse(data).content);
+      }
+    }
+  }
+};
+
 const ChatInterface = ({ sessionId, chartData }) => {
   const [messages, setMessages] = useState([]);
   const [inputMessage, setInputMessage] = useState('');
@@ -68,30 +106,62 @@ const ChatInterface = ({ sessionId, chartData }) => {
     setInputMessage('');
     setLoading(true);
 
-    try {
-      const response = await axios.post(`${API_URL}/chat`, {
-        session_id: sessionId,
-        message: text,
-        context: selectedContext
+    const payload = {
+      session_id: sessionId,
+      message: text,
+      context: selectedContext
+    };
+    let received = false;
+
+    const appendToken = (token) => {
+      if (!received) {
+        received = true;
+        setLoading(false);
+        setMessages(prev => [...prev, { role: 'assistant', content: token, timestamp: new Date() }]);
+        return;
+      }
+      setMessages(prev => {
+        const updated = [...prev];
+        const last = updated[updated.length - 1];
+        updated[updated.length - 1] = { ...last, content: last.content + token };
+        return updated;
       });
+    };
+
+    try {
+      await streamChat(payload, appendToken);
+      if (!received) {
+        throw new Error('Empty streaming response');
+      }
+    } catch (streamError) {
+      if (received) {
+        console.error('Error:', streamError);
+        toast.error('The response was interrupted. Please try again.');
+        return;
+      }
+
+      // Fall back to the non-streaming endpoint
+      try {
+        const response = await axios.post(`${API_URL}/chat`, payload);
 
-      const aiMessage = {
-        role: 'assistant',
-        content: response.data.response,
-        timestamp: new Date()
-      };
-
-      setMessages(prev => [...prev, aiMessage]);
-    } catch (error) {
-      console.error('Error:', error);
-      toast.error('Failed to get response. Please try again.');
-      
-      const errorMessage = {
-        role: 'assistant',
-        content: 'I apologize, but I encountered an error. Please try asking your question again.',
-        timestamp: new Date()
-      };
-      setMessages(prev => [...prev, errorMessage]);
+        const aiMessage = {
+          role: 'assistant',
+          content: response.data.response,
+          timestamp: new Date()
+        };
+
+        setMessages(prev => [...prev, aiMessage]);
+      } catch (error) {
+        console.error('Error:', error);
+        toast.error('Failed to get response. Please try again.');
+        
+        const errorMessage = {
+          role: 'assistant',
+          content: 'I apologize, but I encountered an error. Please try asking your question again.',
+          timestamp: new Date()
+        };
+        setMessages(prev => [...prev, errorMessage]);
+      }
     } finally {
       setLoading(false);
     }